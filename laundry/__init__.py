@@ -0,0 +1 @@
+# Support code for the Laundry Monitor slides
@@ -0,0 +1,54 @@
+# Chart aggregations evaluated in Python before the chart is built.
+# The browser receives one row per bar instead of the raw rows, so the payload
+# no longer grows with the amount of history behind the chart.
+import math
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+
+# Bin edges like Vega-Lite's bin=alt.Bin(maxbins=...): a step of 1, 2 or 5
+# times a power of ten, with the extent snapped to it. Vega can snap to one bin
+# more than maxbins; here the step is the smallest that fits in maxbins.
+def nice_bins(lo, hi, maxbins=10):
+    span = hi - lo
+    if not span > 0:
+        span = abs(lo) or 1.0
+        hi = lo + span
+    power = 10.0 ** math.floor(math.log10(span / maxbins))
+    while True:
+        for multiple in (1, 2, 5):
+            step = power * multiple
+            start = math.floor(lo / step + 1e-9) * step
+            stop = math.ceil(hi / step - 1e-9) * step
+            bins = max(1, int(round((stop - start) / step)))
+            if bins <= maxbins:
+                return np.linspace(start, start + bins * step, bins + 1)
+        power *= 10
+
+
+# Histogram rows (bin_start, bin_end, count) for values, optionally weighted;
+# at most maxbins rows, the last bin closed so the maximum falls inside it
+def bin_counts(values, maxbins=10, weights=None):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return pd.DataFrame({'bin_start': [], 'bin_end': [], 'count': []})
+    edges = nice_bins(float(values.min()), float(values.max()), maxbins)
+    # Vega bins are half-open [start, end), like searchsorted(side='right') - 1
+    idx = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    counts = np.bincount(idx, weights=weights, minlength=len(edges) - 1)
+    return pd.DataFrame({
+        'bin_start': edges[:-1],
+        'bin_end': edges[1:],
+        'count': counts.astype(np.int64),
+    })
+
+
+# Bar chart of pre-binned rows from bin_counts
+def histogram_chart(bins, x_title, y_title):
+    return alt.Chart(bins).mark_bar().encode(
+        x=alt.X('bin_start', bin='binned', title=x_title),
+        x2='bin_end',
+        y=alt.Y('count', title=y_title),
+    )
@@ -0,0 +1,265 @@
+# Headless benchmarks for the slide pages, run through Streamlit's AppTest.
+# Every case runs in a fresh Python process, so its first render is truly cold
+# (imports, figure and dataset caches); the warm renders follow in the same process.
+# Live Demo, Fleet Overview and Data Analysis are swept over dataset sizes.
+#
+#   python -m laundry.bench                       # compare against benchmarks/baseline.json
+#   python -m laundry.bench --update-baseline     # accept the current numbers
+import argparse
+import importlib.abc
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "slides.py")
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Warm renders measured after the cold one
+WARM_RUNS = 10
+# Fresh runs of a case whose timings look like a regression, keeping the best of each;
+# a busy machine slows one run, a real regression slows them all
+RETRIES = 2
+# Seconds of live samples buffered before the chart is drawn
+LIVE_BACKFILL_SECONDS = [30, 900, 3600]
+# Machines in the simulated laundry room
+FLEET_SIZES = [40, 400, 4000]
+# (machines, days) of simulated history
+ANALYSIS_SIZES = [(1, 7), (20, 90), (200, 365)]
+
+# A metric regresses when it exceeds baseline * ratio + slack
+THRESHOLDS = {
+    "cold_ms": {"ratio": 1.5, "slack": 100.0},
+    "warm_ms": {"ratio": 1.5, "slack": 20.0},
+    "peak_rss_mb": {"ratio": 1.2, "slack": 20.0},
+    "elements": {"ratio": 1.0, "slack": 0},
+    "payload_bytes": {"ratio": 1.2, "slack": 1024},
+}
+# Metrics that vary with the load on the machine
+TIMINGS = ("cold_ms", "warm_ms")
+
+# Settings from the environment that would make results depend on the machine
+_ISOLATED_ENV = ("LAUNDRY_DEVICES", "LAUNDRY_SERIAL", "LAUNDRY_NOTIFY_URL", "LAUNDRY_STORE",
+                 "LAUNDRY_RECORDINGS", "LAUNDRY_METRICS_FILE")
+
+
+# One benchmark per page, with the data-heavy pages once per dataset size.
+# `modules` overrides module constants, `state` presets widget values by key.
+def cases():
+    from laundry.pages import PAGES
+
+    result = []
+    for page in PAGES:
+        if page.title == "Live Demo":
+            for seconds in LIVE_BACKFILL_SECONDS:
+                result.append({
+                    "name": f"Live Demo ({seconds} s buffered)",
+                    "page": page.title,
+                    "modules": {page.module: {"BACKFILL_SECONDS": seconds}},
+                    "state": {"live_window": "1 h"},
+                })
+        elif page.title == "Fleet Overview":
+            for machines in FLEET_SIZES:
+                result.append({
+                    "name": f"Fleet Overview ({machines} machines)",
+                    "page": page.title,
+                    "modules": {page.module: {"FLEET_MACHINES": machines}},
+                })
+        elif page.title == "Data Analysis":
+            for machines, days in ANALYSIS_SIZES:
+                result.append({
+                    "name": f"Data Analysis ({machines} machines, {days} days)",
+                    "page": page.title,
+                    "modules": {page.module: {"SIMULATED_MACHINES": machines, "SIMULATED_DAYS": days}},
+                })
+        else:
+            result.append({"name": page.title, "page": page.title})
+    return result
+
+
+# Sets a case's module constants right after the module is first imported, so
+# importing the page (and the libraries it pulls in) stays part of the cold render
+class _Overrides(importlib.abc.MetaPathFinder):
+    def __init__(self, modules):
+        self.modules = modules
+
+    def find_spec(self, name, path, target=None):
+        if name not in self.modules:
+            return None
+        sys.meta_path.remove(self)
+        try:
+            spec = importlib.util.find_spec(name)
+        finally:
+            sys.meta_path.insert(0, self)
+        exec_module, values = spec.loader.exec_module, self.modules[name]
+
+        def exec_and_override(module):
+            exec_module(module)
+            for key, value in values.items():
+                setattr(module, key, value)
+
+        spec.loader.exec_module = exec_and_override
+        return spec
+
+
+# Measure one case in this process: one cold render, then `warm` warm ones
+def measure(case, warm=WARM_RUNS):
+    from streamlit.testing.v1 import AppTest
+
+    from laundry.profiling import page_totals
+
+    if case.get("modules"):
+        sys.meta_path.insert(0, _Overrides(case["modules"]))
+
+    at = AppTest.from_file(SCRIPT, default_timeout=300)
+    at.session_state["page"] = case["page"]
+    for key, value in case.get("state", {}).items():
+        at.session_state[key] = value
+
+    seconds = []
+    elements = payload = 0
+    for _ in range(1 + warm):
+        before = page_totals().get(case["page"], {"seconds": 0.0, "elements": 0, "bytes": 0})
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{case['name']}: {at.exception[0].message}")
+        after = page_totals()[case["page"]]
+        seconds.append(after["seconds"] - before["seconds"])
+        elements = after["elements"] - before["elements"]
+        payload = after["bytes"] - before["bytes"]
+
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    return {
+        "cold_ms": round(1000 * seconds[0], 1),
+        "warm_ms": round(1000 * float(np.median(seconds[1:])), 1) if warm else None,
+        "peak_rss_mb": round(peak_mb, 1),
+        "elements": elements,
+        "payload_bytes": payload,
+    }
+
+
+# Run one case in a fresh interpreter and return its measurements
+def run_case(case, warm=WARM_RUNS):
+    env = {k: v for k, v in os.environ.items() if k not in _ISOLATED_ENV}
+    out = subprocess.run(
+        [sys.executable, "-m", "laundry.bench", "--case", json.dumps(case), "--warm", str(warm)],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    if out.returncode:
+        raise RuntimeError(f"{case['name']} failed:\n{out.stderr}")
+    # The result is the last line; Streamlit may print warnings before it
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# Cases that sent more elements than their page's budget: (name, elements, budget)
+def over_budget(results, selected):
+    from laundry.pages import PAGES_BY_TITLE
+
+    found = []
+    for case in selected:
+        budget = PAGES_BY_TITLE[case["page"]].max_elements
+        elements = results[case["name"]]["elements"]
+        if budget is not None and elements > budget:
+            found.append((case["name"], elements, budget))
+    return found
+
+
+# Metrics of `results` that exceed their baseline by more than the thresholds
+def regressions(results, baseline):
+    thresholds = baseline.get("thresholds", THRESHOLDS)
+    found = []
+    for name, metrics in results.items():
+        expected = baseline.get("cases", {}).get(name)
+        if expected is None:
+            continue
+        for metric, limit in thresholds.items():
+            value, base = metrics.get(metric), expected.get(metric)
+            if value is None or base is None:
+                continue
+            allowed = base * limit["ratio"] + limit["slack"]
+            if value > allowed:
+                found.append((name, metric, base, value, allowed))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the slide pages headlessly")
+    parser.add_argument("--only", action="append", help="run cases whose name contains this text (repeatable)")
+    parser.add_argument("--warm", type=int, default=WARM_RUNS, help="warm renders per case")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Worker mode: measure a single case and print it for the parent process
+    if args.case:
+        print(json.dumps(measure(json.loads(args.case), args.warm)))
+        return 0
+
+    selected = [c for c in cases() if not args.only or any(text in c["name"] for text in args.only)]
+    results = {}
+    print(f"{'case':<40} {'cold ms':>9} {'warm ms':>9} {'RSS MB':>8} {'elements':>9} {'bytes':>9}")
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    for case in selected:
+        start = time.perf_counter()
+        metrics = results[case["name"]] = run_case(case, args.warm)
+        for _ in range(RETRIES if baseline else 0):
+            if not any(metric in TIMINGS for _, metric, *_ in regressions({case["name"]: metrics}, baseline)):
+                break
+            again = run_case(case, args.warm)
+            for metric in TIMINGS:
+                if again[metric] is not None:
+                    metrics[metric] = min(metrics[metric], again[metric])
+        warm = f"{metrics['warm_ms']:9.1f}" if metrics["warm_ms"] is not None else f"{'-':>9}"
+        print(f"{case['name']:<40} {metrics['cold_ms']:9.1f} {warm} {metrics['peak_rss_mb']:8.1f} "
+              f"{metrics['elements']:9d} {metrics['payload_bytes']:9d}   ({time.perf_counter() - start:.1f}s)")
+
+    report = {"python": sys.version.split()[0], "warm_runs": args.warm, "thresholds": THRESHOLDS, "cases": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    # Budgets hold whatever the baseline says
+    overs = over_budget(results, selected)
+    for name, elements, budget in overs:
+        print(f"OVER BUDGET {name}: {elements} elements > {budget}")
+
+    if args.update_baseline:
+        baseline = {"cases": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({k: v for k, v in report.items() if k != "cases"})
+        baseline.setdefault("cases", {}).update(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 1 if overs else 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 1 if overs else 0
+    found = regressions(results, baseline)
+    for name, metric, base, value, allowed in found:
+        print(f"REGRESSION {name}: {metric} {value:.1f} > {allowed:.1f} (baseline {base:.1f})")
+    if not found:
+        print("No regressions against the baseline")
+    return 1 if found or overs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
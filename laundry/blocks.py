@@ -0,0 +1,23 @@
+# Static page sections sent as one element each.
+# Every st.markdown call is its own delta over the websocket, so text that never
+# changes (headings, bullet lists, the stylesheet) is joined into one markdown
+# string per section, built once per server process, and sent in a single call.
+# Streamlit sends an element the browser already holds as a short hash reference
+# once it is at least global.minCachedMessageSize bytes; .streamlit/config.toml
+# lowers that size so the stylesheet and the larger sections only go out in full once
+# per session.
+import functools
+import textwrap
+
+import streamlit as st
+
+
+# Markdown pieces (dedented, as st.markdown would) joined into one markdown string
+@functools.lru_cache(maxsize=None)
+def compile_section(pieces):
+    return "\n\n".join(textwrap.dedent(piece).strip() for piece in pieces)
+
+
+# Send static markdown/HTML pieces as a single element
+def static_section(*pieces):
+    st.markdown(compile_section(pieces), unsafe_allow_html=True)
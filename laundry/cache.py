@@ -0,0 +1,174 @@
+# In-process caches shared by every Streamlit session on the server
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Memory budget and lifetime for derived datasets shared between sessions
+DATASET_CACHE_BYTES = 256 * 1024 * 1024
+DATASET_TTL_SECONDS = 15 * 60
+
+
+# Approximate memory held by a cached value: exact for bytes, NumPy arrays and
+# DataFrames, recursive for containers and plain objects
+def estimate_size(value, _seen=None):
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, "nbytes") and hasattr(value, "dtype"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v, _seen) for v in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v, _seen) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + sum(estimate_size(v, _seen) for v in vars(value).values())
+    return sys.getsizeof(value)
+
+
+# Cache key for a derived dataset: the same device set, time range, seed and
+# parameters always map to the same key, whatever order devices are given in
+def dataset_key(kind, devices=None, t0=None, t1=None, seed=None, **params):
+    devices = tuple(sorted(devices)) if devices is not None else None
+    return (kind, devices, t0, t1, seed, tuple(sorted(params.items())))
+
+
+# A computation in progress that other callers for the same key wait on
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+# Thread-safe LRU cache bounded by the total size of its values in bytes, with
+# optional expiry and single-flight computation of missing entries
+class LRUCache:
+    def __init__(self, max_bytes, sizeof=len, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Callers that waited on another caller's computation instead of repeating it
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    # Entry for key if present and fresh; caller holds the lock
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] is not None and entry[2] <= time.monotonic():
+            del self._entries[key]
+            self._nbytes -= entry[1]
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, ttl=None):
+        size = self._sizeof(value)
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            # Values that could never fit are handed back but not kept
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size, expires)
+            self._nbytes += size
+            # Evict least recently used entries until we are under the cap
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    # Cached value for key, computing it on a miss. Concurrent callers asking for
+    # the same missing key wait for a single computation instead of repeating it.
+    def get_or_compute(self, key, compute, ttl=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self.put(key, compute(), ttl)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Derived datasets (generated histories, rollups, detected cycles) shared by all sessions
+datasets = LRUCache(DATASET_CACHE_BYTES, sizeof=estimate_size, ttl=DATASET_TTL_SECONDS)
@@ -0,0 +1,167 @@
+# Online threshold calibration for many devices at once.
+# Each device keeps a histogram of its readings over the 10-bit ADC range whose
+# counts slowly decay, so it follows a sensor that is moved or remounted. The
+# histogram is split where the two states separate best (Otsu's method): below
+# the split are Running readings (a low reading means vibration, as in the
+# sketch), above it Stopped ones. Once the upper quantile of the Running side and
+# the lower quantile of the Stopped side are clearly apart, the threshold goes to
+# the middle of the gap between them and the hysteresis band to a fraction of it.
+# Memory is one histogram row per device; an update is a single scatter-add.
+#
+#   python -m laundry.calibrate --devices 5000 --samples 2000
+import argparse
+import time
+
+import numpy as np
+
+from laundry.cycles import HYSTERESIS, THRESHOLD
+
+# Histogram layout over the ADC range
+ADC_RANGE = 1024
+BINS = 128
+# Readings after which a reading's weight has halved
+HALF_LIFE_SAMPLES = 20000
+# Updates between decays, and between threshold proposals
+DECAY_EVERY = 64
+PROPOSE_EVERY = 16
+# Quantiles marking the inner edge of each state's readings
+RUNNING_QUANTILE = 0.95
+STOPPED_QUANTILE = 0.05
+# Readings (after decay) each state needs before the proposal is applied
+MIN_SAMPLES = 200
+# How much wider than either state's own spread (median to inner edge) the gap
+# between them must be; one state split down the middle comes out well below this
+MIN_SEPARATION = 0.75
+# Share of the gap between the two states covered by the hysteresis band
+BAND_FRACTION = 0.5
+MIN_HYSTERESIS = 10
+
+
+# Reading at cumulative count `target` in each row, interpolated within its bin
+def _quantile_at(cumulative, counts, target):
+    rows = np.arange(len(target))
+    idx = np.minimum((cumulative < target[:, None]).sum(axis=1), BINS - 1)
+    before = np.where(idx > 0, cumulative[rows, idx - 1], 0.0)
+    weight = counts[rows, idx]
+    inside = np.divide(target - before, weight, out=np.zeros(len(target)), where=weight > 0)
+    return (idx + np.clip(inside, 0, 1)) * (ADC_RANGE / BINS)
+
+
+class ThresholdCalibrator:
+    def __init__(self, devices, threshold=THRESHOLD, hysteresis=HYSTERESIS, half_life=HALF_LIFE_SAMPLES):
+        self.devices = devices
+        # Applied per device, and used for the Running/Stopped status
+        self.threshold = np.full(devices, float(threshold))
+        self.hysteresis = np.full(devices, float(hysteresis))
+        self.running = np.zeros(devices, dtype=bool)
+        # Whether each device's threshold has been calibrated yet
+        self.calibrated = np.zeros(devices, dtype=bool)
+        self.counts = np.zeros((devices, BINS))
+        self.decay = 0.5 ** (DECAY_EVERY / half_life)
+        self.updates = 0
+
+    # One reading per device; devices outside `mask` had no new reading
+    def update(self, values, mask=None):
+        values = np.asarray(values, dtype=np.float64)
+        seen = np.ones(self.devices, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+        # Status: readings inside the band keep the current one, as in cycles.transitions
+        low = self.threshold - self.hysteresis / 2
+        high = self.threshold + self.hysteresis / 2
+        self.running = np.where(seen & (values < low), True, np.where(seen & (values >= high), False, self.running))
+
+        rows = np.flatnonzero(seen)
+        bins = np.clip(values[rows] * (BINS / ADC_RANGE), 0, BINS - 1).astype(np.intp)
+        self.counts.reshape(-1)[rows * BINS + bins] += 1
+
+        # Old readings fade out, so a remounted sensor is relearned
+        self.updates += 1
+        if self.updates % DECAY_EVERY == 0:
+            self.counts *= self.decay
+        if self.updates % PROPOSE_EVERY == 0:
+            self.apply()
+
+    # Several readings per device: `values` has one row per device, one column per sample
+    def update_many(self, values, mask=None):
+        values = np.asarray(values)
+        for j in range(values.shape[1]):
+            self.update(values[:, j], None if mask is None else mask[:, j])
+
+    # Proposed threshold and hysteresis per device, and whether each proposal is usable.
+    # A device whose readings show one state only has no clear gap and keeps its values.
+    def proposal(self):
+        counts = self.counts
+        total = counts.sum(axis=1)
+        cumulative = np.cumsum(counts, axis=1)
+        scale = np.maximum(total, 1e-12)[:, None]
+
+        # Otsu: the split with the largest variance between the two sides
+        share = cumulative / scale
+        centers = (np.arange(BINS) + 0.5) * (ADC_RANGE / BINS)
+        mean = np.cumsum(counts * centers, axis=1) / scale
+        inner = (share > 0) & (share < 1)
+        between = np.where(inner, (mean[:, -1:] * share - mean) ** 2 / np.where(inner, share * (1 - share), 1), -1)
+        split = between.argmax(axis=1)
+
+        running_n = cumulative[np.arange(self.devices), split]
+        stopped_n = total - running_n
+        running_mid = _quantile_at(cumulative, counts, 0.5 * running_n)
+        running_hi = _quantile_at(cumulative, counts, RUNNING_QUANTILE * running_n)
+        stopped_lo = _quantile_at(cumulative, counts, running_n + STOPPED_QUANTILE * stopped_n)
+        stopped_mid = _quantile_at(cumulative, counts, running_n + 0.5 * stopped_n)
+
+        gap = stopped_lo - running_hi
+        spread = np.maximum(running_hi - running_mid, stopped_mid - stopped_lo)
+        ready = ((running_n >= MIN_SAMPLES) & (stopped_n >= MIN_SAMPLES)
+                 & (gap > MIN_HYSTERESIS) & (gap > MIN_SEPARATION * spread))
+        threshold = np.where(ready, (running_hi + stopped_lo) / 2, self.threshold)
+        hysteresis = np.where(ready, np.maximum(BAND_FRACTION * gap, MIN_HYSTERESIS), self.hysteresis)
+        return threshold, hysteresis, ready
+
+    # Adopt every usable proposal; the others keep their current values
+    def apply(self, proposal=None):
+        threshold, hysteresis, ready = proposal or self.proposal()
+        self.threshold[ready] = threshold[ready]
+        self.hysteresis[ready] = hysteresis[ready]
+        self.calibrated |= ready
+        return ready
+
+
+# Readings for devices that each sit at their own level and alternate between
+# Stopped and Running in long runs, like washers mounted in different places
+def simulated_readings(devices, samples, seed=0):
+    rng = np.random.default_rng(seed)
+    stopped = rng.uniform(550, 950, devices)
+    running = stopped * rng.uniform(0.2, 0.6, devices)
+    spread = rng.uniform(20, 60, devices)
+    # Status flips about every 300 samples
+    flips = rng.random((devices, samples)) < 1 / 300
+    state = np.cumsum(flips, axis=1) % 2 == 1
+    level = np.where(state, running[:, None], stopped[:, None])
+    values = np.clip(level + rng.normal(0, 1, (devices, samples)) * spread[:, None], 0, ADC_RANGE - 1)
+    # Thresholds between these keep 97.7% of either state's readings on its own side
+    return values.astype(np.int16), running + 2 * spread, stopped - 2 * spread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate thresholds for simulated devices")
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=2000, help="readings per device")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    values, lowest, highest = simulated_readings(args.devices, args.samples, args.seed)
+    calibrator = ThresholdCalibrator(args.devices)
+    start = time.perf_counter()
+    calibrator.update_many(values)
+    elapsed = time.perf_counter() - start
+    total = args.devices * args.samples
+    calibrated = calibrator.calibrated
+    inside = (calibrator.threshold > lowest) & (calibrator.threshold < highest)
+    print(f"{total} readings in {elapsed:.2f}s ({total / elapsed / 1e6:.1f} M readings/s)")
+    print(f"{calibrated.sum()} of {args.devices} devices calibrated, "
+          f"{(inside & calibrated).sum()} with the threshold between both states' 2-sigma edges")
+
+
+if __name__ == "__main__":
+    main()
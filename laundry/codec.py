@@ -0,0 +1,275 @@
+# Compressed columnar encoding of raw sensor samples.
+# Samples are cut into blocks of BLOCK_SAMPLES. In each block, timestamps become
+# ticks of TICK_SECONDS and are stored as delta-of-deltas (a steady sample rate
+# leaves mostly zeros), values as deltas from one reading to the next; both are
+# zigzag-coded and bit-packed at the width the block needs. Every block starts
+# with a header holding its time span and value range, so readers skip blocks
+# outside a time window (or that cannot hold the values they look for) without
+# decoding them. Decoding works on many blocks at once with NumPy array operations.
+#
+# count() answers "how many samples in this time and value range" from the
+# headers of the blocks wholly inside it and decodes only the rest. Decoding
+# costs about 80 ns a sample, against about 10 ns to filter an in-memory pandas
+# frame, so a window that needs most of the file decoded is slower than the
+# frame. At 50 Hz, counting Running readings took:
+#   one hour of a 2 h file     0.03 ms   (frame 6 ms, decoding half the blocks 18 ms)
+#   one hour of a 24 h file     2.5 ms   (frame 38 ms)
+#   all of a 24 h file          114 ms   (frame 44 ms, decoding every block 330 ms)
+# In the last case the codec still holds the samples in 1/15 of the memory.
+#
+#   python -m laundry.codec --hours 24
+import argparse
+import struct
+import time
+
+import numpy as np
+
+# Timestamp resolution; the sketch's loop runs every 300 ms
+TICK_SECONDS = 0.001
+BLOCK_SAMPLES = 1024
+# count, first and last tick, first tick delta, first/min/max value,
+# time and value bit widths, time and value payload bytes
+BLOCK_HEADER = struct.Struct("<IqqqhhhBBII")
+# Widest packed field; a 64-bit read at any bit offset still holds all of it
+MAX_WIDTH = 56
+
+# Blocks decoded per batch, bounding the decoder's scratch arrays
+DECODE_BLOCKS = 256
+
+# A block header as blocks() returns it; first and last are ticks
+BLOCK = np.dtype([("offset", "<i8"), ("count", "<i8"), ("first", "<i8"), ("last", "<i8"),
+                  ("first_delta", "<i8"), ("v_first", "<i2"), ("v_min", "<i2"), ("v_max", "<i2"),
+                  ("time_width", "u1"), ("value_width", "u1"), ("time_bytes", "<i8"), ("value_bytes", "<i8")])
+
+
+# Signed integers as unsigned ones, small magnitudes of either sign staying small
+def zigzag(x):
+    x = x.astype(np.int64)
+    return ((x << 1) ^ (x >> 63)).view(np.uint64)
+
+
+def unzigzag(u):
+    return (u >> np.uint64(1)).view(np.int64) ^ -(u & np.uint64(1)).view(np.int64)
+
+
+# Bits needed for the largest of `u`
+def bit_width(u):
+    width = int(u.max()).bit_length() if len(u) else 0
+    if width > MAX_WIDTH:
+        raise ValueError(f"field needs {width} bits; at most {MAX_WIDTH} are supported")
+    return width
+
+
+# Unsigned integers packed `width` bits each, least significant bit first
+def pack(u, width):
+    if width == 0 or len(u) == 0:
+        return b""
+    bits = (u[:, None] >> np.arange(width, dtype=np.uint64)) & np.uint64(1)
+    return np.packbits(bits.astype(np.uint8), axis=None, bitorder="little").tobytes()
+
+
+def _encode_block(ticks, values):
+    n = len(ticks)
+    deltas = np.diff(ticks)
+    first_delta = int(deltas[0]) if n > 1 else 0
+    dod = zigzag(np.diff(deltas))
+    dv = zigzag(np.diff(values.astype(np.int64)))
+    time_width, value_width = bit_width(dod), bit_width(dv)
+    time_bytes, value_bytes = pack(dod, time_width), pack(dv, value_width)
+    header = BLOCK_HEADER.pack(n, int(ticks[0]), int(ticks[-1]), first_delta,
+                               int(values[0]), int(values.min()), int(values.max()),
+                               time_width, value_width, len(time_bytes), len(value_bytes))
+    return header + time_bytes + value_bytes
+
+
+# Encode samples (epoch seconds, integer readings) in time order as one bytes object
+def encode(times, values, block=BLOCK_SAMPLES):
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.int16)
+    order = np.argsort(times, kind="stable")
+    ticks = np.round(times[order] / TICK_SECONDS).astype(np.int64)
+    values = values[order]
+    return b"".join(_encode_block(ticks[lo:lo + block], values[lo:lo + block])
+                    for lo in range(0, len(ticks), block))
+
+
+# Every block header, with the block's offset in the data
+def blocks(data):
+    found = []
+    offset = 0
+    while offset < len(data):
+        fields = BLOCK_HEADER.unpack_from(data, offset)
+        found.append((offset,) + fields)
+        offset += BLOCK_HEADER.size + fields[-2] + fields[-1]
+    return np.array(found, dtype=BLOCK)
+
+
+# Blocks that may hold samples in [t0, t1] with values in [low, high] (None: unbounded)
+def select(headers, t0=None, t1=None, low=None, high=None):
+    keep = np.ones(len(headers), dtype=bool)
+    if t0 is not None:
+        keep &= headers["last"] >= np.floor(t0 / TICK_SECONDS)
+    if t1 is not None:
+        keep &= headers["first"] <= np.ceil(t1 / TICK_SECONDS)
+    if low is not None:
+        keep &= headers["v_max"] >= low
+    if high is not None:
+        keep &= headers["v_min"] <= high
+    return headers[keep]
+
+
+# Running sums that restart at every segment of `counts` elements
+def _segment_cumsum(x, counts):
+    total = np.cumsum(x)
+    ends = np.cumsum(counts)[:-1]
+    return total - np.repeat(np.concatenate(([0], total[ends - 1])), counts)
+
+
+# The 64-bit little-endian word at every byte offset of `raw` (which ends in 8 zero bytes)
+def _words(raw):
+    return np.ndarray((len(raw) - 7,), dtype="<u8", buffer=raw, strides=(1,))
+
+
+# Runs of packed integers, run i holding counts[i] of widths[i] bits from byte starts[i]
+def _unpack_runs(raw, starts, counts, widths):
+    first = np.cumsum(counts) - counts
+    width = np.repeat(widths, counts)
+    bit = np.repeat(starts * 8 - first * widths, counts) + np.arange(len(width)) * width
+    masks = np.repeat((np.uint64(1) << widths.astype(np.uint64)) - np.uint64(1), counts)
+    return (_words(raw)[bit >> 3] >> (bit & 7).astype(np.uint64)) & masks
+
+
+# Samples of a batch of blocks, decoded together
+def _decode_blocks(raw, headers):
+    counts = headers["count"]
+    starts = np.cumsum(counts) - counts
+    index = np.arange(int(counts.sum())) - np.repeat(starts, counts)
+    payload = headers["offset"] + BLOCK_HEADER.size
+    dod = _unpack_runs(raw, payload, np.maximum(counts - 2, 0), headers["time_width"].astype(np.int64))
+    dv = _unpack_runs(raw, payload + headers["time_bytes"], np.maximum(counts - 1, 0),
+                      headers["value_width"].astype(np.int64))
+    # Tick deltas (the first stored, the rest summed from their deltas), then ticks
+    step = np.zeros(len(index), dtype=np.int64)
+    step[index >= 2] = unzigzag(dod)
+    several = counts > 1
+    step[starts[several] + 1] = headers["first_delta"][several]
+    ticks = _segment_cumsum(_segment_cumsum(step, counts), counts) + np.repeat(headers["first"], counts)
+    change = np.zeros(len(index), dtype=np.int64)
+    change[index >= 1] = unzigzag(dv)
+    change[starts] = headers["v_first"]
+    return ticks * TICK_SECONDS, _segment_cumsum(change, counts).astype(np.int16)
+
+
+# Samples of the blocks overlapping [t0, t1], as epoch seconds and int16
+# readings. Edge blocks come whole; trim them if needed. Pass headers from
+# blocks() to skip walking them again.
+def decode(data, t0=None, t1=None, headers=None):
+    if headers is None:
+        headers = blocks(data)
+    headers = select(headers, t0, t1)
+    if not len(headers):
+        return np.empty(0), np.empty(0, dtype=np.int16)
+    # Room for the last 64-bit read
+    raw = np.concatenate((np.frombuffer(data, dtype=np.uint8), np.zeros(8, dtype=np.uint8)))
+    parts = [_decode_blocks(raw, headers[lo:lo + DECODE_BLOCKS]) for lo in range(0, len(headers), DECODE_BLOCKS)]
+    if len(parts) == 1:
+        return parts[0]
+    times, values = zip(*parts)
+    return np.concatenate(times), np.concatenate(values)
+
+
+# Number of samples in [t0, t1] with readings in [low, high] (None: unbounded).
+# Blocks wholly inside both ranges are counted from their headers; only those
+# straddling an edge are decoded.
+def count(data, t0=None, t1=None, low=None, high=None, headers=None):
+    if headers is None:
+        headers = blocks(data)
+    headers = select(headers, t0, t1, low, high)
+    whole = np.ones(len(headers), dtype=bool)
+    if t0 is not None:
+        whole &= headers["first"] * TICK_SECONDS >= t0
+    if t1 is not None:
+        whole &= headers["last"] * TICK_SECONDS <= t1
+    if low is not None:
+        whole &= headers["v_min"] >= low
+    if high is not None:
+        whole &= headers["v_max"] <= high
+    total = int(headers["count"][whole].sum())
+    if whole.all():
+        return total
+    times, values = decode(data, headers=headers[~whole])
+    keep = np.ones(len(times), dtype=bool)
+    if t0 is not None:
+        keep &= times >= t0
+    if t1 is not None:
+        keep &= times <= t1
+    if low is not None:
+        keep &= values >= low
+    if high is not None:
+        keep &= values <= high
+    return total + int(np.count_nonzero(keep))
+
+
+def main(argv=None):
+    import pandas as pd
+
+    from laundry.simulation import generate_vibration
+
+    parser = argparse.ArgumentParser(description="Compress a simulated vibration recording and time scans over it")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--rate", type=int, default=50, help="samples per second")
+    parser.add_argument("--threshold", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    t, values = generate_vibration(seed=0, hours=args.hours, rate_hz=args.rate)
+    times = 1.7e9 + t
+    frame = pd.DataFrame({'time': pd.to_datetime(times, unit='s'), 'value': values.astype(np.int64)})
+
+    def timed(fn, repeat=5):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        return result, best
+
+    data, encode_seconds = timed(lambda: encode(times, values), 1)
+    frame_bytes = int(frame.memory_usage(index=False, deep=True).sum())
+    print(f"{len(times)} samples: {frame_bytes / 2**20:.1f} MiB as a frame, {len(data) / 2**20:.2f} MiB encoded "
+          f"({frame_bytes / len(data):.1f}x, {8 * len(data) / len(times):.2f} bits per sample), "
+          f"encoded in {1000 * encode_seconds:.0f} ms")
+
+    (decoded_times, decoded_values), decode_seconds = timed(lambda: decode(data))
+    assert np.array_equal(decoded_values, values)
+    assert np.abs(decoded_times - times).max() <= TICK_SECONDS / 2 + 1e-6
+    print(f"decoded in {1000 * decode_seconds:.1f} ms ({len(times) / decode_seconds / 1e6:.0f}M samples/s)")
+
+    headers = blocks(data)
+
+    # Readings below the threshold (Running) in [t0, t1]: filtering the frame,
+    # decoding the overlapping blocks, and counting with count()
+    def scan(label, t0, t1):
+        start, end = pd.Timestamp(t0, unit='s'), pd.Timestamp(t1, unit='s')
+
+        def frame_scan():
+            window = frame[(frame['time'] >= start) & (frame['time'] <= end)]
+            return int((window['value'] < args.threshold).sum())
+
+        def decode_scan():
+            ts, vs = decode(data, t0, t1, headers=headers)
+            inside = (ts >= t0) & (ts <= t1)
+            return int((vs[inside] < args.threshold).sum())
+
+        expected, frame_seconds = timed(frame_scan)
+        found, decode_seconds = timed(decode_scan)
+        counted, count_seconds = timed(lambda: count(data, t0, t1, high=args.threshold - 1, headers=headers))
+        assert found == counted == expected
+        print(f"{label} scan: {1000 * frame_seconds:.2f} ms over the frame, {1000 * decode_seconds:.2f} ms decoding "
+              f"{len(select(headers, t0, t1))} of {len(headers)} blocks, {1000 * count_seconds:.2f} ms with count()")
+
+    middle = times[0] + args.hours * 1800
+    scan("one-hour", middle, middle + 3600)
+    scan("whole-file", times[0], times[-1])
+
+if __name__ == "__main__":
+    main()
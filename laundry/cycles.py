@@ -0,0 +1,135 @@
+# Cycle detection over raw vibration samples.
+# As in the sketch, a low reading means vibration (Running). A hysteresis band
+# around the threshold and a minimum dwell time stop readings that hover near
+# the threshold from splitting one cycle into many. Everything runs as NumPy
+# array operations; there is no per-sample Python loop. Long recordings can be
+# fed to a CycleDetector piece by piece instead of being read whole.
+import numpy as np
+
+THRESHOLD = 500
+# Width of the band around the threshold in which the status does not change
+HYSTERESIS = 50
+# Shortest cycle, and shortest pause inside a cycle, that count (seconds)
+MIN_DWELL_SECONDS = 60.0
+
+
+# Timestamps as float seconds, whether given as numbers or datetime64
+def _seconds(times):
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return times.astype('datetime64[ns]').astype(np.int64) / 1e9
+    return times.astype(np.float64, copy=False)
+
+
+# Sample indices where the status flips, given whether it was Running before the first.
+# A reading only changes the status once it leaves the hysteresis band.
+def _status_changes(values, threshold, hysteresis, running):
+    values = np.asarray(values)
+    low = threshold - hysteresis / 2
+    high = threshold + hysteresis / 2
+    below = values < low
+    # Only samples outside the band decide anything; the rest keep the previous status
+    decided = np.flatnonzero(below | (values >= high))
+    state = below[decided]
+    previous = np.empty_like(state)
+    previous[:1] = running
+    previous[1:] = state[:-1]
+    return decided[state != previous]
+
+
+# Sample indices where the machine switches to Running (starts) and back to Stopped (ends).
+def transitions(values, threshold=THRESHOLD, hysteresis=HYSTERESIS, initially_running=False):
+    changes = _status_changes(values, threshold, hysteresis, initially_running)
+    if initially_running:
+        # The data opens mid-cycle; treat sample 0 as the start
+        changes = np.concatenate(([0], changes))
+    return changes[0::2], changes[1::2]
+
+
+# Merge cycles (start and end seconds) separated by a pause shorter than min_gap,
+# then drop those shorter than min_dwell (an unfinished one may still grow).
+# Returns, per cycle left, the positions of its first start and last end, its
+# duration and whether it is ongoing.
+def _settle(start, end, ongoing, min_dwell, min_gap):
+    first = last = np.arange(len(start))
+    if len(start) > 1:
+        keep = start[1:] - end[:-1] >= min_gap
+        first = first[np.concatenate(([True], keep))]
+        last = last[np.concatenate((keep, [True]))]
+        ongoing = ongoing[np.concatenate((keep, [True]))]
+    duration = end[last] - start[first]
+    keep = (duration >= min_dwell) | ongoing
+    return first[keep], last[keep], duration[keep], ongoing[keep]
+
+
+# Detect cycles in a recording of (times, values).
+# Returns columnar arrays: start and end times (same type as `times`), duration in
+# seconds and whether the cycle was still running when the recording ended.
+def detect_cycles(times, values, threshold=THRESHOLD, hysteresis=HYSTERESIS,
+                  min_dwell=MIN_DWELL_SECONDS, min_gap=None, initially_running=False):
+    times = np.asarray(times)
+    seconds = _seconds(times)
+    if min_gap is None:
+        min_gap = min_dwell
+
+    starts, ends = transitions(values, threshold, hysteresis, initially_running)
+    ongoing = np.zeros(len(starts), dtype=bool)
+    if len(ends) < len(starts):
+        # Still running at the last sample
+        ends = np.append(ends, len(seconds) - 1)
+        ongoing[-1] = True
+
+    first, last, duration, ongoing = _settle(seconds[starts], seconds[ends], ongoing, min_dwell, min_gap)
+    return {
+        'start': times[starts[first]],
+        'end': times[ends[last]],
+        'duration_seconds': duration,
+        'ongoing': ongoing,
+    }
+
+
+# detect_cycles over samples fed in consecutive pieces, in time order. Only the
+# status and the times it changed at are kept between pieces, so a cycle that
+# crosses a piece boundary comes out whole. Times come out as float seconds.
+class CycleDetector:
+    def __init__(self, threshold=THRESHOLD, hysteresis=HYSTERESIS, min_dwell=MIN_DWELL_SECONDS,
+                 min_gap=None, initially_running=False):
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.min_dwell = min_dwell
+        self.min_gap = min_dwell if min_gap is None else min_gap
+        self.initially_running = initially_running
+        self.running = initially_running
+        self._changes = []
+        self._first = self._last = None
+
+    def feed(self, times, values):
+        seconds = _seconds(times)
+        if not len(seconds):
+            return
+        if self._first is None:
+            self._first = float(seconds[0])
+        self._last = float(seconds[-1])
+        changes = _status_changes(values, self.threshold, self.hysteresis, self.running)
+        self._changes.append(seconds[changes])
+        if len(changes) % 2:
+            self.running = not self.running
+
+    # Cycles in everything fed so far, as detect_cycles returns them
+    def cycles(self):
+        changes = np.concatenate(self._changes) if self._changes else np.empty(0)
+        if self.initially_running and self._first is not None:
+            # The data opens mid-cycle; treat the first sample as the start
+            changes = np.concatenate(([self._first], changes))
+        starts, ends = changes[0::2], changes[1::2]
+        ongoing = np.zeros(len(starts), dtype=bool)
+        if len(ends) < len(starts):
+            ends = np.append(ends, self._last)
+            ongoing[-1] = True
+        first, last, duration, ongoing = _settle(starts, ends, ongoing, self.min_dwell, self.min_gap)
+        return {
+            'start': starts[first],
+            'end': ends[last],
+            'duration_seconds': duration,
+            'ongoing': ongoing,
+        }
@@ -0,0 +1,44 @@
+# Connections to real devices, one per server process and shared by every session
+# and page: HTTP pollers for LAUNDRY_DEVICES and serial readers for LAUNDRY_SERIAL.
+# With LAUNDRY_NOTIFY_URL set, their finished cycles are posted to that URL.
+import os
+
+import streamlit as st
+
+from laundry.ingest import StatusPoller, parse_devices
+
+
+# Dispatcher posting every device's finished cycles to a webhook
+@st.cache_resource(show_spinner=False)
+def shared_notifier(url):
+    from laundry.notify import Dispatcher, WebhookSink
+
+    dispatcher = Dispatcher()
+    dispatcher.subscribe(url, WebhookSink(url))
+    return dispatcher.start()
+
+
+# Feed a reader's status changes to the notifier, if one is configured
+def _notify(reader):
+    url = os.environ.get("LAUNDRY_NOTIFY_URL")
+    if url:
+        reader.store.listeners.append(shared_notifier(url).on_status)
+    return reader
+
+
+# Poller for the devices in a LAUNDRY_DEVICES list
+@st.cache_resource(show_spinner=False)
+def shared_status_poller(devices_config):
+    return _notify(StatusPoller(parse_devices(devices_config))).start()
+
+
+# Reader for the ports in a LAUNDRY_SERIAL list; samples go to the store at
+# `store_path` when one is configured
+@st.cache_resource(show_spinner=False)
+def shared_serial_reader(ports_config, store_path):
+    # Serial ports need termios, so only POSIX servers import this
+    from laundry.serial_ingest import SerialReader
+    from laundry.store import Store
+
+    sample_store = Store(store_path) if store_path else None
+    return _notify(SerialReader(parse_devices(ports_config), sample_store=sample_store)).start()
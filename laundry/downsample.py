@@ -0,0 +1,57 @@
+# Server-side downsampling of long sample series before they are charted.
+# Min/max bucketing keeps the visual envelope of the signal at a given pixel
+# width, and the samples on either side of every threshold crossing are kept
+# exactly, so status changes never disappear from the chart.
+import numpy as np
+
+# Pixel width the charts are drawn at (the slides use the wide layout)
+CHART_WIDTH_PX = 1000
+
+
+# Point budget for a chart `width_px` wide: a minimum and a maximum per pixel column
+def points_for_width(width_px=CHART_WIDTH_PX):
+    return 2 * int(width_px)
+
+
+# Indices of the samples on both sides of every crossing of `threshold`
+def crossing_indices(values, threshold):
+    below = np.asarray(values) < threshold
+    after = np.flatnonzero(below[1:] != below[:-1]) + 1
+    return np.concatenate((after - 1, after))
+
+
+# Indices of the first, last, minimum and maximum sample of each of `buckets`
+# equal-sized runs of the series
+def minmax_indices(values, buckets):
+    values = np.asarray(values)
+    n = len(values)
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    # Pad the last bucket with its final value so the series reshapes evenly
+    padded = np.concatenate((values, np.repeat(values[-1:], buckets * size - n)))
+    grid = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picks = np.concatenate((
+        offsets,
+        offsets + grid.argmin(axis=1),
+        offsets + grid.argmax(axis=1),
+        np.minimum(offsets + size - 1, n - 1),
+    ))
+    return np.minimum(picks, n - 1)
+
+
+# Reduce (times, values) to about `max_points` points for charting.
+# Series that already fit are returned unchanged. Threshold crossings are always
+# kept, so a very noisy series can exceed the budget by two points per crossing.
+def downsample(times, values, max_points=None, threshold=None):
+    times = np.asarray(times)
+    values = np.asarray(values)
+    max_points = max_points or points_for_width()
+    if len(values) <= max_points:
+        return times, values
+    # Four points (first, min, max, last) per bucket
+    keep = minmax_indices(values, max(1, max_points // 4))
+    if threshold is not None:
+        keep = np.concatenate((keep, crossing_indices(values, threshold)))
+    keep = np.unique(keep)
+    return times[keep], values[keep]
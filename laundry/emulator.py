@@ -0,0 +1,203 @@
+# Emulator of the Arduino sketch's web server for capacity testing.
+# Thousands of virtual devices run in one asyncio process, either one port per
+# device or all behind a single port at /dev/<n>/ and /dev/<n>/status.
+#
+#   python -m laundry.emulator --devices 2000 --port 8600
+#   python -m laundry.emulator --devices 200 --port 9000 --ports
+import argparse
+import asyncio
+import json
+
+import numpy as np
+
+# Same values as the sketch
+THRESHOLD = 500
+LOOP_DELAY = 0.3
+RUNNING = "Running 🌀"
+STOPPED = "Stopped 🧺"
+
+# Chance per loop that an idle machine starts a cycle or a running one finishes
+START_PROBABILITY = 0.0005
+STOP_PROBABILITY = 0.0005
+
+# The page sendWebPage() serves
+SKETCH_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8">
+  <title>Laundry Monitor</title>
+  <style>
+    body { font-family: Arial; background: #f9f9f9; text-align: center; padding-top: 50px; }
+    h1 { color: #333; }
+    .status { font-size: 2em; margin-top: 20px; color: #222; }
+  </style>
+</head>
+<body>
+  <h1>Laundry Status Monitor 🧼</h1>
+  <div class="status">Status: <span id="stat">Loading...</span></div>
+  <script>
+    async function update() {
+      const res = await fetch('status');
+      const data = await res.json();
+      document.getElementById('stat').innerText = data.status;
+    }
+    update();
+    setInterval(update, 2000);
+  </script>
+</body>
+</html>
+"""
+
+
+# State of every virtual device, advanced for the whole fleet at once
+class VirtualFleet:
+    def __init__(self, devices, seed=0):
+        self.size = devices
+        self._rng = np.random.default_rng(seed)
+        self.running = self._rng.random(devices) < 0.3
+        self.values = np.zeros(devices, dtype=np.int16)
+        # lastStatus in the sketch: None until the first loop, then running or not
+        self.last_running = np.zeros(devices, dtype=bool)
+        self.started = False
+        self.status_changes = 0
+        self.tick()
+
+    # One pass of loop(): read the sensor, apply the threshold, track changes
+    def tick(self):
+        rng = self._rng
+        flip = rng.random(self.size)
+        self.running ^= np.where(self.running, flip < STOP_PROBABILITY, flip < START_PROBABILITY)
+        self.values = np.where(
+            self.running,
+            rng.integers(50, 401, size=self.size),
+            rng.integers(600, 901, size=self.size),
+        ).astype(np.int16)
+        current = self.values < THRESHOLD
+        if self.started:
+            self.status_changes += int(np.count_nonzero(current != self.last_running))
+        self.last_running = current
+        self.started = True
+
+    def status(self, device):
+        return RUNNING if self.last_running[device] else STOPPED
+
+
+# Serves the sketch's two endpoints for a VirtualFleet
+class Emulator:
+    def __init__(self, fleet, keep_alive=False):
+        self.fleet = fleet
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self._servers = []
+        self._ticker = None
+
+    def _response(self, device, path):
+        if device is None or not 0 <= device < self.fleet.size:
+            return "404 Not Found", "text/plain", b"Unknown device\n"
+        if path.endswith("/status"):
+            body = json.dumps({"status": self.fleet.status(device)}, ensure_ascii=False) + "\r\n"
+            return "200 OK", "application/json", body.encode("utf-8")
+        return "200 OK", "text/html", SKETCH_PAGE.encode("utf-8")
+
+    async def _handle(self, reader, writer, device=None):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                # Skip the headers; the sketch only ever looks at the request line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode("latin-1").split()
+                path = parts[1] if len(parts) > 1 else "/"
+                target = device
+                if target is None:
+                    # Multiplexed port: /dev/<n>/status or /dev/<n>/
+                    pieces = path.split("/")
+                    if len(pieces) > 2 and pieces[1] == "dev" and pieces[2].isdigit():
+                        target = int(pieces[2])
+                status, content_type, body = self._response(target, path)
+                self.requests += 1
+                head = f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                if self.keep_alive:
+                    head += f"Content-Length: {len(body)}\r\n\r\n"
+                else:
+                    head += "Connection: close\r\n\r\n"
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if not self.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _tick_forever(self):
+        while True:
+            await asyncio.sleep(LOOP_DELAY)
+            self.fleet.tick()
+
+    # Listen on one port per device, base_port + n
+    async def serve_ports(self, host, base_port):
+        for device in range(self.fleet.size):
+            server = await asyncio.start_server(
+                lambda r, w, d=device: self._handle(r, w, d), host, base_port + device, backlog=64)
+            self._servers.append(server)
+        self._ticker = asyncio.ensure_future(self._tick_forever())
+
+    # Listen on a single port and route by /dev/<n>/ prefix
+    async def serve_multiplexed(self, host, port):
+        server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        self._servers.append(server)
+        self._ticker = asyncio.ensure_future(self._tick_forever())
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+
+# Base URL of each emulated device, as StatusPoller and the load generator expect
+def device_urls(devices, host="127.0.0.1", port=8600, ports=False):
+    if ports:
+        return {f"device-{n}": f"http://{host}:{port + n}" for n in range(devices)}
+    return {f"device-{n}": f"http://{host}:{port}/dev/{n}" for n in range(devices)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Emulate many laundry monitor devices")
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--ports", action="store_true", help="one port per device instead of /dev/<n>/ routing")
+    parser.add_argument("--keep-alive", action="store_true", help="allow connection reuse (the sketch closes every connection)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    async def run():
+        emulator = Emulator(VirtualFleet(args.devices, seed=args.seed), keep_alive=args.keep_alive)
+        if args.ports:
+            await emulator.serve_ports(args.host, args.port)
+            where = f"ports {args.port}-{args.port + args.devices - 1}"
+        else:
+            await emulator.serve_multiplexed(args.host, args.port)
+            where = f"http://{args.host}:{args.port}/dev/<0-{args.devices - 1}>/status"
+        print(f"Emulating {args.devices} devices on {where}")
+        try:
+            while True:
+                await asyncio.sleep(10)
+                print(f"{emulator.requests} requests served, {emulator.fleet.status_changes} status changes")
+        finally:
+            await emulator.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+# Static export of the slide deck.
+# Every page is rendered once through Streamlit's AppTest and written out as a
+# plain HTML file: markdown is turned into HTML, diagrams become image files,
+# Altair charts become Vega-Lite specs with their (already aggregated) rows
+# inlined, and tables become HTML. The chart libraries are copied into the
+# bundle, so it can be served by any file server and works without network
+# access; a chart whose libraries could not be copied shows its rows as a table.
+# Pages with controls or live data are shown as a snapshot taken at export time.
+#
+#   python -m laundry.export site/
+#   python -m http.server -d site
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from laundry.pages import PAGES
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "slides.py")
+
+# Chart libraries copied into assets/, in load order, and where to fetch them
+# when they are neither in --scripts nor in SCRIPT_CACHE
+SCRIPTS = {
+    "vega.min.js": "https://cdn.jsdelivr.net/npm/vega@6/build/vega.min.js",
+    "vega-lite.min.js": "https://cdn.jsdelivr.net/npm/vega-lite@6/build/vega-lite.min.js",
+    "vega-embed.min.js": "https://cdn.jsdelivr.net/npm/vega-embed@7/build/vega-embed.min.js",
+}
+SCRIPT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "laundry", "export")
+DOWNLOAD_TIMEOUT = 30
+
+# Layout of the exported pages, close to Streamlit's wide layout
+STYLE = """
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: #31333F; display: flex; }
+nav { width: 16rem; min-height: 100vh; padding: 2rem 1.5rem; background: #f0f2f6; box-sizing: border-box; flex: none; }
+nav a { display: block; padding: 0.25rem 0; color: #31333F; text-decoration: none; }
+nav a.current { font-weight: bold; color: #1E88E5; }
+main { flex: 1; padding: 3rem 5rem; min-width: 0; }
+.row { display: flex; gap: 1rem; }
+.row > .column { min-width: 0; }
+.border { border: 1px solid rgba(49, 51, 63, 0.2); border-radius: 0.5rem; padding: 1rem; margin-bottom: 1rem; }
+.chart { width: 100%; }
+img { max-width: 100%; }
+pre { background: #f5f5f5; padding: 1rem; border-radius: 5px; overflow-x: auto; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1rem; }
+th, td { border: 1px solid #e6e9ef; padding: 0.3rem 0.6rem; text-align: left; }
+.caption { color: rgba(49, 51, 63, 0.6); font-size: 0.875rem; }
+.widget { color: rgba(49, 51, 63, 0.8); margin: 0.5rem 0; }
+.metric-value { font-size: 2.25rem; }
+.alert { padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0; background: #fffce7; }
+.snapshot { padding: 0.5rem 1rem; border-radius: 0.5rem; background: #e8f1fb; margin-bottom: 1rem; }
+"""
+
+# Draws the charts over their fallback tables when the libraries are in the bundle
+BOOT = """
+if (window.vegaEmbed) {
+  document.querySelectorAll('.chart').forEach(function (el) {
+    vegaEmbed(el, JSON.parse(el.dataset.spec), {actions: false});
+  });
+}
+"""
+
+HTML_BLOCK_END = {"style": "</style>", "script": "</script>", "pre": "</pre>"}
+LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+\.)\s+(.*)$")
+
+
+# File name of a page in the bundle; the first page is the index
+def page_filename(title, index=0):
+    if index == 0:
+        return "index.html"
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-") + ".html"
+
+
+# Inline markdown: code spans, links, bold and italics
+def _inline(text, allow_html=True):
+    parts = re.split(r"(`[^`]*`)", text)
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            out.append(f"<code>{html.escape(part[1:-1])}</code>")
+            continue
+        if not allow_html:
+            part = html.escape(part, quote=False)
+        part = re.sub(r"\[([^\]]+)\]\(([^)\s]+)\)", r'<a href="\2">\1</a>', part)
+        part = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", part)
+        part = re.sub(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])", r"<em>\1</em>", part)
+        out.append(part)
+    return "".join(out)
+
+
+# Nested lists from (indent, marker, text) items
+def _list_html(items, allow_html):
+    out, stack = [], []
+    for indent, marker, text in items:
+        tag = "ol" if marker[0].isdigit() else "ul"
+        if not stack or indent > stack[-1][0]:
+            stack.append((indent, tag))
+            out.append(f"<{tag}><li>")
+        else:
+            while len(stack) > 1 and indent < stack[-1][0]:
+                out.append(f"</li></{stack.pop()[1]}>")
+            out.append("</li><li>")
+        out.append(_inline(text, allow_html))
+    while stack:
+        out.append(f"</li></{stack.pop()[1]}>")
+    return "".join(out)
+
+
+# Markdown to HTML for what the slides write: headings, paragraphs, nested
+# lists, block quotes, rules, raw HTML blocks and inline markup
+def markdown_html(text, allow_html=True):
+    lines = text.splitlines()
+    out = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            i += 1
+            continue
+        tag = re.match(r"<(\w+)", stripped)
+        if allow_html and tag:
+            # A raw HTML block runs to its closing tag (style, script, pre) or to a blank line
+            end = HTML_BLOCK_END.get(tag.group(1).lower())
+            block = []
+            while i < len(lines) and (lines[i].strip() if end is None else True):
+                block.append(lines[i])
+                i += 1
+                if end is not None and end in block[-1].lower():
+                    break
+            out.append("\n".join(block))
+            continue
+        heading = re.match(r"^(#{1,6})\s+(.*?)\s*#*$", stripped)
+        if heading:
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2), allow_html)}</h{level}>")
+            i += 1
+            continue
+        if re.match(r"^(-{3,}|\*{3,}|_{3,})$", stripped):
+            out.append("<hr>")
+            i += 1
+            continue
+        if stripped.startswith(">"):
+            quoted = []
+            while i < len(lines) and lines[i].strip().startswith(">"):
+                quoted.append(re.sub(r"^\s*>\s?", "", lines[i]))
+                i += 1
+            quote = markdown_html("\n".join(quoted), allow_html)
+            out.append(f"<blockquote>{quote}</blockquote>")
+            continue
+        if LIST_ITEM.match(line):
+            items = []
+            while i < len(lines) and lines[i].strip():
+                item = LIST_ITEM.match(lines[i])
+                if item:
+                    items.append([len(item.group(1).expandtabs()), item.group(2), item.group(3)])
+                else:
+                    items[-1][2] += " " + lines[i].strip()
+                i += 1
+            out.append(_list_html(items, allow_html))
+            continue
+        paragraph = []
+        while i < len(lines) and lines[i].strip() and not LIST_ITEM.match(lines[i]) \
+                and not re.match(r"^(#{1,6}\s|>)", lines[i].strip()):
+            paragraph.append(lines[i].strip())
+            i += 1
+        paragraph = _inline("\n".join(paragraph), allow_html)
+        out.append(f"<p>{paragraph}</p>")
+    return "\n".join(out)
+
+
+def _markdown(body, css_class="md", inline=False, allow_html=True):
+    rendered = _inline(body, allow_html) if inline else markdown_html(body, allow_html)
+    return f'<div class="{css_class}">{rendered}</div>'
+
+
+# Rows of an Arrow payload as a DataFrame
+def _frame(arrow_bytes):
+    from streamlit.dataframe_util import convert_arrow_bytes_to_pandas_df
+
+    return convert_arrow_bytes_to_pandas_df(arrow_bytes)
+
+
+# Vega-Lite spec with the chart's named datasets inlined as JSON rows
+def chart_spec(proto):
+    spec = json.loads(proto.spec)
+    datasets = spec.setdefault("datasets", {})
+    for dataset in proto.datasets:
+        datasets[dataset.name] = json.loads(_frame(dataset.data.data).to_json(orient="records", date_format="iso"))
+    if proto.HasField("data"):
+        spec["data"] = {"values": json.loads(_frame(proto.data.data).to_json(orient="records", date_format="iso"))}
+    if proto.use_container_width:
+        spec["width"] = "container"
+    return spec
+
+
+# The rows behind a chart as an HTML table, shown until (or instead of) the chart
+def _chart_table(spec):
+    import pandas as pd
+
+    rows = spec.get("data", {}).get("values")
+    if rows is None:
+        rows = next(iter(spec.get("datasets", {}).values()), [])
+    return pd.DataFrame(rows).to_html(index=False, border=0)
+
+
+# Copy the chart libraries into assets/, from `source` (a folder holding them),
+# the download cache or the CDN. Returns the files copied, or None if any is missing.
+def vendor_scripts(root, source=None):
+    copied = []
+    for name, url in SCRIPTS.items():
+        found = os.path.join(source, name) if source else None
+        if found is None or not os.path.exists(found):
+            found = os.path.join(SCRIPT_CACHE, name)
+        if not os.path.exists(found):
+            try:
+                with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                    data = response.read()
+            except OSError:
+                return None
+            os.makedirs(SCRIPT_CACHE, exist_ok=True)
+            with open(found, "wb") as f:
+                f.write(data)
+        shutil.copyfile(found, os.path.join(root, "assets", name))
+        copied.append(name)
+    return copied
+
+
+# Image files of the exported pages. AppTest keeps media in a store that only
+# lives for one run, so files are captured as they are added to it.
+class Assets:
+    def __init__(self, root):
+        self.root = root
+        self.files = {}
+        os.makedirs(os.path.join(root, "assets"), exist_ok=True)
+
+    @contextmanager
+    def capture(self):
+        from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+        load = MemoryMediaFileStorage.load_and_get_id
+        files = self.files
+
+        def load_and_get_id(storage, path_or_data, mimetype, kind, filename=None):
+            file_id = load(storage, path_or_data, mimetype, kind, filename)
+            files[file_id] = storage.get_file(file_id).content
+            return file_id
+
+        MemoryMediaFileStorage.load_and_get_id = load_and_get_id
+        try:
+            yield self
+        finally:
+            MemoryMediaFileStorage.load_and_get_id = load
+
+    # Write the image behind a media URL into assets/ and return its relative path
+    def image(self, url):
+        filename = url.rsplit("/", 1)[-1]
+        with open(os.path.join(self.root, "assets", filename), "wb") as f:
+            f.write(self.files[filename.split(".", 1)[0]])
+        return f"assets/{filename}"
+
+
+# HTML for one element of the AppTest tree; widgets keep only their label and value
+def render_element(element, assets):
+    kind = element.type
+    proto = element.proto
+    if kind == "markdown":
+        return _markdown(proto.body, allow_html=proto.allow_html)
+    if kind == "caption":
+        return _markdown(proto.body, "md caption", allow_html=proto.allow_html)
+    if kind in ("title", "header", "subheader"):
+        return _markdown(proto.body if hasattr(proto, "body") else element.value)
+    if kind == "code":
+        return f"<pre><code>{html.escape(proto.code_text)}</code></pre>"
+    if kind == "image":
+        return "".join(f'<img src="{assets.image(img.url)}" alt="{html.escape(img.caption)}">' for img in proto.imgs)
+    if kind == "vega_lite_chart":
+        spec = chart_spec(proto)
+        return f'<div class="chart" data-spec="{html.escape(json.dumps(spec))}">{_chart_table(spec)}</div>'
+    if kind in ("dataframe", "table"):
+        return element.value.to_html(index=False, border=0)
+    if kind == "metric":
+        return (f'<div class="metric">{_markdown(proto.label, "md caption", inline=True)}'
+                f'<div class="metric-value">{html.escape(proto.body)}</div></div>')
+    if kind in ("warning", "info", "success", "error", "exception"):
+        return f'<div class="alert">{_markdown(getattr(proto, "body", "") or getattr(proto, "message", ""))}</div>'
+    if hasattr(element, "label") and hasattr(element, "value"):
+        value = element.value
+        if isinstance(value, (list, tuple)):
+            value = " – ".join(str(v) for v in value)
+        return f'<div class="widget"><b>{html.escape(element.label)}:</b> {html.escape(str(value))}</div>'
+    # Elements without a static form (uploaders, spinners, ...) are left out
+    return ""
+
+
+# HTML for a block and everything inside it
+def render_block(block, assets):
+    inner = "".join(render_node(child, assets) for child in block.children.values())
+    kind = block.type
+    if kind == "column":
+        return f'<div class="column" style="flex: {block.weight or 1}">{inner}</div>'
+    if kind in ("expander", "tab"):
+        return f"<details open><summary>{html.escape(block.label)}</summary>{inner}</details>"
+    if kind == "flex_container":
+        flex = block.proto.flex_container
+        horizontal = flex.direction == type(flex).Direction.Value("HORIZONTAL")
+        css = ("row " if horizontal else "") + ("border" if flex.border else "")
+        return f'<div class="{css.strip()}">{inner}</div>'
+    if kind == "horizontal":
+        return f'<div class="row">{inner}</div>'
+    if kind == "vertical" and block.proto.vertical.border:
+        return f'<div class="border">{inner}</div>'
+    return f"<div>{inner}</div>"
+
+
+def _is_block(node):
+    from streamlit.testing.v1.element_tree import Block
+
+    return isinstance(node, Block)
+
+
+def render_node(node, assets):
+    if _is_block(node):
+        return render_block(node, assets)
+    return render_element(node, assets)
+
+
+# Whether the page has controls or other elements that only work in the live app
+def _has_controls(node):
+    for child in getattr(node, "children", {}).values():
+        if not _is_block(child) and hasattr(child, "label") and hasattr(child, "value"):
+            return True
+        if _has_controls(child):
+            return True
+    return False
+
+
+def page_html(title, current, main, sidebar, snapshot, scripts=()):
+    nav = "".join(
+        f'<a href="{page_filename(page.title, i)}"{" class=current" if page.title == current else ""}>'
+        f"{html.escape(page.title)}</a>"
+        for i, page in enumerate(PAGES)
+    )
+    note = ""
+    if snapshot:
+        note = (f'<div class="snapshot">Snapshot taken {time.strftime("%Y-%m-%d %H:%M")}; '
+                "controls show the values the page was exported with.</div>")
+    scripts = "".join(f'<script src="assets/{name}"></script>' for name in scripts)
+    return (
+        "<!DOCTYPE html>\n"
+        f'<html lang="en"><head><meta charset="utf-8"><title>{html.escape(current)} · {html.escape(title)}</title>'
+        f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<link rel="stylesheet" href="assets/export.css">{scripts}</head>\n'
+        f"<body><nav><h1>Navigation</h1>{nav}{sidebar}</nav>\n<main>{note}{main}</main>\n"
+        f"<script>{BOOT}</script></body></html>\n"
+    )
+
+
+# Render every page into `out_dir` and return the files written. `scripts` is
+# a folder with the chart libraries, for exporting without network access.
+def export_site(out_dir, title="Laundry Monitor Demo", scripts=None):
+    from streamlit.testing.v1 import AppTest
+
+    # Pages read these from the environment; a static bundle should not depend on them
+    for name in ("LAUNDRY_DEVICES", "LAUNDRY_SERIAL", "LAUNDRY_NOTIFY_URL", "LAUNDRY_STORE",
+                 "LAUNDRY_RECORDINGS", "LAUNDRY_METRICS_FILE"):
+        os.environ.pop(name, None)
+
+    if os.path.isdir(os.path.join(out_dir, "assets")):
+        shutil.rmtree(os.path.join(out_dir, "assets"))
+    assets = Assets(out_dir)
+    with open(os.path.join(out_dir, "assets", "export.css"), "w", encoding="utf-8") as f:
+        f.write(STYLE)
+    vendored = vendor_scripts(out_dir, scripts)
+    if vendored is None:
+        print("Chart libraries not found or downloadable; charts are exported as tables of their rows")
+
+    at = AppTest.from_file(SCRIPT, default_timeout=300)
+    written = []
+    for index, page in enumerate(PAGES):
+        at.session_state["page"] = page.title
+        with assets.capture():
+            at.run()
+        if at.exception:
+            raise RuntimeError(f"{page.title}: {at.exception[0].message}")
+        main = render_block(at.main, assets)
+        # The sidebar's own navigation and controls are replaced by plain links
+        sidebar = "".join(
+            render_element(child, assets) for child in at.sidebar.children.values()
+            if not _is_block(child) and child.type == "markdown" and child.proto.body != "# Navigation"
+        )
+        path = os.path.join(out_dir, page_filename(page.title, index))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page_html(title, page.title, main, sidebar, _has_controls(at.main), vendored or ()))
+        written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the slide deck as static HTML")
+    parser.add_argument("out_dir", help="directory to write the bundle into")
+    parser.add_argument("--scripts", help="folder with " + ", ".join(SCRIPTS) + " (otherwise downloaded once and cached)")
+    args = parser.parse_args(argv)
+    os.makedirs(args.out_dir, exist_ok=True)
+    start = time.perf_counter()
+    written = export_site(args.out_dir, scripts=args.scripts)
+    print(f"Exported {len(written)} pages to {args.out_dir} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
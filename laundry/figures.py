@@ -0,0 +1,236 @@
+# Static matplotlib diagrams used on the slides.
+# Each diagram is rendered once per (name, theme, size, format) into image bytes
+# that every session shares, so reruns never touch matplotlib again.
+import io
+import threading
+
+import numpy as np
+import matplotlib.pyplot as plt
+import streamlit as st
+
+from laundry.cache import LRUCache
+from laundry.profiling import section
+
+# Upper bound on memory held by rendered diagrams across the whole server
+FIGURE_CACHE_BYTES = 16 * 1024 * 1024
+
+# Text colours per Streamlit theme, so labels stay readable on dark backgrounds
+THEMES = {
+    "light": {"text.color": "black"},
+    "dark": {"text.color": "white"},
+}
+
+figure_cache = LRUCache(FIGURE_CACHE_BYTES)
+
+# pyplot keeps global state, and sessions run on separate threads
+_render_lock = threading.Lock()
+
+
+# Simple picture of the laundry monitor device for the Introduction page
+def draw_device(ax):
+    ax.add_patch(plt.Rectangle((0.2, 0.2), 0.6, 0.6, fill=True, color='lightblue'))
+    ax.add_patch(plt.Circle((0.5, 0.5), 0.25, fill=True, color='white'))
+    ax.add_patch(plt.Circle((0.5, 0.5), 0.2, fill=False, color='blue', linewidth=2))
+
+
+# Sensor -> Arduino -> WiFi -> user flowchart for the How It Works page
+def draw_flowchart(ax):
+    # Define the component colors and positions
+    components = [
+        {"name": "Vibration\nSensor", "x": 0.1, "y": 0.5, "width": 0.15, "height": 0.3, "color": "#FFC107"},
+        {"name": "Arduino\nProcessor", "x": 0.35, "y": 0.5, "width": 0.15, "height": 0.3, "color": "#4CAF50"},
+        {"name": "WiFi\nModule", "x": 0.6, "y": 0.5, "width": 0.15, "height": 0.3, "color": "#2196F3"},
+        {"name": "User\nDevices", "x": 0.85, "y": 0.5, "width": 0.15, "height": 0.3, "color": "#9C27B0"}
+    ]
+
+    # Draw each component
+    for comp in components:
+        ax.add_patch(plt.Rectangle(
+            (comp["x"], comp["y"]),
+            comp["width"], comp["height"],
+            fill=True,
+            color=comp["color"],
+            alpha=0.7,
+            linewidth=2,
+            edgecolor='black'
+        ))
+        ax.text(
+            comp["x"] + comp["width"]/2,
+            comp["y"] + comp["height"]/2,
+            comp["name"],
+            ha='center',
+            va='center',
+            fontweight='bold'
+        )
+
+    # Draw arrows between components
+    for i in range(len(components) - 1):
+        x1 = components[i]["x"] + components[i]["width"]
+        y1 = components[i]["y"] + components[i]["height"]/2
+        x2 = components[i+1]["x"]
+        y2 = components[i+1]["y"] + components[i+1]["height"]/2
+
+        ax.annotate(
+            "",
+            xy=(x2, y2),
+            xytext=(x1, y1),
+            arrowprops=dict(
+                arrowstyle="->",
+                linewidth=2,
+                color='#333333'
+            )
+        )
+
+    # Add labels for the data being passed
+    labels = ["Vibration\nData", "Processed\nStatus", "Status\nUpdate"]
+    for i, label in enumerate(labels):
+        x1 = components[i]["x"] + components[i]["width"]
+        x2 = components[i+1]["x"]
+        y = components[i]["y"] + components[i]["height"]/2 + 0.15
+        ax.text((x1 + x2)/2, y, label, ha='center', va='center', fontsize=9, style='italic')
+
+    # Add visualization for the sensor data
+    sensor_x = components[0]["x"] + components[0]["width"]/2
+    sensor_y = components[0]["y"] - 0.15
+    wave_x = np.linspace(sensor_x - 0.1, sensor_x + 0.1, 100)
+    wave_y = 0.03 * np.sin(40 * wave_x) + sensor_y
+    ax.plot(wave_x, wave_y, 'r-', linewidth=1.5)
+    ax.text(sensor_x, sensor_y - 0.05, "Vibrations", ha='center', va='center', fontsize=8)
+
+    # Add visualization for the WiFi signal
+    wifi_x = components[2]["x"] + components[2]["width"]/2
+    wifi_y = components[2]["y"] - 0.15
+
+    # Draw WiFi arcs
+    for i in range(3):
+        radius = 0.03 + i * 0.02
+        arc = plt.matplotlib.patches.Arc(
+            (wifi_x, wifi_y),
+            radius*2, radius*2,
+            theta1=210, theta2=330,
+            linewidth=1.5,
+            color='blue'
+        )
+        ax.add_patch(arc)
+
+    # Draw the user's phone/tablet receiving data
+    user_device_x = components[3]["x"] + components[3]["width"]/2
+    user_device_y = components[3]["y"] - 0.15
+
+    # Phone outline
+    ax.add_patch(plt.Rectangle(
+        (user_device_x - 0.04, user_device_y - 0.1),
+        0.08, 0.15,
+        fill=True,
+        color='lightgray',
+        linewidth=1,
+        edgecolor='black'
+    ))
+
+    # Phone screen
+    ax.add_patch(plt.Rectangle(
+        (user_device_x - 0.035, user_device_y - 0.09),
+        0.07, 0.12,
+        fill=True,
+        color='white',
+        linewidth=1,
+        edgecolor='black'
+    ))
+
+    # Status text on phone
+    ax.text(
+        user_device_x,
+        user_device_y - 0.03,
+        "Status:",
+        ha='center',
+        va='center',
+        fontsize=7,
+        color='black'
+    )
+    ax.text(
+        user_device_x,
+        user_device_y - 0.06,
+        "Running",
+        ha='center',
+        va='center',
+        fontsize=7,
+        color='green',
+        fontweight='bold'
+    )
+
+
+# Arduino to sensor wiring diagram for the Hardware Setup page
+def draw_wiring(ax):
+    # Draw Arduino
+    ax.add_patch(plt.Rectangle((0.1, 0.3), 0.3, 0.4, fill=True, color='lightblue'))
+    ax.text(0.25, 0.5, "Arduino", ha='center', va='center', color='black')
+
+    # Draw Sensor
+    ax.add_patch(plt.Rectangle((0.6, 0.3), 0.3, 0.4, fill=True, color='lightgreen'))
+    ax.text(0.75, 0.5, "Sensor", ha='center', va='center', color='black')
+
+    # Draw connection lines
+    ax.plot([0.4, 0.6], [0.4, 0.4], 'r-', linewidth=2)
+    ax.text(0.5, 0.42, "A0", ha='center', va='bottom', color='red')
+
+    ax.plot([0.4, 0.6], [0.5, 0.5], 'k-', linewidth=2)
+    ax.text(0.5, 0.52, "GND", ha='center', va='bottom')
+
+    ax.plot([0.4, 0.6], [0.6, 0.6], 'b-', linewidth=2)
+    ax.text(0.5, 0.62, "3.3V", ha='center', va='bottom', color='blue')
+
+
+# Diagram name -> (drawing function, default figure size in inches)
+DIAGRAMS = {
+    "device": (draw_device, (4, 4)),
+    "flowchart": (draw_flowchart, (8, 5)),
+    "wiring": (draw_wiring, (6, 4)),
+}
+
+
+# Draw a diagram on a fresh figure and return it encoded as PNG or SVG bytes
+def _render(name, theme, figsize, dpi, fmt):
+    draw, _ = DIAGRAMS[name]
+    with _render_lock, plt.rc_context(THEMES[theme]):
+        fig, ax = plt.subplots(figsize=figsize)
+        try:
+            draw(ax)
+            ax.axis('off')
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt, dpi=dpi, transparent=True, bbox_inches='tight')
+        finally:
+            # Release the figure so nothing accumulates in pyplot's registry
+            plt.close(fig)
+    return buf.getvalue()
+
+
+# Rendered bytes for a diagram, drawing it only the first time it is asked for
+def render_diagram(name, theme="light", figsize=None, dpi=200, fmt="png"):
+    if name not in DIAGRAMS:
+        raise KeyError(f"Unknown diagram: {name}")
+    if theme not in THEMES:
+        theme = "light"
+    figsize = tuple(figsize or DIAGRAMS[name][1])
+    key = (name, theme, figsize, dpi, fmt)
+    return figure_cache.get_or_compute(key, lambda: _render(name, theme, figsize, dpi, fmt))
+
+
+# Light or dark, depending on the theme the viewer's browser reports
+def current_theme():
+    context = getattr(st, "context", None)
+    theme = getattr(context, "theme", None)
+    theme_type = getattr(theme, "type", None)
+    if theme_type in THEMES:
+        return theme_type
+    return st.get_option("theme.base") or "light"
+
+
+# Show a cached diagram in place of st.pyplot
+def show_diagram(name, **kwargs):
+    with section(f"diagram:{name}"):
+        data = render_diagram(name, theme=current_theme(), **kwargs)
+        if kwargs.get("fmt") == "svg":
+            data = data.decode("utf-8")
+        st.image(data, use_container_width=True)
@@ -0,0 +1,174 @@
+# Status of a whole laundry room for the Fleet Overview page.
+# One FleetMonitor per server process keeps every machine's state in a few NumPy
+# columns, refreshes them from its source on a background thread and renders the
+# overview grid once per refresh. Sessions only pick up the latest rendering, so
+# a rerun costs the same whether the room has ten machines or thousands.
+# With a remaining-time model, every running machine's minutes left are predicted
+# in the same refresh, in one call for the whole room.
+import html
+import threading
+import time
+
+import numpy as np
+
+from laundry.emulator import VirtualFleet
+
+KINDS = ("Washer", "Dryer")
+# Seconds between refreshes of the table and the grid
+REFRESH_SECONDS = 1.0
+# A machine not heard from for this long is shown as offline
+STALE_SECONDS = 30.0
+# Share of a simulated room that is washers
+WASHER_SHARE = 0.6
+# States, as stored in FleetTable.state
+OFFLINE, FREE, RUNNING = 0, 1, 2
+STATE_NAMES = ("Offline", "Free", "Running")
+
+
+# Kind of a machine from its name: dryers say so, everything else is a washer
+def kind_of(name):
+    return KINDS.index("Dryer") if "dryer" in name.lower() else KINDS.index("Washer")
+
+
+# One row per machine, one array per column
+class FleetTable:
+    def __init__(self, names, kinds):
+        self.names = list(names)
+        self.kind = np.asarray(kinds, dtype=np.uint8)
+        size = len(self.names)
+        self.state = np.full(size, OFFLINE, dtype=np.uint8)
+        # When each machine entered its state, and when it was last heard from
+        self.since = np.full(size, np.nan)
+        self.updated = np.full(size, np.nan)
+
+    def __len__(self):
+        return len(self.names)
+
+    # Fold in a reading for every machine: running flags, last-heard times (NaN for
+    # never) and whether each is reachable. Only machines whose state changed move `since`.
+    def update(self, running, updated, online, now):
+        online = np.asarray(online, dtype=bool) & (now - np.nan_to_num(updated, nan=-np.inf) <= STALE_SECONDS)
+        state = np.where(online, np.where(running, RUNNING, FREE), OFFLINE).astype(np.uint8)
+        changed = (state != self.state) | np.isnan(self.since)
+        self.since[changed] = now
+        self.state = state
+        self.updated = np.asarray(updated, dtype=np.float64)
+
+    # Machines per (kind, state)
+    def counts(self):
+        return np.bincount(self.kind * len(STATE_NAMES) + self.state,
+                           minlength=len(KINDS) * len(STATE_NAMES)).reshape(len(KINDS), len(STATE_NAMES))
+
+
+# A simulated laundry room: the emulator's fleet, ticked once per refresh
+class SimulatedSource:
+    def __init__(self, machines, seed=0):
+        self.fleet = VirtualFleet(machines, seed=seed)
+        washers = int(round(machines * WASHER_SHARE))
+        self.names = [f"Washer {n + 1}" for n in range(washers)] + [f"Dryer {n + 1}" for n in range(machines - washers)]
+        self.kinds = [kind_of(name) for name in self.names]
+
+    def read(self, now):
+        self.fleet.tick()
+        size = self.fleet.size
+        return self.fleet.last_running, np.full(size, now), np.ones(size, dtype=bool)
+
+
+# Real machines, as last seen by StatusPollers and SerialReaders (anything with
+# `devices` and a StatusStore in `store`)
+class StatusSource:
+    def __init__(self, *readers):
+        self.readers = readers
+        self.names = [name for reader in readers for name in reader.devices]
+        self.kinds = [kind_of(name) for name in self.names]
+
+    def read(self, now):
+        rows = []
+        for reader in self.readers:
+            seen = reader.store.snapshot()
+            rows.extend(seen.get(name) for name in reader.devices)
+        running = np.array([bool(row and row.status and row.status.startswith("Running")) for row in rows])
+        updated = np.array([row.updated if row and row.updated else np.nan for row in rows], dtype=np.float64)
+        online = np.array([bool(row) and row.error is None for row in rows])
+        return running, updated, online
+
+
+# Overview grid of one kind of machine (or all, for kind None) as a single HTML block.
+# `left` holds each machine's predicted minutes to go (NaN where there is none).
+def render_grid(table, now, kind=None, left=None):
+    rows = np.arange(len(table)) if kind is None else np.flatnonzero(table.kind == kind)
+    minutes = np.nan_to_num((now - table.since[rows]) // 60).astype(np.int64).tolist()
+    state = table.state[rows].tolist()
+    to_go = [""] * len(rows) if left is None else [
+        "" if np.isnan(m) else f", about {m:.0f} min left" for m in np.ceil(left[rows]).tolist()]
+    cells = []
+    for row, in_state, minute, note in zip(rows.tolist(), state, minutes, to_go):
+        name = html.escape(table.names[row])
+        label = name.split()[-1] if kind is not None else name[0] + name.split()[-1]
+        cells.append(f'<div class="fleet-cell fleet-{STATE_NAMES[in_state].lower()}" '
+                     f'title="{name}: {STATE_NAMES[in_state]} for {minute} min{note}">{label}</div>')
+    return f'<div class="fleet-grid">{"".join(cells)}</div>'
+
+
+# Background refresh of a FleetTable from a source, with the rendered grids.
+# Readers get an immutable snapshot: (refreshed at, counts, {kind: grid html},
+# {kind: minutes until the first running machine is done, or None}).
+# `predictor` is a predict.RemainingTimeModel, or None for no predictions.
+class FleetMonitor:
+    def __init__(self, source, interval=REFRESH_SECONDS, predictor=None):
+        self.source = source
+        self.interval = interval
+        self.predictor = predictor
+        self.table = FleetTable(source.names, source.kinds)
+        self.snapshot = None
+        # Model the table rows below were looked up in
+        self._model = None
+        self._rows = None
+        self.refresh_seconds = 0.0
+        self._stopping = threading.Event()
+        self._thread = None
+        self.refresh()
+
+    def refresh(self):
+        start = time.perf_counter()
+        now = time.time()
+        table = self.table
+        table.update(*self.source.read(now), now=now)
+        left = self.remaining(now)
+        kinds = (None,) + tuple(range(len(KINDS)))
+        grids = {kind: render_grid(table, now, kind, left) for kind in kinds}
+        soonest = dict.fromkeys(kinds)
+        if left is not None:
+            for kind in kinds:
+                shown = left if kind is None else left[table.kind == kind]
+                if np.isfinite(shown).any():
+                    soonest[kind] = float(np.nanmin(shown))
+        self.snapshot = (now, table.counts(), grids, soonest)
+        self.refresh_seconds = time.perf_counter() - start
+
+    # Predicted minutes left for every running machine (NaN for the others)
+    def remaining(self, now):
+        model = self.predictor.model if self.predictor else None
+        if model is None:
+            return None
+        if model is not self._model:
+            self._model, self._rows = model, model.rows(self.table.names)
+        left = model.predict(self._rows, (now - self.table.since) / 60)
+        left[self.table.state != RUNNING] = np.nan
+        return left
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.refresh()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="laundry-fleet-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
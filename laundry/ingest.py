@@ -0,0 +1,228 @@
+# Device status ingestion over HTTP.
+# One asyncio loop per server process polls GET /status on every device and
+# writes the answers into a StatusStore that all Streamlit sessions read.
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+# Matches the interval the sketch's own web page polls at
+POLL_INTERVAL = 2.0
+REQUEST_TIMEOUT = 1.5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+log = logging.getLogger(__name__)
+
+DeviceStatus = namedtuple("DeviceStatus", "device status updated error failures")
+
+
+# Latest known status per device, safe to read from any thread; `updated` is when
+# the device was last heard from.
+# Listeners are called as listener(device, status, at) whenever a device's status changes.
+class StatusStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices = {}
+        self.listeners = []
+
+    def update(self, device, status, at=None):
+        at = at or time.time()
+        with self._lock:
+            previous = self._devices.get(device)
+            self._devices[device] = DeviceStatus(device, status, at, None, 0)
+        if previous is None or previous.status != status:
+            for listener in self.listeners:
+                listener(device, status, at)
+
+    # A device was heard from (a sample arrived) without a new status
+    def heard(self, device, at=None):
+        at = at or time.time()
+        with self._lock:
+            previous = self._devices.get(device)
+            status = previous.status if previous else None
+            self._devices[device] = DeviceStatus(device, status, at, None, 0)
+
+    def fail(self, device, error, at=None):
+        with self._lock:
+            previous = self._devices.get(device)
+            status = previous.status if previous else None
+            updated = previous.updated if previous else None
+            failures = previous.failures + 1 if previous else 1
+            self._devices[device] = DeviceStatus(device, status, updated, error, failures)
+
+    def get(self, device):
+        with self._lock:
+            return self._devices.get(device)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._devices)
+
+
+# Parse "washer=http://192.168.4.1,dryer=http://192.168.4.2" into {name: url}
+def parse_devices(text):
+    devices = {}
+    for item in (text or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, url = item.partition("=")
+        if not url:
+            name, url = item, item
+        devices[name.strip()] = url.strip().rstrip("/")
+    return devices
+
+
+class HTTPError(Exception):
+    pass
+
+
+# Failures a device is expected to have now and then; anything else is logged too
+POLL_ERRORS = (OSError, asyncio.TimeoutError, HTTPError, ValueError, KeyError, asyncio.IncompleteReadError)
+
+
+# Minimal HTTP/1.1 client over one reusable connection.
+# The sketch answers with "Connection: close", in which case we reconnect per request.
+class DeviceConnection:
+    def __init__(self, url):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only http:// device URLs are supported: {url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self._reader = None
+        self._writer = None
+
+    async def get(self, path):
+        if self._writer is None or self._writer.is_closing():
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        request = (
+            f"GET {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        self._writer.write(request.encode("ascii"))
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise HTTPError("connection closed before response")
+        version, _, rest = status_line.decode("latin-1").partition(" ")
+        code = int(rest.split(" ", 1)[0])
+
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if "content-length" in headers:
+            body = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            # No length (like the sketch): the body runs until the server closes
+            body = await self._reader.read()
+            keep_alive = False
+        if not keep_alive:
+            await self.close()
+        if code != 200:
+            raise HTTPError(f"HTTP {code}")
+        return body
+
+    async def close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+# Polls many devices concurrently, each on its own schedule with timeout and backoff
+class StatusPoller:
+    def __init__(self, devices, store=None, interval=POLL_INTERVAL, timeout=REQUEST_TIMEOUT,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.devices = dict(devices)
+        self.store = store if store is not None else StatusStore()
+        self.interval = interval
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._loop = None
+        self._thread = None
+        self._stopping = None
+
+    async def poll_once(self, device, connection):
+        body = await asyncio.wait_for(connection.get("/status"), self.timeout)
+        answer = json.loads(body.decode("utf-8"))
+        if not isinstance(answer, dict):
+            raise ValueError(f"expected a JSON object, got {type(answer).__name__}")
+        status = answer["status"]
+        self.store.update(device, status)
+        return status
+
+    async def _poll_device(self, device, url):
+        connection = DeviceConnection(url)
+        failures = 0
+        # Spread the first requests so devices are not all polled in lockstep
+        await asyncio.sleep(random.uniform(0, self.interval))
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await self.poll_once(device, connection)
+                    failures = 0
+                    delay = self.interval
+                # Whatever one device does, the others keep being polled
+                except Exception as exc:
+                    if not isinstance(exc, POLL_ERRORS):
+                        log.exception("Polling %s failed", device)
+                    await connection.close()
+                    failures += 1
+                    self.store.fail(device, f"{type(exc).__name__}: {exc}")
+                    # Exponential backoff with jitter, capped
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+                    delay *= random.uniform(0.5, 1.0)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await connection.close()
+
+    async def run(self):
+        self._stopping = asyncio.Event()
+        await asyncio.gather(*(self._poll_device(d, u) for d, u in self.devices.items()))
+
+    # Run the poller on a daemon thread with its own event loop
+    def start(self):
+        if self._thread is not None:
+            return self
+        ready = threading.Event()
+
+        def main():
+            self._loop = asyncio.new_event_loop()
+            task = self._loop.create_task(self.run())
+            self._loop.call_soon(ready.set)
+            self._loop.run_until_complete(task)
+            self._loop.close()
+
+        self._thread = threading.Thread(target=main, name="laundry-status-poller", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout)
+        self._thread = None
@@ -0,0 +1,96 @@
+# Interval index over cycles for time-range queries.
+# Cycle starts and ends are kept in two sorted arrays with prefix sums. The number
+# of cycles running at t is #(start <= t) - #(end <= t), and the busy time up to t
+# is sum(t - start) over the starts before t minus sum(t - end) over the ends
+# before t. Both come from binary searches, so any range, instant or batch of hour
+# boundaries costs O(log n) per point, however many years of cycles are indexed.
+# Overlapping intervals need no special care, so the same structure serves one
+# machine and a whole fleet (where busy time is machine time).
+import numpy as np
+
+SECONDS_PER_HOUR = 3600
+
+
+class IntervalIndex:
+    def __init__(self, start, end):
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(end, dtype=np.float64)
+        # Cycles in start order, with the latest end so far for finding overlaps
+        self.order = np.argsort(start, kind="stable")
+        self.start = start[self.order]
+        self.end = end[self.order]
+        self.max_end = np.maximum.accumulate(self.end) if len(self.end) else self.end
+        self.sorted_end = np.sort(end)
+        self._start_sums = np.concatenate(([0.0], np.cumsum(self.start)))
+        self._end_sums = np.concatenate(([0.0], np.cumsum(self.sorted_end)))
+
+    def __len__(self):
+        return len(self.start)
+
+    # Positions (in the arrays the index was built from) of cycles overlapping [t0, t1]
+    def overlapping(self, t0, t1):
+        lo = np.searchsorted(self.max_end, t0, side="left")
+        hi = np.searchsorted(self.start, t1, side="right")
+        found = np.arange(lo, max(lo, hi))
+        # Between lo and hi only overlapping cycles can end before t0
+        return self.order[found[self.end[found] >= t0]]
+
+    # Number of cycles overlapping [t0, t1]
+    def count(self, t0, t1):
+        return int(np.searchsorted(self.start, t1, side="right") - np.searchsorted(self.sorted_end, t0, side="left"))
+
+    # Number of cycles running at each time in t (start <= t < end)
+    def running_at(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        return np.searchsorted(self.start, t, side="right") - np.searchsorted(self.sorted_end, t, side="right")
+
+    # Busy seconds before each time in t, summed over cycles
+    def busy_until(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        started = np.searchsorted(self.start, t, side="left")
+        ended = np.searchsorted(self.sorted_end, t, side="left")
+        return (started * t - self._start_sums[started]) - (ended * t - self._end_sums[ended])
+
+    # Busy seconds within [t0, t1]
+    def busy_between(self, t0, t1):
+        before, after = self.busy_until([t0, t1])
+        return float(after - before)
+
+
+# One IntervalIndex per device plus one over the whole fleet
+class CycleIndex:
+    def __init__(self, device, start, end):
+        device = np.asarray(device)
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(end, dtype=np.float64)
+        self.fleet = IntervalIndex(start, end)
+        names, inverse = np.unique(device, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(names) + 1))
+        self.devices = {name: IntervalIndex(start[order[lo:hi]], end[order[lo:hi]])
+                        for name, lo, hi in zip(names.tolist(), bounds[:-1], bounds[1:])}
+        self.first = float(start.min()) if len(start) else None
+        self.last = float(end.max()) if len(end) else None
+
+    def __len__(self):
+        return len(self.fleet)
+
+    # Devices with a cycle running at t
+    def busy_at(self, t):
+        return [name for name, index in self.devices.items() if index.running_at(t) > 0]
+
+    # Share of machine time busy in each hour of the day (0-23) over [t0, t1],
+    # from the busy time up to every hour boundary in the range. Hours are those
+    # of `clock` (a rollups.Clock); None reads them in UTC.
+    def busy_fraction_by_hour(self, t0, t1, machines=None, clock=None):
+        machines = machines or len(self.devices) or 1
+        w0, w1 = (t0, t1) if clock is None else (float(clock.wall(t0)), float(clock.wall(t1)))
+        first = np.floor(w0 / SECONDS_PER_HOUR) * SECONDS_PER_HOUR
+        wall = np.clip(np.arange(first, w1 + SECONDS_PER_HOUR, SECONDS_PER_HOUR), w0, w1)
+        edges = wall if clock is None else np.clip(clock.epoch(wall), t0, t1)
+        busy = np.diff(self.fleet.busy_until(edges))
+        width = np.diff(edges)
+        hour = ((wall[:-1] % 86400) // SECONDS_PER_HOUR).astype(np.intp)
+        total = np.bincount(hour, weights=busy, minlength=24)
+        covered = np.bincount(hour, weights=width, minlength=24) * machines
+        return np.divide(total, covered, out=np.zeros(24), where=covered > 0)
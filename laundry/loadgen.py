@@ -0,0 +1,86 @@
+# Load generator for the device /status endpoint (real devices or the emulator).
+# Reports throughput and latency percentiles.
+#
+#   python -m laundry.emulator --devices 2000 --port 8600 --keep-alive &
+#   python -m laundry.loadgen --devices 2000 --port 8600 --concurrency 200 --duration 10
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from laundry.emulator import device_urls
+from laundry.ingest import DeviceConnection
+
+
+# Hammer the given base URLs with GET /status from `concurrency` workers
+async def run_load(urls, concurrency=100, duration=10.0, timeout=5.0):
+    urls = list(urls)
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(offset):
+        nonlocal errors
+        connections = {}
+        i = offset
+        while time.perf_counter() < deadline:
+            url = urls[i % len(urls)]
+            i += concurrency
+            connection = connections.get(url)
+            if connection is None:
+                connection = connections[url] = DeviceConnection(url)
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(connection.get("/status"), timeout)
+                latencies.append(time.perf_counter() - start)
+            # Any failed request (a malformed answer included) is an error, not the end of the run
+            except Exception:
+                errors += 1
+                await connection.close()
+        for connection in connections.values():
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+# Throughput and latency percentiles (milliseconds) for one run
+def summarize(latencies, errors, elapsed):
+    ms = np.asarray(latencies) * 1000
+    report = {
+        "requests": len(ms),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(ms) / elapsed if elapsed else 0.0,
+    }
+    if len(ms):
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        report.update(p50_ms=p50, p90_ms=p90, p99_ms=p99, max_ms=float(ms.max()))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test laundry monitor /status endpoints")
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--ports", action="store_true", help="devices listen on consecutive ports")
+    parser.add_argument("--url", action="append", help="explicit device base URL (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    urls = args.url or device_urls(args.devices, args.host, args.port, args.ports).values()
+    report = asyncio.run(run_load(urls, args.concurrency, args.duration, args.timeout))
+    print(f"{report['requests']} requests, {report['errors']} errors in {report['seconds']:.1f}s "
+          f"({report['throughput_rps']:.0f} req/s)")
+    if report["requests"]:
+        print(f"latency ms  p50 {report['p50_ms']:.2f}  p90 {report['p90_ms']:.2f}  "
+              f"p99 {report['p99_ms']:.2f}  max {report['max_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
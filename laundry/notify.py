@@ -0,0 +1,344 @@
+# Cycle-complete notifications.
+# Status transitions (like the sketch's "Status changed:" lines) go into a bounded
+# queue that never blocks whoever submits them. One dispatcher thread drains it,
+# waits DEBOUNCE_SECONDS after a machine stops before calling the cycle complete
+# (a machine that starts again in the meantime was only pausing), and collects
+# each recipient's completions for BATCH_SECONDS into a single notification.
+# Notifications go out through pluggable sinks on a bounded worker pool; when all
+# workers are busy they wait in the dispatcher, not in the submitters.
+#
+#   python -m laundry.notify --devices 2000 --rate 5000 --seconds 10
+import argparse
+import heapq
+import json
+import logging
+import random
+import threading
+import time
+import urllib.request
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from laundry.sketch import QuantileSketch
+
+# A stop has to last this long before the cycle counts as complete
+DEBOUNCE_SECONDS = 60.0
+# Completions for the same recipient within this window go out together
+BATCH_SECONDS = 30.0
+# Transitions waiting to be dispatched; beyond this new ones are dropped and counted
+QUEUE_CAPACITY = 100_000
+# Delivery threads, and notifications handed to them at once
+WORKERS = 8
+MAX_IN_FLIGHT = 64
+# Attempts per notification, with a doubling pause between them
+ATTEMPTS = 3
+RETRY_SECONDS = 0.5
+# How often the dispatcher wakes up
+TICK_SECONDS = 0.05
+
+log = logging.getLogger(__name__)
+
+Notification = namedtuple("Notification", "recipient devices stopped created")
+
+
+class SinkError(Exception):
+    pass
+
+
+# Text of a notification
+def message(notification):
+    devices = notification.devices
+    if len(devices) == 1:
+        return f"{devices[0]} is done"
+    return f"{', '.join(devices[:-1])} and {devices[-1]} are done"
+
+
+# Sink stand-in that keeps what it is sent, optionally slow or unreliable
+class MemorySink:
+    def __init__(self, delay=0.0, failure_rate=0.0, seed=0):
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.sent = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send(self, notification):
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            if self._rng.random() < self.failure_rate:
+                raise SinkError("simulated failure")
+            self.sent.append((notification, time.time()))
+
+
+# Sink that POSTs each notification as JSON to a URL (ntfy, Slack-style hooks, ...)
+class WebhookSink:
+    def __init__(self, url, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, notification):
+        body = json.dumps({
+            "recipient": notification.recipient,
+            "devices": list(notification.devices),
+            "message": message(notification),
+        }, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except OSError as exc:
+            raise SinkError(str(exc)) from exc
+
+
+class Dispatcher:
+    def __init__(self, debounce=DEBOUNCE_SECONDS, window=BATCH_SECONDS, capacity=QUEUE_CAPACITY,
+                 workers=WORKERS, max_in_flight=MAX_IN_FLIGHT):
+        self.debounce = debounce
+        self.window = window
+        self.capacity = capacity
+        self._events = deque()
+        # Recipients: sink per recipient, and who wants which device (None: every device)
+        self._sinks = {}
+        self._by_device = {}
+        self._everyone = set()
+        # Dispatcher thread state: last status per device, stops waiting out the
+        # debounce (device -> stop time) with their deadlines, open batches per recipient
+        self._running = {}
+        self._pending = {}
+        self._deadlines = []
+        self._batches = {}
+        self._ready = deque()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="laundry-notify")
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self.counters = dict.fromkeys(
+            ("events", "dropped", "debounced", "completions", "abandoned", "notifications", "delivered", "failed",
+             "retries"), 0)
+        # Milliseconds from a notification being ready to its delivery, and seconds
+        # from the machine stopping to the delivery (debounce and batching included)
+        self.latency_ms = QuantileSketch(alpha=0.01, min_value=0.1, max_value=600_000.0)
+        self.delay_seconds = QuantileSketch(alpha=0.01, min_value=0.1, max_value=86_400.0)
+
+    # Send `recipient` a notification through `sink` when any of `devices` (all if None) finishes
+    def subscribe(self, recipient, sink, devices=None):
+        self._sinks[recipient] = sink
+        if devices is None:
+            self._everyone.add(recipient)
+        else:
+            for device in devices:
+                self._by_device.setdefault(device, set()).add(recipient)
+
+    # Record a transition. Never blocks; returns False if the queue was full and it was dropped.
+    def submit(self, device, running, at=None):
+        if len(self._events) >= self.capacity:
+            with self._lock:
+                self.counters["dropped"] += 1
+            return False
+        self._events.append((device, running, time.time() if at is None else at))
+        return True
+
+    # StatusStore listener: the status text as the sketch sends it
+    def on_status(self, device, status, at=None):
+        return self.submit(device, status.startswith("Running"), at)
+
+    # Fold queued transitions into the per-device state
+    def _drain(self):
+        events = self._events
+        running, pending = self._running, self._pending
+        count = debounced = 0
+        while events:
+            device, is_running, at = events.popleft()
+            count += 1
+            was_running = running.get(device)
+            if is_running == was_running:
+                continue
+            running[device] = is_running
+            if is_running:
+                # Started again before the stop settled: it was a pause, not the end
+                if pending.pop(device, None) is not None:
+                    debounced += 1
+            elif was_running:
+                pending[device] = at
+                heapq.heappush(self._deadlines, (at + self.debounce, device, at))
+        with self._lock:
+            self.counters["events"] += count
+            self.counters["debounced"] += debounced
+
+    # Stops that outlasted the debounce become completions in their recipients' batches
+    def _complete(self, now):
+        deadlines, pending = self._deadlines, self._pending
+        completions = 0
+        while deadlines and deadlines[0][0] <= now:
+            _, device, stopped = heapq.heappop(deadlines)
+            if pending.get(device) != stopped:
+                continue
+            del pending[device]
+            completions += 1
+            for recipient in self._everyone | self._by_device.get(device, set()):
+                batch = self._batches.get(recipient)
+                if batch is None:
+                    batch = self._batches[recipient] = (now, [], [])
+                batch[1].append(device)
+                batch[2].append(stopped)
+        with self._lock:
+            self.counters["completions"] += completions
+
+    # Close batches whose window has passed and hand them to the workers while slots
+    # are free. The final flush closes every batch and waits for slots.
+    def _flush(self, now, final=False):
+        for recipient in [r for r, (opened, _, _) in self._batches.items() if final or now - opened >= self.window]:
+            _, devices, stopped = self._batches.pop(recipient)
+            self._ready.append(Notification(recipient, tuple(devices), min(stopped), now))
+        while self._ready and self._slots.acquire(blocking=final):
+            notification = self._ready.popleft()
+            with self._lock:
+                self.counters["notifications"] += 1
+            self._pool.submit(self._deliver, self._sinks[notification.recipient], notification)
+
+    def _deliver(self, sink, notification):
+        try:
+            for attempt in range(ATTEMPTS):
+                try:
+                    sink.send(notification)
+                except Exception:
+                    if attempt + 1 == ATTEMPTS:
+                        with self._lock:
+                            self.counters["failed"] += 1
+                        return
+                    with self._lock:
+                        self.counters["retries"] += 1
+                    time.sleep(RETRY_SECONDS * 2 ** attempt)
+                else:
+                    now = time.time()
+                    with self._lock:
+                        self.counters["delivered"] += 1
+                        self.latency_ms.add([1000 * (now - notification.created)])
+                        self.delay_seconds.add([now - notification.stopped])
+                    return
+        finally:
+            self._slots.release()
+
+    # One pass of the dispatcher; the thread calls this every TICK_SECONDS
+    def step(self, now=None):
+        now = time.time() if now is None else now
+        self._drain()
+        self._complete(now)
+        self._flush(now)
+
+    def _run(self):
+        while not self._stopping.wait(TICK_SECONDS):
+            self.step()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="laundry-notify-dispatcher", daemon=True)
+            self._thread.start()
+        return self
+
+    # Stop dispatching. Completions still in a batch or waiting for a worker are sent
+    # before the workers shut down; stops still inside the debounce never became
+    # completions, so they are counted as abandoned and logged.
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        now = time.time()
+        self._drain()
+        self._complete(now)
+        self._flush(now, final=True)
+        if self._pending:
+            log.warning("Notification dispatcher stopped with %d machine stops still debouncing", len(self._pending))
+            with self._lock:
+                self.counters["abandoned"] += len(self._pending)
+            self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    # Counters plus queue depths and latency percentiles
+    def stats(self):
+        with self._lock:
+            latency = [None] * 3
+            if self.latency_ms.count:
+                latency = [float(ms) for ms in self.latency_ms.quantile([0.5, 0.95, 0.99])]
+            delay = float(self.delay_seconds.quantile(0.5)) if self.delay_seconds.count else None
+            stats = dict(self.counters)
+        stats.update({
+            "queued": len(self._events),
+            "waiting": len(self._pending),
+            "backlog": len(self._ready),
+            "latency_ms_p50": latency[0],
+            "latency_ms_p95": latency[1],
+            "latency_ms_p99": latency[2],
+            "delay_seconds_p50": delay,
+        })
+        return stats
+
+
+# Feed `rate` random transitions per second for `seconds` into a dispatcher with a
+# MemorySink per recipient; a share of the stops are brief pauses that must not notify
+def load_test(devices=2000, rate=5000, seconds=10.0, recipients=500, pauses=0.3,
+              debounce=1.0, window=2.0, sink_delay=0.02, workers=WORKERS, seed=0):
+    rng = random.Random(seed)
+    dispatcher = Dispatcher(debounce=debounce, window=window, workers=workers)
+    sinks = []
+    names = [f"machine-{n}" for n in range(devices)]
+    for r in range(recipients):
+        sink = MemorySink(delay=sink_delay, seed=r)
+        sinks.append(sink)
+        dispatcher.subscribe(f"user-{r}", sink, rng.sample(names, min(4, devices)))
+    dispatcher.start()
+
+    running = [False] * devices
+    submitted = 0
+    submit_seconds = 0.0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        batch = []
+        for _ in range(max(1, int(rate * 0.01))):
+            device = rng.randrange(devices)
+            running[device] = not running[device]
+            batch.append((names[device], running[device]))
+            if not running[device] and rng.random() < pauses:
+                # A pause: it starts again right away
+                running[device] = True
+                batch.append((names[device], True))
+        t = time.perf_counter()
+        for name, is_running in batch:
+            dispatcher.submit(name, is_running)
+        submit_seconds += time.perf_counter() - t
+        submitted += len(batch)
+        # Pace to the requested rate
+        time.sleep(max(0.0, submitted / rate - (time.perf_counter() - start)))
+    # Let the last debounce windows and batches run out
+    time.sleep(debounce + window + 4 * TICK_SECONDS)
+    dispatcher.stop()
+    return dispatcher, submitted, submit_seconds, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the notification dispatcher with local sinks")
+    parser.add_argument("--devices", type=int, default=2000)
+    parser.add_argument("--rate", type=int, default=5000, help="transitions per second")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--recipients", type=int, default=500)
+    parser.add_argument("--sink-delay", type=float, default=0.02, help="seconds each delivery takes")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args(argv)
+
+    dispatcher, submitted, submit_seconds, elapsed = load_test(
+        args.devices, args.rate, args.seconds, args.recipients,
+        sink_delay=args.sink_delay, workers=args.workers)
+    stats = dispatcher.stats()
+    print(f"{submitted} transitions in {elapsed:.1f}s, {1e6 * submit_seconds / max(submitted, 1):.2f} µs per submit")
+    print(f"{stats['completions']} completions ({stats['debounced']} pauses debounced, {stats['dropped']} dropped), "
+          f"{stats['notifications']} notifications: {stats['delivered']} delivered, {stats['failed']} failed")
+    if stats["latency_ms_p50"] is not None:
+        print(f"delivery latency p50 {stats['latency_ms_p50']:.1f} ms, p95 {stats['latency_ms_p95']:.1f} ms, "
+              f"p99 {stats['latency_ms_p99']:.1f} ms; stop to delivery p50 {stats['delay_seconds_p50']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Registry of the slide pages.
+# A page's module and the heavy libraries it declares are imported the first
+# time someone visits it, so text-only pages never pay for matplotlib or altair.
+# Every page has a budget for the elements one full rerun may send (the sidebar,
+# stylesheet and footer included); the debug panel and laundry.bench flag runs over it.
+import importlib
+import threading
+import time
+
+_load_lock = threading.Lock()
+
+
+# One entry in the navigation, loaded lazily from its own module
+class Page:
+    def __init__(self, title, module, function, deps=(), max_elements=None):
+        self.title = title
+        self.module = module
+        self.function = function
+        self.deps = tuple(deps)
+        self.max_elements = max_elements
+        # Seconds spent importing each dependency and the page module itself
+        self.import_seconds = {}
+        self._render = None
+
+    @property
+    def loaded(self):
+        return self._render is not None
+
+    def load(self):
+        if self._render is None:
+            with _load_lock:
+                if self._render is None:
+                    for name in self.deps + (self.module,):
+                        start = time.perf_counter()
+                        module = importlib.import_module(name)
+                        self.import_seconds[name] = time.perf_counter() - start
+                    self._render = getattr(module, self.function)
+        return self._render
+
+    def render(self):
+        self.load()()
+
+
+PAGES = [
+    Page("Introduction", "laundry.pages.introduction", "show_introduction",
+         deps=("matplotlib.pyplot",), max_elements=15),
+    Page("How It Works", "laundry.pages.how_it_works", "show_how_it_works",
+         deps=("numpy", "matplotlib.pyplot"), max_elements=15),
+    Page("Hardware Setup", "laundry.pages.hardware_setup", "show_hardware_setup",
+         deps=("matplotlib.pyplot",), max_elements=16),
+    Page("Software Code", "laundry.pages.software_code", "show_software_code",
+         max_elements=16),
+    Page("Live Demo", "laundry.pages.live_demo", "show_live_demo",
+         deps=("pandas", "altair"), max_elements=40),
+    Page("Fleet Overview", "laundry.pages.fleet_overview", "show_fleet_overview",
+         deps=("numpy",), max_elements=23),
+    Page("Data Analysis", "laundry.pages.data_analysis", "show_data_analysis",
+         deps=("pandas", "altair"), max_elements=26),
+    Page("Spectral Analysis", "laundry.pages.spectral_analysis", "show_spectral_analysis",
+         deps=("pandas", "altair"), max_elements=20),
+    Page("Benefits & Applications", "laundry.pages.benefits", "show_benefits",
+         deps=("pandas",), max_elements=15),
+    Page("Future Improvements", "laundry.pages.future_improvements", "show_future_improvements",
+         deps=("pandas",), max_elements=17),
+]
+
+PAGES_BY_TITLE = {page.title: page for page in PAGES}
+
+
+# Elements a profiled run of `page` sent beyond the page's budget (0 if within it)
+def check_budget(profile, page):
+    if page.max_elements is None:
+        return 0
+    return max(0, profile.elements - page.max_elements)
+
+
+# Import cost of every page loaded so far in this server process
+def import_report():
+    return [
+        {
+            "page": page.title,
+            "total_ms": 1000 * sum(page.import_seconds.values()),
+            "imports_ms": {name: 1000 * secs for name, secs in page.import_seconds.items()},
+        }
+        for page in PAGES if page.loaded
+    ]
@@ -0,0 +1,58 @@
+import streamlit as st
+import pandas as pd
+
+from laundry.blocks import static_section
+
+
+# The Benefits & Applications page
+def show_benefits():
+    st.markdown("<h1 class='main-header'>Benefits & Applications</h1>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        with st.container(border=True):
+            static_section("### Key Benefits:", """
+            - ⏱️ **Time Saving:** No need to physically check machine status
+            - 🏠 **Convenient:** Check from anywhere in your home
+            - 📈 **Efficiency:** Plan around laundry completion
+            - 🔔 **Peace of Mind:** Know exactly when cycle finishes
+            - 💡 **Energy Awareness:** Track usage patterns
+            """)
+    
+    with col2:
+        static_section("### Ideal For:", """
+        - 🏢 **Shared Laundry Facilities** in apartments or dorms
+        - 🏠 **Multi-level Homes** where laundry room is far away
+        - 👨‍👩‍👧‍👦 **Busy Families** juggling multiple responsibilities
+        - 👨‍💻 **Remote Workers** who need to multitask
+        - 👵 **Elderly or Mobility-Limited** individuals
+        """)
+    
+    st.markdown("<h3 class='sub-header'>Implementation Ideas</h3>", unsafe_allow_html=True)
+    
+    ideas = pd.DataFrame({
+        'Application': [
+            'Home Automation Integration', 
+            'Mobile App Notifications', 
+            'Multi-Machine Monitoring',
+            'Usage Analytics Dashboard',
+            'Voice Assistant Integration'
+        ],
+        'Description': [
+            'Connect with home automation systems like Home Assistant or SmartThings',
+            'Send push notifications when laundry cycle completes',
+            'Expand to monitor washer and dryer simultaneously',
+            'Track usage patterns and provide insights on optimal laundry times',
+            'Ask Alexa or Google Home about laundry status'
+        ],
+        'Complexity': [
+            'Medium', 
+            'Medium', 
+            'Easy', 
+            'Medium', 
+            'Hard'
+        ]
+    })
+    
+    st.dataframe(ideas, use_container_width=True, hide_index=True)
@@ -0,0 +1,254 @@
+import hashlib
+import io
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+from laundry.aggregate import bin_counts, histogram_chart
+from laundry.cache import dataset_key, datasets
+from laundry.cycles import detect_cycles
+from laundry.intervals import CycleIndex
+from laundry.profiling import section
+from laundry.rollups import LOCAL, UTC, CycleRollups
+from laundry.simulation import DAY_NAMES, generate_cycles
+from laundry.store import SECONDS_PER_DAY, Store
+
+# Days of stored history the date range starts with
+STORE_DEFAULT_DAYS = 365
+# Size of the simulated history
+SIMULATED_DAYS = 7
+SIMULATED_MACHINES = 1
+
+
+# Seconds since the epoch for datetime64 values
+def epoch_seconds(times):
+    return np.asarray(times).astype('datetime64[s]').astype(np.int64).astype(np.float64)
+
+
+# The generator is deterministic, so one rollup per (seed, size, day) serves every session
+def simulated_rollups(seed, days, machines, end):
+    def compute():
+        cycles = generate_cycles(seed=seed, days=days, machines=machines, end=end)
+        rollups = CycleRollups()
+        rollups.add(epoch_seconds(cycles['start']), cycles['duration_minutes'])
+        return rollups
+    first = end - timedelta(days=days - 1)
+    key = dataset_key("simulated_rollups", t0=str(first), t1=str(end), seed=seed, machines=machines)
+    return datasets.get_or_compute(key, compute)
+
+
+# Interval index over the same simulated cycles
+def simulated_index(seed, days, machines, end):
+    def compute():
+        cycles = generate_cycles(seed=seed, days=days, machines=machines, end=end)
+        start = epoch_seconds(cycles['start'])
+        return CycleIndex(cycles['machine'], start, start + cycles['duration_minutes'] * 60.0)
+    first = end - timedelta(days=days - 1)
+    key = dataset_key("simulated_index", t0=str(first), t1=str(end), seed=seed, machines=machines)
+    return datasets.get_or_compute(key, compute)
+
+
+# Cycles detected in an uploaded sample log: CSV with a time column
+# (epoch seconds or timestamps) and a value column (raw analogRead readings).
+# Returns their rollups and interval index. Epoch seconds and timestamps with a
+# zone are charted in the server's local time, naive timestamps as they read.
+def recorded_history(data):
+    key = dataset_key("recorded_history", digest=hashlib.sha1(data).hexdigest())
+    return datasets.get_or_compute(key, lambda: _detect_history(data))
+
+
+# Rollups and interval index of the cycles detected in a CSV sample log
+def _detect_history(data):
+    log = pd.read_csv(io.BytesIO(data))
+    time_col = 'time' if 'time' in log.columns else log.columns[0]
+    value_col = 'value' if 'value' in log.columns else log.columns[1]
+    times = log[time_col]
+    clock = LOCAL
+    if pd.api.types.is_numeric_dtype(times):
+        times = pd.to_datetime(times, unit='s')
+    else:
+        times = pd.to_datetime(times)
+        if times.dt.tz is None:
+            clock = UTC
+        else:
+            times = times.dt.tz_convert(None)
+    log = pd.DataFrame({'time': times, 'value': log[value_col]}).sort_values('time')
+    cycles = detect_cycles(log['time'].to_numpy(), log['value'].to_numpy())
+    start = epoch_seconds(cycles['start'])
+    rollups = CycleRollups(clock=clock)
+    rollups.add(start, np.round(cycles['duration_seconds'] / 60))
+    index = CycleIndex(np.zeros(len(start), dtype=np.int32), start, start + cycles['duration_seconds'])
+    return rollups, index
+
+
+# One store connection pool per server process, shared by every session
+@st.cache_resource(show_spinner=False)
+def shared_store(path):
+    return Store(path)
+
+
+# Rollups over everything in the store at LAUNDRY_STORE, maintained across reruns.
+# Stored times are epoch seconds, charted in the server's local time.
+@st.cache_resource(show_spinner="Building rollups...")
+def stored_rollups(path):
+    return CycleRollups(clock=LOCAL)
+
+
+# Interval index over everything in the store, rebuilt only when the rollups
+# have taken in new cycles (their watermark moved)
+def stored_index(path, watermark):
+    def compute():
+        cycles = shared_store(path).read_cycles()
+        return CycleIndex(cycles['device'], cycles['start'], cycles['end'])
+    return datasets.get_or_compute(dataset_key("stored_index", path=path, watermark=watermark), compute)
+
+
+# Day number (days since 1970-01-01) of a date, and back
+def day_number(day):
+    return (day - date(1970, 1, 1)).days
+
+
+def day_date(number):
+    return date(1970, 1, 1) + timedelta(days=int(number))
+
+
+# The Data Analysis page
+def show_data_analysis():
+    st.markdown("<h1 class='main-header'>Data Analysis</h1>", unsafe_allow_html=True)
+    
+    store_path = os.environ.get("LAUNDRY_STORE")
+    sources = ["Simulated data", "Upload a sensor log"]
+    if store_path:
+        sources.insert(0, "Stored history")
+    source = st.radio("Data source", sources, horizontal=True, label_visibility="collapsed")
+    
+    default_days = None
+    if source == "Stored history":
+        with section("load:stored"):
+            rollups = stored_rollups(store_path)
+            # Fold in only the cycles written since the last render
+            rollups.refresh(shared_store(store_path))
+            index = stored_index(store_path, rollups.watermark)
+        default_days = STORE_DEFAULT_DAYS
+    elif source == "Upload a sensor log":
+        recording = st.file_uploader("Analyze a recorded sensor log (CSV with time and value columns)", type=["csv"])
+        if recording is None:
+            return
+        # Cycles detected in the real log
+        with st.spinner("Detecting cycles..."), section("load:upload"):
+            rollups, index = recorded_history(recording.getvalue())
+    else:
+        # Generate mock historical data
+        with section("load:simulated"):
+            rollups = simulated_rollups(seed=0, days=SIMULATED_DAYS, machines=SIMULATED_MACHINES, end=date.today())
+            index = simulated_index(seed=0, days=SIMULATED_DAYS, machines=SIMULATED_MACHINES, end=date.today())
+    
+    if not len(index):
+        st.warning("No cycles found for this selection.")
+        return
+    
+    # Days to analyze, in the rollups' wall-clock days. The charts come from the
+    # day rollups and the interval index, so moving the range never scans the cycles.
+    clock = rollups.clock
+    first_day = int(clock.wall(index.first) // SECONDS_PER_DAY)
+    last_day = int(clock.wall(index.last) // SECONDS_PER_DAY)
+    lo, hi = first_day, last_day
+    if last_day > first_day:
+        start = last_day - default_days + 1 if default_days else first_day
+        lo, hi = st.slider("Date range", min_value=day_date(first_day), max_value=day_date(last_day),
+                           value=(day_date(max(first_day, start)), day_date(last_day)), key="analysis_range")
+        lo, hi = day_number(lo), day_number(hi)
+    with section("window"):
+        summary = rollups.window(lo, hi)
+        range_end = float(clock.epoch((hi + 1) * SECONDS_PER_DAY))
+        t0 = max(float(clock.epoch(lo * SECONDS_PER_DAY)), index.first)
+        t1 = min(range_end, index.last)
+        busy_by_hour = index.busy_fraction_by_hour(t0, t1, clock=clock)
+        utilization = index.fleet.busy_between(t0, t1) / max((t1 - t0) * len(index.devices), 1.0)
+        # Machines running when the range ends (now, if it runs up to today)
+        busy_at_end = len(index.busy_at(min(range_end, time.time()) - 1))
+    
+    if not summary['count']:
+        st.warning("No cycles found for this selection.")
+        return
+    
+    st.markdown("<p class='info-text'>With collected data over time, we can analyze laundry usage patterns:</p>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("<h3 class='sub-header'>Usage by Day of Week</h3>", unsafe_allow_html=True)
+        
+        # Seven rows straight from the rollup, already in weekday order
+        day_counts = pd.DataFrame({'day_of_week': DAY_NAMES, 'count': summary['day_of_week']})
+        day_counts = day_counts[day_counts['count'] > 0]
+        
+        chart = alt.Chart(day_counts).mark_bar().encode(
+            x=alt.X('day_of_week', title='Day of Week', sort=list(DAY_NAMES)),
+            y=alt.Y('count', title='Number of Cycles'),
+            color=alt.Color('day_of_week', legend=None, scale=alt.Scale(scheme='blues'))
+        )
+        
+        st.altair_chart(chart, use_container_width=True)
+    
+    with col2:
+        st.markdown("<h3 class='sub-header'>Usage by Time of Day</h3>", unsafe_allow_html=True)
+        
+        hour_counts = pd.DataFrame({'hour': np.arange(24), 'count': summary['hour']})
+        hour_counts = hour_counts[hour_counts['count'] > 0]
+        
+        chart = alt.Chart(hour_counts).mark_line(point=True).encode(
+            x=alt.X('hour', title='Hour of Day', scale=alt.Scale(domain=[0, 23])),
+            y=alt.Y('count', title='Number of Starts'),
+            tooltip=['hour', 'count']
+        )
+        
+        st.altair_chart(chart, use_container_width=True)
+    
+    # Cycle duration analysis
+    st.markdown("<h3 class='sub-header'>Cycle Duration Analysis</h3>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        with st.container(border=True):
+            # One element for the whole card
+            st.markdown("\n\n".join([
+                "### Statistics:",
+                f"**Average Duration:** {summary['mean_minutes']:.1f} minutes",
+                f"**Median Duration:** {summary['durations'].quantile(0.5):.0f} minutes",
+                f"**Shortest Cycle:** {summary['min_minutes']:.0f} minutes",
+                f"**Longest Cycle:** {summary['max_minutes']:.0f} minutes",
+                f"**Total Cycles:** {summary['count']}",
+                f"**Total Machine Time:** {summary['total_minutes'] / 60:.1f} hours",
+                f"**Machine Utilization:** {100 * utilization:.1f}%",
+                f"**Busy at the End of the Range:** {busy_at_end} of {len(index.devices)} machines",
+            ]))
+    
+    with col2:
+        # Duration histogram binned here, so the chart carries ten rows at most
+        with section("histogram"):
+            # Exact counts per whole minute of duration, one weighted value per minute seen
+            minutes = summary['minutes']
+            seen = np.flatnonzero(minutes)
+            duration_bins = bin_counts(seen, maxbins=10, weights=minutes[seen])
+        chart = histogram_chart(duration_bins, 'Duration (minutes)', 'Number of Cycles')
+        
+        st.altair_chart(chart, use_container_width=True)
+    
+    # How much of the machines' time is taken in each hour of the day
+    st.markdown("<h3 class='sub-header'>Machine Utilization by Hour</h3>", unsafe_allow_html=True)
+    
+    busy = pd.DataFrame({'hour': np.arange(24), 'busy': busy_by_hour})
+    chart = alt.Chart(busy).mark_bar(color='#1E88E5').encode(
+        x=alt.X('hour:O', title='Hour of Day'),
+        y=alt.Y('busy:Q', title='Share of Machine Time Busy', axis=alt.Axis(format='%')),
+        tooltip=['hour', alt.Tooltip('busy:Q', format='.1%')]
+    )
+    
+    st.altair_chart(chart, use_container_width=True)
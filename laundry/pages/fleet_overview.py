@@ -0,0 +1,79 @@
+import os
+import time
+
+import streamlit as st
+
+from laundry.devices import shared_serial_reader, shared_status_poller
+from laundry.fleet import KINDS, REFRESH_SECONDS, STATE_NAMES, FleetMonitor, SimulatedSource, StatusSource
+from laundry.predict import RemainingTimeModel, simulated_history, store_history
+from laundry.store import Store
+
+# Machines in the simulated laundry room
+FLEET_MACHINES = 400
+
+# Look of the grid; sent inside the grid's own element
+GRID_STYLE = """
+<style>
+    .fleet-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(3.2rem, 1fr)); gap: 0.3rem; }
+    .fleet-cell { padding: 0.4rem 0; border-radius: 6px; text-align: center; font-size: 0.8rem; color: white; }
+    .fleet-running { background: #2E7D32; }
+    .fleet-free { background: #1E88E5; }
+    .fleet-offline { background: #9E9E9E; }
+</style>
+"""
+
+
+# One monitor per server process and source, shared by every session: real devices
+# if the server was started with LAUNDRY_DEVICES or LAUNDRY_SERIAL, otherwise a
+# simulated room. Minutes left are predicted from the cycles in LAUNDRY_STORE for
+# real devices, and from simulated history for the simulated room.
+@st.cache_resource(show_spinner=False)
+def shared_fleet_monitor(devices_config, ports_config, store_path, machines):
+    readers = []
+    if devices_config:
+        readers.append(shared_status_poller(devices_config))
+    if ports_config:
+        readers.append(shared_serial_reader(ports_config, store_path))
+    if readers:
+        source = StatusSource(*readers)
+        history = store_history(Store(store_path)) if store_path else None
+    else:
+        source = SimulatedSource(machines)
+        history = simulated_history(source.names)
+    predictor = RemainingTimeModel(history).start() if history else None
+    return FleetMonitor(source, predictor=predictor).start()
+
+
+# Counts and grid, refreshed on their own every REFRESH_SECONDS
+def show_fleet_panel(monitor, kind):
+    refreshed, counts, grids, soonest = monitor.snapshot
+    shown = counts.sum(axis=0) if kind is None else counts[kind]
+
+    columns = st.columns(len(STATE_NAMES))
+    for column, state in zip(columns, reversed(range(len(STATE_NAMES)))):
+        with column:
+            st.metric(STATE_NAMES[state], int(shown[state]))
+
+    st.markdown(GRID_STYLE + grids[kind], unsafe_allow_html=True)
+    next_free = "" if soonest[kind] is None else f"next one done in about {soonest[kind]:.0f} min · "
+    st.caption(f"{int(shown.sum())} machines · {next_free}updated {time.time() - refreshed:.0f} s ago "
+               f"· refresh took {1000 * monitor.refresh_seconds:.1f} ms")
+
+
+# The Fleet Overview page
+def show_fleet_overview():
+    st.markdown("<h1 class='main-header'>Fleet Overview</h1>", unsafe_allow_html=True)
+
+    st.markdown("<p class='info-text'>Every machine in a shared laundry room at a glance: green is running, blue is free, grey has not been heard from. Hover over a running machine to see how long it has to go.</p>", unsafe_allow_html=True)
+
+    monitor = shared_fleet_monitor(os.environ.get("LAUNDRY_DEVICES"), os.environ.get("LAUNDRY_SERIAL"),
+                                   os.environ.get("LAUNDRY_STORE"), FLEET_MACHINES)
+
+    live_col, kind_col = st.columns(2)
+    with live_col:
+        live = st.toggle("Live updates", value=True, key="fleet_live")
+    with kind_col:
+        choice = st.radio("Machines", ["All"] + [f"{kind}s" for kind in KINDS], horizontal=True, key="fleet_kind")
+    kind = None if choice == "All" else KINDS.index(choice[:-1])
+
+    st.fragment(show_fleet_panel, run_every=REFRESH_SECONDS if live else None)(monitor, kind)
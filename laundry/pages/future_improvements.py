@@ -0,0 +1,68 @@
+import streamlit as st
+import pandas as pd
+
+from laundry.blocks import static_section
+
+
+# The Future Improvements page
+def show_future_improvements():
+    static_section("<h1 class='main-header'>Future Improvements</h1>",
+                   "<p class='info-text'>The project has several potential enhancement paths:</p>")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        with st.container(border=True):
+            static_section("### Hardware Enhancements:", """
+            - 🔋 **Battery Power Option** for cable-free installation
+            - 📶 **ESP32 Upgrade** for Bluetooth + WiFi capabilities
+            - 🔊 **Sound Detection** as an additional sensing method
+            - 📱 **Standalone Display** for at-a-glance status
+            - 🔌 **Energy Monitoring** to track power consumption
+            """)
+    
+    with col2:
+        with st.container(border=True):
+            static_section("### Software Improvements:", """
+            - 🌐 **Cloud Integration** for remote access
+            - 📊 **Advanced Analytics** for deeper usage insights
+            - 🔔 **Push Notifications** for cycle completion alerts
+            - 🔄 **Machine Learning** to improve detection accuracy
+            - 🗓️ **Scheduling Features** to plan laundry times
+            """)
+    
+    st.markdown("<h3 class='sub-header'>Development Roadmap</h3>", unsafe_allow_html=True)
+    
+    roadmap_data = pd.DataFrame({
+        'Phase': ['Phase 1', 'Phase 2', 'Phase 3', 'Phase 4'],
+        'Task': [
+            'Basic Vibration Detection & Web Interface',
+            'Add Data Logging & Notifications',
+            'Cloud Integration & Mobile App',
+            'Multi-device Support & Analytics'
+        ],
+        'Status': ['✅ Completed', '🔄 In Progress', '📅 Planned', '🔮 Future']
+    })
+    
+    st.dataframe(
+        roadmap_data,
+        column_config={
+            "Status": st.column_config.SelectboxColumn(
+                "Status",
+                options=["✅ Completed", "🔄 In Progress", "📅 Planned", "🔮 Future"],
+                required=True,
+                default="📅 Planned"
+            )
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    static_section("<h3 class='sub-header'>Community & Support</h3>", """
+    This project is open-source and welcomes contributions!
+
+    - 📁 **GitHub Repository:** [github.com/VenomPrince/laundry-monitor](https://github.com/VenomPrince/laundry-monitor)
+    - 🤝 **Community Forum:** Share your implementations and ideas
+    - 📚 **Documentation:** Full setup guide and API documentation available
+    - 🐞 **Issue Tracking:** Report bugs and feature requests
+    """)
@@ -0,0 +1,41 @@
+import streamlit as st
+
+from laundry.blocks import static_section
+from laundry.figures import show_diagram
+
+
+# The Hardware Setup page
+def show_hardware_setup():
+    st.markdown("<h1 class='main-header'>Hardware Setup</h1>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        with st.container(border=True):
+            static_section("### Components Required:", """
+            - Arduino Nano 33 IoT (or similar with WiFi)
+            - Analog vibration sensor module
+            - Breadboard
+            - Jumper wires
+            - USB power supply
+            - Small enclosure (optional)
+            """)
+        
+        static_section("### Connections:", """
+        1. Connect vibration sensor VCC to Arduino 3.3V
+        2. Connect vibration sensor GND to Arduino GND
+        3. Connect vibration sensor OUT to Arduino A0
+        4. Power Arduino via USB
+        """)
+    
+    with col2:
+        # Diagram of connections, rendered once and shared by all sessions
+        show_diagram("wiring")
+        
+        with st.container(border=True):
+            static_section("### Installation Tips:", """
+            - Place the sensor securely on the laundry machine
+            - Find an optimal position that detects vibrations clearly
+            - Keep electronics away from water/moisture
+            - Use double-sided tape or mounting bracket
+            """)
@@ -0,0 +1,31 @@
+import streamlit as st
+
+from laundry.blocks import static_section
+from laundry.figures import show_diagram
+
+
+# The How It Works page
+def show_how_it_works():
+    static_section("<h1 class='main-header'>How It Works</h1>",
+                   "<p class='info-text'>The Laundry Monitor uses a simple yet effective approach to detect machine status:</p>")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        with st.container(border=True):
+            static_section("### Working Principle:", """
+            1. **Vibration Detection**: An analog vibration sensor detects machine movements
+            2. **Signal Processing**: Arduino reads and processes sensor data
+            3. **Status Determination**: Machine status is determined based on vibration levels
+            4. **Web Server**: Arduino hosts a local web server
+            5. **User Interface**: Status displayed on responsive web page
+            """)
+    with col2:
+        # Flowchart of the system, rendered once and shared by all sessions
+        show_diagram("flowchart")
+        
+        with st.container(border=True):
+            static_section("### Threshold-Based Detection:", """
+            - Sensor reading **below threshold** → Machine is **Running** 🌀
+            - Sensor reading **above threshold** → Machine is **Stopped** 🧺
+            """)
@@ -0,0 +1,29 @@
+import streamlit as st
+
+from laundry.blocks import static_section
+from laundry.figures import show_diagram
+
+
+# The Introduction page
+def show_introduction():
+    st.markdown("<h1 class='main-header'>Laundry Monitor System</h1>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("<p class='info-text'>A smart IoT solution to monitor your laundry machine status remotely</p>", unsafe_allow_html=True)
+        
+        with st.container(border=True):
+            static_section("### Key Features:", """
+            - 🌐 **WiFi Connected:** Access from any device on your network
+            - 📱 **Responsive Web Interface:** Check status from phone or computer
+            - 🔄 **Real-time Updates:** Get immediate status changes
+            - 📊 **Data Tracking:** Monitor your laundry habits
+            - 🛠️ **Easy Setup:** Simple Arduino-based system
+            """)
+        
+    with col2:
+        # Picture of the laundry monitor, rendered once and shared by all sessions
+        show_diagram("device")
+        
+        st.markdown("<p style='text-align:center'>Laundry Monitor Device</p>", unsafe_allow_html=True)
@@ -0,0 +1,265 @@
+import os
+import time
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+from laundry.calibrate import ThresholdCalibrator
+from laundry.cycles import HYSTERESIS
+from laundry.devices import shared_serial_reader, shared_status_poller
+from laundry.downsample import downsample, points_for_width
+from laundry.predict import RemainingTimeModel, simulated_history, store_history
+from laundry.recording import Recording, Replayer, list_recordings
+from laundry.store import Store
+from laundry.stream import RingBuffer, SimulatedSensor
+
+# Samples per second from each simulated device
+SAMPLE_RATE_HZ = 5
+# How often the live panel re-runs (only the panel, not the whole script)
+REFRESH_SECONDS = 1.0
+# Seconds of history kept per device
+BUFFER_SECONDS = 3600
+# Seconds of history the chart can show
+CHART_WINDOWS = {"30 s": 30, "5 min": 300, "15 min": 900, "1 h": 3600}
+# Seconds of history a new session starts with
+BACKFILL_SECONDS = 30
+THRESHOLD = 500
+# Most samples per refresh fed to the threshold calibrator; the rest are thinned out
+CALIBRATION_SAMPLES = 50
+# Replay speeds offered for recordings
+REPLAY_SPEEDS = [1, 2, 5, 10, 20, 50, 100]
+
+
+# Per-session sensor and ring buffer for a device, kept across reruns
+def live_device(device):
+    devices = st.session_state.setdefault("live_devices", {})
+    if device not in devices:
+        devices[device] = (SimulatedSensor(SAMPLE_RATE_HZ), RingBuffer(SAMPLE_RATE_HZ * BUFFER_SECONDS))
+    return devices[device]
+
+
+# Per-session threshold calibrator for a device, fed each refresh's new samples
+def calibrate_device(key, values):
+    calibrators = st.session_state.setdefault("live_calibrators", {})
+    if key not in calibrators:
+        calibrators[key] = ThresholdCalibrator(1)
+    calibrator = calibrators[key]
+    # Backfills and fast replays bring many samples; a thinned sample (ending with
+    # the newest reading, which sets the status) is enough for the quantile estimates
+    step = max(1, len(values) // CALIBRATION_SAMPLES)
+    calibrator.update_many(np.asarray(values)[::-1][::step][::-1][None, :])
+    return calibrator
+
+
+# One memory-mapped view per recording file, shared by every session
+@st.cache_resource(show_spinner=False)
+def shared_recording(path):
+    return Recording(path)
+
+
+# Ring buffer holding BUFFER_SECONDS of a recording at its mean sample rate
+def replay_buffer(recording):
+    rate = len(recording) / recording.duration if recording.duration > 0 else SAMPLE_RATE_HZ
+    return RingBuffer(int(np.ceil(max(rate, SAMPLE_RATE_HZ) * BUFFER_SECONDS)))
+
+
+# Per-session replayer and ring buffer for a recording, kept across reruns.
+# Moving the start position restarts the replay there with an empty buffer.
+def replay_device(path, speed, position):
+    devices = st.session_state.setdefault("live_devices", {})
+    wall = time.time()
+    replayer, buffer, started_at = devices.get(path, (None, None, None))
+    if replayer is None or started_at != position:
+        replayer = replayer or Replayer(shared_recording(path), speed)
+        replayer.seek(position, wall)
+        buffer = replay_buffer(replayer.recording)
+        devices[path] = (replayer, buffer, position)
+    if replayer.speed != speed:
+        replayer.set_speed(speed, wall)
+    return replayer, buffer
+
+
+# Remaining-time tables for the washer, refitted in the background: from the cycles
+# in LAUNDRY_STORE if the server has one, otherwise from the simulated history
+# the Data Analysis page shows
+@st.cache_resource(show_spinner=False)
+def shared_remaining_time(store_path):
+    history = store_history(Store(store_path)) if store_path else simulated_history(["washer"])
+    return RemainingTimeModel(history).start()
+
+
+# Minutes the washer has to go, tracked per session from when it was first seen running
+def minutes_left(device, running, now):
+    started = st.session_state.setdefault("live_running_since", {})
+    if not running:
+        started.pop(device, None)
+        return None
+    since = started.setdefault(device, now)
+    model = shared_remaining_time(os.environ.get("LAUNDRY_STORE")).model
+    left = float(model.predict(model.rows([device]), [(now - since) / 60])[0])
+    return None if np.isnan(left) else left
+
+
+# Recordings in the LAUNDRY_RECORDINGS directory
+def recordings():
+    return list_recordings(os.environ.get("LAUNDRY_RECORDINGS"))
+
+
+# Table of real devices as last seen by the shared poller (or serial reader)
+def show_connected_devices(poller):
+    st.markdown("<h3 class='sub-header'>Connected Devices</h3>", unsafe_allow_html=True)
+    now = time.time()
+    rows = []
+    for device in poller.devices:
+        seen = poller.store.get(device)
+        rows.append({
+            'Device': device,
+            'Status': seen.status if seen and seen.status else 'Unknown',
+            'Updated (s ago)': round(now - seen.updated, 1) if seen and seen.updated else None,
+            'Error': seen.error if seen else None,
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+
+# Status card, metric and chart, refreshed on their own every REFRESH_SECONDS.
+# `replay` is (recording path, speed, start position in seconds) to play a recording instead.
+def show_live_panel(device, replay=None, calibrate=True):
+    if replay is None:
+        sensor, buffer = live_device(device)
+        backfill = BACKFILL_SECONDS
+    else:
+        sensor, buffer = replay_device(*replay)
+        # Reading back from the file is cheap, so fill the whole buffer
+        backfill = BUFFER_SECONDS
+
+    # Append only the samples that arrived since the last refresh
+    is_running = st.session_state.get("simulate_running", False)
+    wall = time.time()
+    now = sensor.clock(wall)
+    times, values = sensor.read(wall, is_running, backfill_seconds=backfill)
+    buffer.extend(times, values)
+
+    # A replay can start at a quiet stretch with nothing read yet
+    if buffer.last() is None:
+        st.info("Waiting for the first samples...")
+        return
+    _, sensor_value = buffer.last()
+    sensor_value = int(sensor_value)
+    threshold, hysteresis, calibrated = THRESHOLD, HYSTERESIS, False
+    running = sensor_value < THRESHOLD
+    if calibrate:
+        calibrator = calibrate_device(device if replay is None else replay[0], values)
+        threshold, hysteresis = float(calibrator.threshold[0]), float(calibrator.hysteresis[0])
+        calibrated = bool(calibrator.calibrated[0])
+        running = bool(calibrator.running[0])
+    status = "Running 🌀" if running else "Stopped 🧺"
+    left = minutes_left(device if replay is None else replay[0], running, now)
+    
+    # Create two columns
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Create a mock web interface similar to the Arduino one
+        with st.container(border=True):
+            st.markdown("<h2 style='text-align:center'>Laundry Status Monitor 🧼</h2>", unsafe_allow_html=True)
+            
+            if status == "Running 🌀":
+                st.markdown(f"<div style='text-align:center'>Status: <span class='status-running'>{status}</span></div>", unsafe_allow_html=True)
+            else:
+                st.markdown(f"<div style='text-align:center'>Status: <span class='status-stopped'>{status}</span></div>", unsafe_allow_html=True)
+                
+            updated = "Last updated: Just now" if left is None else f"About {left:.0f} min left · Last updated: Just now"
+            st.markdown(f"<p style='margin-top: 20px; color: #666; text-align:center'>{updated}</p>", unsafe_allow_html=True)
+    
+    with col2:
+        with st.container(border=True):
+            st.markdown("### Live Sensor Data:")
+            st.metric("Vibration Level", sensor_value, delta=None)
+            if calibrated:
+                st.markdown(f"Threshold: {threshold:.0f} ± {hysteresis / 2:.0f} (Calibrated)")
+            else:
+                st.markdown(f"Threshold: {THRESHOLD} (Configured)")
+    
+    # Create a real-time chart
+    st.markdown("<h3 class='sub-header'>Real-time Sensor Readings</h3>", unsafe_allow_html=True)
+    
+    # Pick how much history to show, then zoom into part of it
+    window_col, zoom_col = st.columns(2)
+    with window_col:
+        window = CHART_WINDOWS[st.select_slider("Chart window", options=list(CHART_WINDOWS), key="live_window")]
+    with zoom_col:
+        newest, oldest = st.slider("Zoom (seconds ago)", 0, window, (0, window), key=f"live_zoom_{window}")
+    
+    # Samples in the zoomed range at full resolution, reduced to what the chart can draw.
+    # Narrow ranges fit the point budget and are charted sample by sample.
+    times, values = buffer.window(now - oldest, now - newest)
+    times, values = downsample(times, values, points_for_width(), threshold=threshold)
+    chart_data = pd.DataFrame({
+        'time': now - times,
+        'value': values
+    })
+    
+    # Add threshold line
+    threshold_df = pd.DataFrame({
+        'time': [newest, oldest],
+        'threshold': [threshold, threshold]
+    })
+    
+    # Create chart
+    chart = alt.Chart(chart_data).mark_line(color='#1E88E5').encode(
+        x=alt.X('time', title='Time (seconds ago)', scale=alt.Scale(domain=[oldest, newest])),
+        y=alt.Y('value', title='Sensor Value', scale=alt.Scale(domain=[0, 1000]))
+    )
+    
+    threshold_line = alt.Chart(threshold_df).mark_line(color='red', strokeDash=[3, 3]).encode(
+        x='time',
+        y='threshold'
+    )
+    
+    st.altair_chart((chart + threshold_line).properties(height=300), use_container_width=True)
+
+    # Real devices, if this server was started with LAUNDRY_DEVICES
+    devices_config = os.environ.get("LAUNDRY_DEVICES")
+    if devices_config:
+        show_connected_devices(shared_status_poller(devices_config))
+    # Boards on a serial port, if it was started with LAUNDRY_SERIAL
+    ports_config = os.environ.get("LAUNDRY_SERIAL")
+    if ports_config:
+        show_connected_devices(shared_serial_reader(ports_config, os.environ.get("LAUNDRY_STORE")))
+
+
+# The Live Demo page
+def show_live_demo():
+    st.markdown("<h1 class='main-header'>Live Demo</h1>", unsafe_allow_html=True)
+    
+    # Pause to freeze the chart; otherwise only the live panel re-runs on a timer
+    live_col, calibrate_col = st.columns(2)
+    with live_col:
+        live = st.toggle("Live updates", value=True)
+    with calibrate_col:
+        calibrate = st.toggle("Auto-calibrate threshold", value=True,
+                              help="Learn this sensor's Running and Stopped levels and place the threshold between them")
+    
+    # Recorded sessions, if this server was started with LAUNDRY_RECORDINGS
+    replay = None
+    files = recordings()
+    if files:
+        source = st.radio("Source", ["Simulated sensor"] + list(files), horizontal=True, key="live_source")
+        if source in files:
+            recording = shared_recording(files[source])
+            speed_col, position_col = st.columns(2)
+            with speed_col:
+                speed = st.select_slider("Replay speed", options=REPLAY_SPEEDS, format_func=lambda s: f"{s}x")
+            with position_col:
+                minutes = st.slider("Start at (minutes)", 0, max(1, int(recording.duration // 60)), 0)
+            replay = (files[source], speed, minutes * 60.0)
+    
+    st.fragment(show_live_panel, run_every=REFRESH_SECONDS if live else None)("washer", replay, calibrate)
+    
+    # Note about demo
+    st.markdown("""
+    > **Note:** The panel above refreshes itself every second without re-running the rest of the page.
+    > Use the "Simulate Running Machine" checkbox in the sidebar to change the simulated status.
+    """)
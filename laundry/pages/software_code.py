@@ -0,0 +1,129 @@
+import streamlit as st
+
+from laundry.blocks import static_section
+
+
+# The Software Code page
+def show_software_code():
+    static_section("<h1 class='main-header'>Software Code</h1>", "### Arduino Sketch")
+    
+    with st.container(border=True):
+        st.code("""
+#include <WiFiNINA.h>
+const char ssid[] = "Laundry_AP";
+const char pass[] = "laundry123";
+WiFiServer server(80);
+const int sensorPin = A0;
+const int threshold = 500; // we can adjust this if needed
+String lastStatus = "Unknown"; // to track status changes
+
+void setup() {
+  Serial.begin(9600); // for debugging
+  while (!Serial); // wait for serial port to open
+  pinMode(sensorPin, INPUT); // set sensor pin as input
+  WiFi.beginAP(ssid, pass); // start access point
+  delay(1000);
+  server.begin();
+  Serial.println("Access Point Started");
+  Serial.println("Connect to: http://192.168.4.1");
+}
+
+String getStatus() {
+  int val = analogRead(sensorPin);
+  Serial.print("Sensor value: ");
+  Serial.println(val);
+  // Invert logic: LOW value means vibration (Running), HIGH means no vibration (Stopped)
+  return (val < threshold) ? "Running 🌀" : "Stopped 🧺"; 
+}
+
+void sendWebPage(WiFiClient client) { // send HTML page
+  client.println("HTTP/1.1 200 OK"); // send HTTP header
+  client.println("Content-Type: text/html");
+  client.println("Connection: close"); // close connection
+  client.println();
+  client.println(R"rawliteral( // HTML content
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8">
+  <title>Laundry Monitor</title>
+  <style>
+    body { font-family: Arial; background: #f9f9f9; text-align: center; padding-top: 50px; }
+    h1 { color: #333; }
+    .status { font-size: 2em; margin-top: 20px; color: #222; }
+  </style>
+</head>
+<body>
+  <h1>Laundry Status Monitor 🧼</h1>
+  <div class="status">Status: <span id="stat">Loading...</span></div>
+  <script>
+    async function update() {
+      const res = await fetch('/status');
+      const data = await res.json();
+      document.getElementById('stat').innerText = data.status;
+    }
+    update();
+    setInterval(update, 2000);
+  </script>
+</body>
+</html>
+)rawliteral");
+}
+
+void sendStatusJSON(WiFiClient client) {
+  client.println("HTTP/1.1 200 OK"); // send HTTP header
+  client.println("Content-Type: application/json");
+  client.println("Connection: close");
+  client.println();
+  client.print("{\"status\":\""); // send JSON response
+  client.print(lastStatus);
+  client.println("\"}");
+}
+
+void loop() {
+  String currentStatus = getStatus();
+  if (currentStatus != lastStatus) {
+    lastStatus = currentStatus;
+    Serial.println("Status changed: " + currentStatus);
+  }
+  WiFiClient client = server.available();
+  if (client) {
+    String req = client.readStringUntil('\\r');
+    client.flush();
+    if (req.indexOf("GET /status") >= 0) {
+      sendStatusJSON(client);
+    } else {
+      sendWebPage(client);
+    }
+    delay(1);
+    client.stop();
+  }
+  delay(300);
+}
+        """, language="cpp")
+    
+    st.markdown("### Code Explanation")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        with st.container(border=True):
+            static_section("#### Key Components:", """
+            - **WiFi Access Point:** Creates network "Laundry_AP"
+            - **Web Server:** Hosts interface on 192.168.4.1
+            - **Sensor Reading:** Monitors analog pin A0
+            - **Status Logic:** Below 500 = Running, Above = Stopped
+            - **Web Interface:** Responsive HTML page with auto-refresh
+            - **API Endpoint:** JSON response at /status
+            """)
+    
+    with col2:
+        static_section("#### How to Customize:", """
+        - Adjust `threshold` value based on your sensor's sensitivity
+        - Modify `ssid` and `pass` for your preferred network name and password
+        - Customize the HTML interface design
+        - Add features like:
+          - Notifications when status changes
+          - Historical logging
+          - Multiple machine support
+        """)
@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+import altair as alt
+
+from laundry.cache import dataset_key, datasets
+from laundry.cycles import CycleDetector, detect_cycles
+from laundry.profiling import section
+from laundry.recording import Recording, list_recordings
+from laundry.simulation import generate_vibration
+from laundry.spectrum import FEATURE_BANDS, Spectrogram, array_reader, cycle_features, sample_rate
+
+# Simulated washer: hours of samples and their rate (fast enough to see the spin)
+SIMULATED_HOURS = 6
+SIMULATED_RATE_HZ = 50
+# Highest rate recordings are resampled to before their spectra are taken
+SPECTRAL_RATE_HZ = 50
+# Span of the spectrogram view
+VIEW_WINDOWS = {"10 min": 600, "1 h": 3600, "6 h": 21600}
+# Most cells the spectrogram chart draws across and up
+CHART_COLUMNS = 120
+CHART_ROWS = 48
+# Recording time read at once while detecting cycles
+DETECT_CHUNK_SECONDS = 3600
+
+
+# The generator is deterministic, so one copy of the samples serves every session
+def simulated_vibration(seed, hours, rate_hz):
+    key = dataset_key("vibration", seed=seed, hours=hours, rate=rate_hz)
+    return datasets.get_or_compute(key, lambda: generate_vibration(seed=seed, hours=hours, rate_hz=rate_hz))
+
+
+# One memory-mapped view per recording file, shared by every session
+@st.cache_resource(show_spinner=False)
+def shared_recording(path):
+    return Recording(path)
+
+
+# Cycles in a recording, detected a chunk at a time so it is never read whole
+def recording_cycles(recording):
+    detector = CycleDetector()
+    for times, values in recording.chunks(DETECT_CHUNK_SECONDS):
+        detector.feed(times, values)
+    return detector.cycles()
+
+
+# Spectrogram and cycles of the selected source. Cycles are detected once per source.
+def load_source(path):
+    if path is None:
+        times, values = simulated_vibration(0, SIMULATED_HOURS, SIMULATED_RATE_HZ)
+        spectrogram = Spectrogram(array_reader(times, values), float(times[-1]), SIMULATED_RATE_HZ,
+                                  key=("simulated", 0, SIMULATED_HOURS, SIMULATED_RATE_HZ))
+        cycles = datasets.get_or_compute(
+            dataset_key("vibration_cycles", seed=0, hours=SIMULATED_HOURS, rate=SIMULATED_RATE_HZ),
+            lambda: detect_cycles(times, values))
+        return spectrogram, cycles
+
+    recording = shared_recording(path)
+    # A file rewritten in place must not be served from the old tiles
+    key = (path, os.path.getmtime(path))
+    rate = min(SPECTRAL_RATE_HZ, sample_rate(recording.window(0, 60)[0]))
+    spectrogram = Spectrogram(recording.window, recording.duration, rate, key=key)
+    cycles = datasets.get_or_compute(
+        dataset_key("recording_cycles", key=key),
+        lambda: recording_cycles(recording))
+    return spectrogram, cycles
+
+
+# Spectra pooled down to at most CHART_COLUMNS x CHART_ROWS cells, as chart rows in dB.
+# Also returns each cell's width in minutes and height in Hz.
+def spectrogram_frame(times, magnitudes, frequencies, step):
+    columns = -(-len(times) // CHART_COLUMNS)
+    rows = -(-len(frequencies) // CHART_ROWS)
+    power = magnitudes.astype(np.float64) ** 2
+    # Pad to whole cells; padding and missing windows are left out of the means
+    power = np.pad(power, ((0, -len(times) % columns), (0, -len(frequencies) % rows)), constant_values=np.nan)
+    cells = power.reshape(power.shape[0] // columns, columns, power.shape[1] // rows, rows)
+    counts = np.isfinite(cells).sum(axis=(1, 3))
+    mean = np.nan_to_num(cells).sum(axis=(1, 3)) / np.maximum(counts, 1)
+    level = np.where(counts > 0, 10 * np.log10(mean + 1e-6), np.nan)
+    cell_times = times[::columns] / 60
+    cell_freqs = frequencies[::rows]
+    frame = pd.DataFrame({
+        'minute': np.repeat(cell_times, len(cell_freqs)),
+        'hz': np.tile(cell_freqs, len(cell_times)),
+        'db': level.ravel(),
+    })
+    return frame.dropna(), columns * step / 60, rows * frequencies[1]
+
+
+# The Spectral Analysis page
+def show_spectral_analysis():
+    st.markdown("<h1 class='main-header'>Spectral Analysis</h1>", unsafe_allow_html=True)
+
+    st.markdown("<p class='info-text'>The vibration level tells Running from Stopped; its frequency content tells the phases apart: slow drum reversals while washing, a fast spin, and a low wobble when the load is unbalanced.</p>", unsafe_allow_html=True)
+
+    # Recorded sessions, if this server was started with LAUNDRY_RECORDINGS
+    files = list_recordings(os.environ.get("LAUNDRY_RECORDINGS"))
+    source = "Simulated washer"
+    if files:
+        source = st.radio("Source", [source] + list(files), horizontal=True, key="spectral_source")
+
+    with section("load:spectral"):
+        spectrogram, cycles = load_source(files.get(source))
+
+    view_col, start_col = st.columns(2)
+    with view_col:
+        view = VIEW_WINDOWS[st.select_slider("View", options=list(VIEW_WINDOWS), value="1 h", key="spectral_view")]
+    with start_col:
+        last_minute = max(0, int((spectrogram.duration - view) // 60))
+        start = 60 * st.slider("Start (minutes)", 0, max(1, last_minute), 0, key="spectral_start")
+
+    # Only tiles not already cached (by anyone) are transformed
+    with section("spectrogram"):
+        times, magnitudes = spectrogram.view(start, start + view)
+
+    st.markdown("<h3 class='sub-header'>Spectrogram</h3>", unsafe_allow_html=True)
+    if len(times) == 0:
+        st.warning("No samples in this part of the recording.")
+        return
+
+    frame, width, height = spectrogram_frame(times, magnitudes, spectrogram.frequencies, spectrogram.step)
+    chart = alt.Chart(frame).mark_rect().transform_calculate(
+        minute_end=f"datum.minute + {width}",
+        hz_end=f"datum.hz + {height}",
+    ).encode(
+        x=alt.X('minute:Q', title='Time (minutes)'),
+        x2='minute_end:Q',
+        y=alt.Y('hz:Q', title='Frequency (Hz)'),
+        y2='hz_end:Q',
+        color=alt.Color('db:Q', title='Level (dB)', scale=alt.Scale(scheme='viridis')),
+    )
+    st.altair_chart(chart.properties(height=300), use_container_width=True)
+    st.caption(f"{spectrogram.computed} tiles computed, {spectrogram.reused} reused from the cache")
+
+    # Features of the cycles overlapping the view, each over its whole length
+    st.markdown("<h3 class='sub-header'>Cycle Features</h3>", unsafe_allow_html=True)
+    starts, ends = cycles['start'], cycles['end']
+    shown = (ends > start) & (starts < start + view)
+    if not shown.any():
+        st.info("No cycles in this part of the recording.")
+        return
+
+    with section("features"):
+        features = cycle_features(spectrogram, starts[shown], ends[shown])
+    table = pd.DataFrame({
+        'Start (min)': np.round(starts[shown] / 60, 1),
+        'Duration (min)': np.round(cycles['duration_seconds'][shown] / 60, 1),
+        'Dominant (Hz)': features['dominant_hz'],
+        'Spin (Hz)': features['spin_hz'],
+        'Centroid (Hz)': features['centroid_hz'],
+        'Flatness': features['flatness'],
+        'RMS': features['rms'],
+    })
+    for band, (low, high) in FEATURE_BANDS.items():
+        label = f"{low:g}+ Hz" if high is None else f"{low:g}–{high:g} Hz"
+        table[f'Energy {label}'] = features[f'{band}_share']
+    st.dataframe(table.round(2), use_container_width=True, hide_index=True)
+
+    st.markdown("""
+    > **Note:** A spin well below the usual speed, with extra energy at low frequencies,
+    > points to an unbalanced load.
+    """)
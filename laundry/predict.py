@@ -0,0 +1,229 @@
+# Minutes left in running cycles.
+# Each device's past cycle durations are binned by whole minute, and suffix sums
+# over the bins give, for every elapsed minute t, the mean remaining time of the
+# cycles that lasted at least t. Those means are kept as one lookup-table row per
+# device, so a prediction is an array index and a whole fleet is predicted in one
+# fancy-indexing call. Devices with few cycles lean on the pooled history of all
+# devices. Once a cycle's spin has begun (see spectrum.spin_onsets), a second table
+# keyed by minutes into the spin takes over. A background thread refits the tables
+# from the history and swaps them in whole.
+#
+#   python -m laundry.predict --devices 4 --hours 48 --fleet 4000
+import argparse
+import threading
+import time
+
+import numpy as np
+
+# Longest cycle and spin the tables resolve, in minutes; beyond them a cycle is due any moment
+MAX_MINUTES = 240
+SPIN_MAX_MINUTES = 30
+# Weight of the pooled history in every device's table, in cycles
+PRIOR_CYCLES = 20
+# Seconds between refits
+REFIT_SECONDS = 600.0
+
+
+# Cycle counts and summed durations per whole minute, one row per name plus a last
+# row pooling all of them. Every name's row gets PRIOR_CYCLES cycles' worth of the pool.
+def _histograms(histories, names, size):
+    counts = np.zeros((len(names) + 1, size), dtype=np.float32)
+    sums = np.zeros((len(names) + 1, size), dtype=np.float32)
+    for row, name in enumerate(names):
+        minutes = np.asarray(histories.get(name, ()), dtype=np.float64)
+        minutes = minutes[np.isfinite(minutes) & (minutes > 0)]
+        bins = np.minimum(minutes.astype(np.intp), size - 1)
+        counts[row] = np.bincount(bins, minlength=size)
+        sums[row] = np.bincount(bins, weights=minutes, minlength=size)
+    counts[-1] = counts[:-1].sum(axis=0)
+    sums[-1] = sums[:-1].sum(axis=0)
+    pooled = counts[-1].sum()
+    if pooled:
+        counts[:-1] += counts[-1] * (PRIOR_CYCLES / pooled)
+        sums[:-1] += sums[-1] * (PRIOR_CYCLES / pooled)
+    return counts, sums
+
+
+# Mean minutes remaining after each whole minute t of the binned cycles:
+# E[D - t | D >= t], 0 past the longest cycle, NaN for rows without any cycle.
+# Works in place on the histograms, which a fleet's worth of rows makes large.
+def residual_table(counts, sums):
+    # Suffix sums: number and total length of the cycles that lasted at least t
+    np.cumsum(counts[:, ::-1], axis=1, out=counts[:, ::-1])
+    np.cumsum(sums[:, ::-1], axis=1, out=sums[:, ::-1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        table = np.divide(sums, counts, out=sums)
+    table -= np.arange(counts.shape[1], dtype=np.float32)
+    np.maximum(table, 0.0, out=table)
+    table[counts == 0] = 0.0
+    table[counts[:, 0] == 0] = np.nan
+    return table
+
+
+# Lookup tables fitted from past cycles. Never changed once built.
+class RemainingTime:
+    def __init__(self, names, table, spin_table=None):
+        self.names = list(names)
+        self.table = table
+        self.spin_table = spin_table
+        self._rows = {name: row for row, name in enumerate(self.names)}
+
+    # Table rows of the given device names; unknown devices get the pooled row
+    def rows(self, names):
+        pooled = len(self.names)
+        return np.fromiter((self._rows.get(name, pooled) for name in names), dtype=np.intp, count=len(names))
+
+    # Minutes left for cycles on table rows `rows` that have run `elapsed` minutes,
+    # and `spin` minutes into their spin (NaN, or None for all, where it has not begun)
+    def predict(self, rows, elapsed, spin=None):
+        left = self._lookup(self.table, rows, elapsed)
+        if spin is None or self.spin_table is None:
+            return left
+        spin = np.asarray(spin, dtype=np.float64)
+        return np.where(np.isfinite(spin), self._lookup(self.spin_table, rows, spin), left)
+
+    @staticmethod
+    def _lookup(table, rows, minutes):
+        minutes = np.nan_to_num(np.asarray(minutes, dtype=np.float64))
+        t = np.clip(minutes, 0, table.shape[1] - 1).astype(np.intp)
+        # The table holds whole minutes; the part of the current one already run is taken off
+        return np.maximum(table[rows, t] - (minutes - t), 0.0)
+
+
+# Tables from cycle durations ({name: minutes}) and, if known, spin lengths ({name: minutes})
+def fit_remaining(durations, spins=None):
+    names = sorted(set(durations) | set(spins or ()))
+    table = residual_table(*_histograms(durations, names, MAX_MINUTES + 1))
+    spin_table = residual_table(*_histograms(spins, names, SPIN_MAX_MINUTES + 1)) if spins else None
+    return RemainingTime(names, table, spin_table)
+
+
+# History of simulated machines, as the Data Analysis page generates it
+def simulated_history(names, days=7, seed=0):
+    def history():
+        from laundry.simulation import generate_cycles
+
+        cycles = generate_cycles(seed=seed, days=days, machines=len(names))
+        bounds = np.searchsorted(cycles['machine'], np.arange(len(names) + 1))
+        minutes = cycles['duration_minutes'].astype(np.float64)
+        return {name: minutes[lo:hi] for name, lo, hi in zip(names, bounds[:-1], bounds[1:])}, None
+    return history
+
+
+# History of every device in a Store, from its cycles table
+def store_history(store, days=None):
+    def history():
+        t0 = time.time() - days * 86400 if days else None
+        cycles = store.read_cycles(t0=t0)
+        names = store.devices()
+        minutes = (cycles['end'] - cycles['start']) / 60
+        order = np.argsort(cycles['device'], kind="stable")
+        ids, first = np.unique(cycles['device'][order], return_index=True)
+        groups = np.split(minutes[order], first[1:])
+        return {names[int(d)]: group for d, group in zip(ids, groups)}, None
+    return history
+
+
+# Lookup tables kept fresh from a history: `history()` returns durations and spin
+# lengths as fit_remaining takes them. Readers use whatever `model` holds.
+class RemainingTimeModel:
+    def __init__(self, history, interval=REFIT_SECONDS):
+        self.history = history
+        self.interval = interval
+        self.model = None
+        self.refit_seconds = 0.0
+        self._stopping = threading.Event()
+        self._thread = None
+        self.refit()
+
+    def refit(self):
+        start = time.perf_counter()
+        self.model = fit_remaining(*self.history())
+        self.refit_seconds = time.perf_counter() - start
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.refit()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="laundry-remaining-time", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Cycles and spin lengths (minutes) of simulated washers, one generate_vibration run each
+def vibration_history(devices, hours, seed=0):
+    from laundry.cycles import detect_cycles
+    from laundry.simulation import generate_vibration
+    from laundry.spectrum import Spectrogram, array_reader, spin_onsets
+
+    cycles = {}
+    for device in range(devices):
+        times, values = generate_vibration(seed=seed + device, hours=hours)
+        found = detect_cycles(times, values)
+        complete = ~found['ongoing']
+        spectrogram = Spectrogram(array_reader(times, values), float(times[-1]), 50,
+                                  key=("predict", seed + device, hours))
+        onset = spin_onsets(spectrogram, found['start'][complete], found['end'][complete])
+        duration = found['duration_seconds'][complete] / 60
+        cycles[f"washer-{device}"] = (duration, duration - onset / 60)
+    return cycles
+
+
+# Mean absolute error (minutes) of predictions at every elapsed minute of held-out cycles
+def evaluate(model, cycles, use_spin):
+    errors = []
+    for name, (duration, spin) in cycles.items():
+        for total, spin_length in zip(duration, spin):
+            elapsed = np.arange(0, total, 1.0)
+            into_spin = elapsed - (total - spin_length)
+            into_spin = np.where(use_spin & (into_spin >= 0), into_spin, np.nan)
+            rows = model.rows([name] * len(elapsed))
+            errors.append(np.abs(model.predict(rows, elapsed, into_spin) - (total - elapsed)))
+    return float(np.mean(np.concatenate(errors)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit remaining-time tables on simulated washers and time fleet predictions")
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--hours", type=float, default=48.0, help="simulated hours per device")
+    parser.add_argument("--fleet", type=int, default=4000, help="machines per timed prediction")
+    args = parser.parse_args(argv)
+
+    history = vibration_history(args.devices, args.hours)
+    # Fit on the first three quarters of every device's cycles, score on the rest
+    train, test = {}, {}
+    for name, (duration, spin) in history.items():
+        cut = len(duration) * 3 // 4
+        train[name] = (duration[:cut], spin[:cut])
+        test[name] = (duration[cut:], spin[cut:])
+    start = time.perf_counter()
+    model = fit_remaining({n: d for n, (d, _) in train.items()}, {n: s for n, (_, s) in train.items()})
+    fitted = time.perf_counter() - start
+    cycles = sum(len(d) for d, _ in history.values())
+    print(f"{cycles} cycles on {args.devices} washers, tables fitted in {1000 * fitted:.1f} ms")
+    print(f"mean absolute error: {evaluate(model, test, False):.2f} min from elapsed time, "
+          f"{evaluate(model, test, True):.2f} min with the spin onset")
+
+    rng = np.random.default_rng(0)
+    rows = model.rows([f"washer-{n % (args.devices + 1)}" for n in range(args.fleet)])
+    elapsed = rng.uniform(0, 60, args.fleet)
+    spin = np.where(rng.random(args.fleet) < 0.2, rng.uniform(0, 8, args.fleet), np.nan)
+    timings = []
+    for _ in range(200):
+        start = time.perf_counter()
+        model.predict(rows, elapsed, spin)
+        timings.append(time.perf_counter() - start)
+    print(f"{args.fleet} machines predicted in {1e6 * np.median(timings):.0f} µs "
+          f"(p99 {1e6 * np.percentile(timings, 99):.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Render-time profiling for script reruns.
+# Times the page and named sections inside it, counts the elements the run sends
+# to the browser with their payload bytes, and can append each run to a metrics
+# file: JSON lines, or Prometheus text format if the path ends in .prom.
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_current = threading.local()
+
+# Per-page totals since the server started, for the Prometheus export
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+class RunProfile:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.timestamp = time.time()
+        self.total_seconds = None
+        # (name, seconds, nesting depth) in the order sections finished
+        self.sections = []
+        self.elements = 0
+        self.payload_bytes = 0
+        self._depth = 0
+        self._ctx = None
+
+    def as_dict(self):
+        return {
+            "timestamp": self.timestamp,
+            "page": self.page,
+            "total_ms": 1000 * (self.total_seconds or 0.0),
+            "sections": {name: 1000 * seconds for name, seconds, _ in self.sections},
+            "elements": self.elements,
+            "payload_bytes": self.payload_bytes,
+        }
+
+
+def current_profile():
+    return getattr(_current, "profile", None)
+
+
+# Time a named part of the current run (does nothing when no run is being profiled)
+@contextmanager
+def section(name):
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    profile._depth += 1
+    try:
+        yield
+    finally:
+        profile._depth -= 1
+        profile.sections.append((name, time.perf_counter() - start, profile._depth))
+
+
+# Count every delta (element) the script run sends and its serialized size.
+# Counted after Streamlit has swapped elements the browser already holds for hash
+# references, so the bytes are what actually goes over the websocket.
+def _count_messages(ctx, profile):
+    send = ctx._enqueue
+
+    def counting_send(msg):
+        if msg.WhichOneof("type") in ("delta", "ref_hash"):
+            profile.elements += 1
+            profile.payload_bytes += msg.ByteSize()
+        return send(msg)
+
+    ctx._laundry_send = send
+    ctx._enqueue = counting_send
+    return send
+
+
+# Put back what _count_messages wrapped
+def _uncount_messages(ctx):
+    send = vars(ctx).pop("_laundry_send", None)
+    if send is not None:
+        ctx._enqueue = send
+
+
+# Start profiling the current script run; `started` is a perf_counter() reading
+# taken before the script's own imports
+def start_run(page=None, started=None):
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    profile = RunProfile(page)
+    if started is not None:
+        profile.started = started
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        # A run stopped early (st.stop, rerun, an exception) leaves its wrapper behind
+        _uncount_messages(ctx)
+        _count_messages(ctx, profile)
+    profile._ctx = ctx
+    _current.profile = profile
+    return profile
+
+
+# Stop counting, keep the run in the per-page totals and export it if asked to
+def finish_run(profile):
+    profile.total_seconds = time.perf_counter() - profile.started
+    _current.profile = None
+    if profile._ctx is not None:
+        _uncount_messages(profile._ctx)
+    _record(profile)
+    path = os.environ.get("LAUNDRY_METRICS_FILE")
+    if path:
+        export(profile, path)
+    return profile
+
+
+def _record(profile):
+    with _totals_lock:
+        totals = _totals.setdefault(profile.page, {"runs": 0, "seconds": 0.0, "elements": 0, "bytes": 0})
+        totals["runs"] += 1
+        totals["seconds"] += profile.total_seconds
+        totals["elements"] += profile.elements
+        totals["bytes"] += profile.payload_bytes
+
+
+# Copy of the per-page totals (runs, seconds, elements, bytes) recorded so far
+def page_totals():
+    with _totals_lock:
+        return {page: dict(totals) for page, totals in _totals.items()}
+
+
+# Write one finished run to a JSONL file, or refresh a Prometheus text file
+def export(profile, path):
+    if path.endswith(".prom"):
+        write_prometheus(path)
+    else:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(profile.as_dict()) + "\n")
+
+
+# Per-page counters in Prometheus text exposition format, replaced atomically
+def write_prometheus(path):
+    metrics = [
+        ("laundry_page_runs_total", "counter", "Script runs per page", "runs"),
+        ("laundry_page_render_seconds_total", "counter", "Time spent rendering per page", "seconds"),
+        ("laundry_page_elements_total", "counter", "Elements sent to browsers per page", "elements"),
+        ("laundry_page_payload_bytes_total", "counter", "Element payload bytes sent per page", "bytes"),
+    ]
+    with _totals_lock:
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for page, totals in sorted(_totals.items()):
+                label = page.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{page="{label}"}} {totals[field]}')
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
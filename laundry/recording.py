@@ -0,0 +1,291 @@
+# Compact binary recordings of vibration sessions, and replay of them.
+#
+# A recording (.lrec) is a 32-byte header followed by one 4-byte record per
+# sample: the time since the previous sample in ticks (uint16) and the raw ADC
+# value (uint16). Gaps longer than a uint16 of ticks are bridged by filler
+# records whose value is GAP. A sidecar index (.lrec.idx) holds, for every
+# INDEX_SECONDS of recording time, the first record at or after that time and
+# its tick count, so a time maps straight to a file offset however long the
+# recording is. Readers go through np.memmap and only touch the pages they need.
+#
+#   python -m laundry.recording synth washer.lrec --hours 24
+#   python -m laundry.recording import log.csv washer.lrec
+#   python -m laundry.recording info washer.lrec
+import argparse
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b"LREC"
+VERSION = 1
+# magic, version, reserved, start time (epoch seconds), tick (seconds), record count
+HEADER = struct.Struct("<4sHHddQ")
+HEADER_SIZE = 32
+RECORD = np.dtype([("dt", "<u2"), ("value", "<u2")])
+INDEX = np.dtype([("record", "<u8"), ("ticks", "<i8")])
+
+# Default timestamp resolution
+TICK_SECONDS = 0.001
+# Recording time covered by each index entry
+INDEX_SECONDS = 60
+# Value of filler records (ADC readings are 10-bit, so never this)
+GAP = 0xFFFF
+MAX_DT = 0xFFFF
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+# Writes a recording sample by sample or in batches, in time order
+class Recorder:
+    def __init__(self, path, start=None, tick=TICK_SECONDS):
+        self.path = path
+        self.start = start
+        self.tick = tick
+        self.count = 0
+        # Ticks since start of the last record written
+        self._last = 0
+        self._bucket_ticks = int(round(INDEX_SECONDS / tick))
+        self._index = []
+        self._file = open(path, "wb")
+        self._file.write(b"\0" * HEADER_SIZE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, times, values):
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values)
+        if len(times) == 0:
+            return
+        if self.start is None:
+            self.start = float(times[0])
+        ticks = np.round((times - self.start) / self.tick).astype(np.int64)
+        # Clamp out-of-order timestamps to the previous one rather than go back in time
+        ticks = np.maximum.accumulate(np.maximum(ticks, self._last))
+        deltas = np.diff(ticks, prepend=self._last)
+
+        # Long deltas become filler records of MAX_DT ticks plus the remainder
+        fillers = np.maximum(deltas - 1, 0) // MAX_DT
+        n = len(deltas) + int(fillers.sum())
+        records = np.empty(n, dtype=RECORD)
+        # Position of every real sample once the fillers before it are inserted
+        real = np.arange(len(deltas)) + np.cumsum(fillers)
+        records["dt"] = MAX_DT
+        records["value"] = GAP
+        records["dt"][real] = deltas - fillers * MAX_DT
+        records["value"][real] = np.clip(values, 0, GAP - 1)
+
+        # Absolute ticks of every record, for the time index
+        record_ticks = self._last + np.cumsum(records["dt"].astype(np.int64))
+        buckets = record_ticks // self._bucket_ticks
+        first = len(self._index)
+        if first == 0 or buckets[-1] >= first:
+            # First record of each new bucket; empty buckets point at the next record
+            wanted = np.arange(first, buckets[-1] + 1)
+            at = np.searchsorted(record_ticks, wanted * self._bucket_ticks, side="left")
+            self._index.extend(zip((self.count + at).tolist(), record_ticks[at].tolist()))
+
+        records.tofile(self._file)
+        self.count += n
+        self._last = int(record_ticks[-1])
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.start or 0.0, self.tick, self.count))
+        self._file.close()
+        index = np.array(self._index, dtype=INDEX)
+        tmp = index_path(self.path) + ".tmp"
+        index.tofile(tmp)
+        os.replace(tmp, index_path(self.path))
+
+
+# Recordings in a folder by file name, for the pages' source pickers
+def list_recordings(folder):
+    if not folder or not os.path.isdir(folder):
+        return {}
+    return {name: os.path.join(folder, name) for name in sorted(os.listdir(folder)) if name.endswith(".lrec")}
+
+
+# Read-only view of a recording. Nothing is read up front beyond the header and index.
+class Recording:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, _, self.start, self.tick, self.count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        self.records = np.memmap(path, dtype=RECORD, mode="r", offset=HEADER_SIZE, shape=(self.count,))
+        self.index = np.fromfile(index_path(path), dtype=INDEX)
+        # Seconds from the first to the last record: the last checkpoint plus what follows it
+        self.duration = 0.0
+        if len(self.index):
+            tail = self.records["dt"][int(self.index["record"][-1]) + 1:].astype(np.int64).sum()
+            self.duration = (int(self.index["ticks"][-1]) + int(tail)) * self.tick
+
+    def __len__(self):
+        return self.count
+
+    # Record number and tick count of the first record at or after bucket k
+    def _checkpoint(self, k):
+        if k >= len(self.index):
+            return self.count, None
+        return int(self.index["record"][k]), int(self.index["ticks"][k])
+
+    # Samples with t0 <= time < t1, times in seconds since the start of the recording.
+    # Reads only the index buckets overlapping the window.
+    def window(self, t0, t1):
+        t0, t1 = max(t0, 0.0), max(t1, 0.0)
+        k0 = int(t0 // INDEX_SECONDS)
+        k1 = int(t1 // INDEX_SECONDS) + 1
+        lo, base = self._checkpoint(k0)
+        hi, _ = self._checkpoint(k1)
+        if lo >= hi:
+            return np.empty(0), np.empty(0, dtype=np.uint16)
+        chunk = self.records[lo:hi]
+        # The checkpoint record's own delta is already counted in its tick count
+        ticks = base + np.cumsum(chunk["dt"].astype(np.int64)) - int(chunk["dt"][0])
+        times = ticks * self.tick
+        keep = (chunk["value"] != GAP) & (times >= t0) & (times < t1)
+        return times[keep], np.asarray(chunk["value"][keep])
+
+    # The whole recording as consecutive windows of about `seconds` (whole index
+    # buckets), so it can be processed without being read at once
+    def chunks(self, seconds=3600):
+        step = max(1, int(seconds // INDEX_SECONDS)) * INDEX_SECONDS
+        t0 = 0.0
+        while t0 <= self.duration:
+            yield self.window(t0, t0 + step)
+            t0 += step
+
+
+# Plays a recording back as if it were a live sensor, `speed` times faster than real time.
+# Replay time runs on its own clock, so charts see the recording's own time scale.
+class Replayer:
+    def __init__(self, recording, speed=1.0, position=0.0, loop=True):
+        self.recording = recording
+        self.speed = speed
+        self.loop = loop
+        # Recording position (unwrapped across loops) at wall time _origin_wall
+        self._origin_position = position
+        self._origin_wall = None
+        self._last = None
+
+    # Unwrapped recording position at wall time `wall`
+    def position(self, wall):
+        if self._origin_wall is None:
+            self._origin_wall = wall
+        position = self._origin_position + (wall - self._origin_wall) * self.speed
+        if not self.loop:
+            position = min(position, self.recording.duration)
+        return position
+
+    # Replay clock: the timestamp that the samples read at wall time `wall` end at
+    def clock(self, wall):
+        return self.recording.start + self.position(wall)
+
+    def set_speed(self, speed, wall):
+        self._origin_position = self.position(wall)
+        self._origin_wall = wall
+        self.speed = speed
+
+    # Jump to `position` seconds into the recording; the next read backfills from there
+    def seek(self, position, wall):
+        self._origin_position = position
+        self._origin_wall = wall
+        self._last = None
+
+    # Samples that became due since the previous read, stamped on the replay clock.
+    # Same call as SimulatedSensor.read; the running flag does not apply to recordings.
+    def read(self, wall, is_running=None, backfill_seconds=0.0):
+        end = self.position(wall)
+        start = end - backfill_seconds if self._last is None else self._last
+        start = max(start, 0.0)
+        self._last = end
+        # One loop lasts a tick longer than the recording, so its last sample is played too
+        duration = self.recording.duration + self.recording.tick
+        if end <= start or not self.recording.count:
+            return np.empty(0), np.empty(0, dtype=np.int16)
+        times, values = [], []
+        # Split the span at loop boundaries and read each piece from the file
+        loop = int(start // duration)
+        while loop * duration < end:
+            offset = loop * duration
+            t, v = self.recording.window(max(start, offset) - offset, min(end, offset + duration) - offset)
+            times.append(t + offset)
+            values.append(v)
+            loop += 1
+        return self.recording.start + np.concatenate(times), np.concatenate(values).astype(np.int16)
+
+
+# A recording of a washer going through cycles, from the simulated sensor's ranges
+def synthesize(path, hours=24.0, rate_hz=5, seed=0, start=None):
+    rng = np.random.default_rng(seed)
+    start = time.time() - hours * 3600 if start is None else start
+    # Alternate stopped and running periods of realistic lengths
+    edges = [0.0]
+    while edges[-1] < hours * 3600:
+        edges.append(edges[-1] + rng.uniform(20, 180) * 60)
+        edges.append(edges[-1] + rng.uniform(30, 90) * 60)
+    with Recorder(path, start=start) as recorder:
+        # Write an hour at a time to keep memory flat for long recordings
+        for hour in range(int(np.ceil(hours))):
+            t = np.arange(hour * 3600, min(hours, hour + 1) * 3600, 1 / rate_hz)
+            running = np.searchsorted(edges, t, side="right") % 2 == 0
+            values = np.where(running, rng.integers(50, 401, len(t)), rng.integers(600, 901, len(t)))
+            recorder.append(start + t, values)
+    return Recording(path)
+
+
+# Convert a CSV sample log (time column, value column) into a recording
+def import_csv(csv_path, path):
+    import pandas as pd
+
+    with Recorder(path) as recorder:
+        for log in pd.read_csv(csv_path, chunksize=1_000_000):
+            time_col = 'time' if 'time' in log.columns else log.columns[0]
+            value_col = 'value' if 'value' in log.columns else log.columns[1]
+            times = log[time_col]
+            if not pd.api.types.is_numeric_dtype(times):
+                times = pd.to_datetime(times).astype('int64') / 1e9
+            recorder.append(times.to_numpy(dtype=np.float64), log[value_col].to_numpy())
+    return Recording(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create and inspect laundry sensor recordings")
+    commands = parser.add_subparsers(dest="command", required=True)
+    synth = commands.add_parser("synth", help="write a simulated washer session")
+    synth.add_argument("path")
+    synth.add_argument("--hours", type=float, default=24.0)
+    synth.add_argument("--rate", type=int, default=5, help="samples per second")
+    synth.add_argument("--seed", type=int, default=0)
+    imported = commands.add_parser("import", help="convert a CSV sample log")
+    imported.add_argument("csv")
+    imported.add_argument("path")
+    info = commands.add_parser("info", help="describe a recording")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == "synth":
+        recording = synthesize(args.path, args.hours, args.rate, args.seed)
+    elif args.command == "import":
+        recording = import_csv(args.csv, args.path)
+    else:
+        recording = Recording(args.path)
+    size = os.path.getsize(args.path)
+    print(f"{args.path}: {recording.count} records, {recording.duration / 3600:.2f} h, "
+          f"{size / 2**20:.1f} MiB ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
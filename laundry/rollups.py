@@ -0,0 +1,161 @@
+# Materialized rollups behind the Data Analysis charts.
+# Cycles are folded into per-day tables as they arrive (counts per hour, duration
+# count/sum/min/max, exact counts per whole minute of duration and a duration
+# quantile sketch), so a chart over any window of days costs O(days) however many
+# cycles the history holds. Days and hours are cut in wall-clock time, from the
+# clock the rollups are built with.
+import threading
+import time
+
+import numpy as np
+
+from laundry.sketch import QuantileSketch
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+# Durations are counted per whole minute up to a day; longer ones count in the last slot
+MAX_DURATION_MINUTES = 1440
+# Initial number of days the tables are sized for; they grow on demand
+_INITIAL_DAYS = 32
+
+
+# Epoch seconds to wall-clock seconds (epoch seconds plus the UTC offset in effect)
+# and back. A fixed offset, or None for the system's local time zone with its
+# daylight saving changes.
+class Clock:
+    def __init__(self, utc_offset=0):
+        self.utc_offset = utc_offset
+
+    # Seconds east of UTC at each epoch time
+    def offset(self, seconds):
+        seconds = np.asarray(seconds, dtype=np.float64)
+        if self.utc_offset is not None:
+            return np.full(seconds.shape, float(self.utc_offset))
+        # Offsets only change on the hour, so look each hour up once
+        hours, inverse = np.unique(np.floor_divide(seconds, SECONDS_PER_HOUR), return_inverse=True)
+        offsets = np.array([time.localtime(h * SECONDS_PER_HOUR).tm_gmtoff for h in hours.tolist()],
+                           dtype=np.float64)
+        return offsets[inverse].reshape(seconds.shape)
+
+    def wall(self, seconds):
+        return np.asarray(seconds, dtype=np.float64) + self.offset(seconds)
+
+    def epoch(self, wall):
+        wall = np.asarray(wall, dtype=np.float64)
+        return wall - self.offset(wall - self.offset(wall))
+
+
+# Naive timestamps (already wall-clock) and the server's local time
+UTC = Clock(0)
+LOCAL = Clock(None)
+
+
+class CycleRollups:
+    def __init__(self, alpha=0.01, clock=UTC):
+        self.clock = clock
+        self.durations = QuantileSketch(alpha)
+        # Day number (days since 1970-01-01) of row 0 of every table
+        self.first_day = None
+        self.day_count = np.zeros(0, dtype=np.int64)
+        self.day_sum = np.zeros(0, dtype=np.float64)
+        self.day_min = np.zeros(0, dtype=np.float64)
+        self.day_max = np.zeros(0, dtype=np.float64)
+        self.hour_counts = np.zeros((0, 24), dtype=np.int64)
+        self.duration_counts = np.zeros((0, self.durations.size), dtype=np.int64)
+        self.minute_counts = np.zeros((0, MAX_DURATION_MINUTES + 1), dtype=np.int64)
+        # Highest store cycle id already folded in
+        self.watermark = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def days(self):
+        return len(self.day_count)
+
+    # Make room for day numbers lo..hi (inclusive) in every table
+    def _reserve(self, lo, hi):
+        if self.first_day is None:
+            self.first_day = lo
+        before = max(0, self.first_day - lo)
+        after = max(0, hi - (self.first_day + self.days - 1))
+        if not before and not after:
+            return
+        if self.days:
+            # Grow geometrically so a steady stream of new days stays cheap
+            after = max(after, self.days) if after else 0
+            before = max(before, self.days) if before else 0
+        else:
+            after = max(hi - lo + 1, _INITIAL_DAYS)
+
+        def grow(table, fill):
+            pad = ((before, after),) + ((0, 0),) * (table.ndim - 1)
+            return np.pad(table, pad, constant_values=fill)
+
+        self.day_count = grow(self.day_count, 0)
+        self.day_sum = grow(self.day_sum, 0)
+        self.day_min = grow(self.day_min, np.inf)
+        self.day_max = grow(self.day_max, -np.inf)
+        self.hour_counts = grow(self.hour_counts, 0)
+        self.duration_counts = grow(self.duration_counts, 0)
+        self.minute_counts = grow(self.minute_counts, 0)
+        self.first_day -= before
+
+    # Fold in cycles: start as epoch seconds, duration in minutes
+    def add(self, start, duration_minutes, ids=None):
+        start = np.asarray(start, dtype=np.float64)
+        duration = np.asarray(duration_minutes, dtype=np.float64)
+        if len(start) == 0:
+            return
+        wall = self.clock.wall(start)
+        day = np.floor_divide(wall, SECONDS_PER_DAY).astype(np.int64)
+        hour = ((wall - day * SECONDS_PER_DAY) // SECONDS_PER_HOUR).astype(np.intp)
+        minute = np.clip(np.rint(duration), 0, MAX_DURATION_MINUTES).astype(np.intp)
+        with self._lock:
+            self._reserve(int(day.min()), int(day.max()))
+            row = day - self.first_day
+            days = self.days
+            self.day_count += np.bincount(row, minlength=days)
+            self.day_sum += np.bincount(row, weights=duration, minlength=days)
+            np.minimum.at(self.day_min, row, duration)
+            np.maximum.at(self.day_max, row, duration)
+            self.hour_counts += np.bincount(row * 24 + hour, minlength=days * 24).reshape(days, 24)
+            size = self.durations.size
+            buckets = row * size + self.durations.bucket(duration)
+            self.duration_counts += np.bincount(buckets, minlength=days * size).reshape(days, size)
+            size = MAX_DURATION_MINUTES + 1
+            self.minute_counts += np.bincount(row * size + minute, minlength=days * size).reshape(days, size)
+            if ids is not None and len(ids):
+                self.watermark = max(self.watermark, int(np.max(ids)))
+
+    # Fold in only the cycles appended to the store since the last refresh
+    def refresh(self, store):
+        with self._refresh_lock:
+            new = store.read_cycles(after_id=self.watermark)
+            self.add(new['start'], (new['end'] - new['start']) / 60, ids=new['id'])
+        return len(new['id'])
+
+    # Totals over day numbers first_day..last_day (inclusive; None means unbounded).
+    # 'minutes' counts cycles per whole minute of duration, exactly; 'durations'
+    # is the sketch, for quantiles.
+    def window(self, first_day=None, last_day=None):
+        with self._lock:
+            if self.first_day is None:
+                lo = hi = 0
+            else:
+                lo = 0 if first_day is None else max(0, first_day - self.first_day)
+                hi = self.days if last_day is None else max(lo, min(self.days, last_day - self.first_day + 1))
+            count = int(self.day_count[lo:hi].sum())
+            total = float(self.day_sum[lo:hi].sum())
+            weekday = (np.arange(lo, hi) + (self.first_day or 0) + 3) % 7
+            return {
+                'count': count,
+                'total_minutes': total,
+                'mean_minutes': total / count if count else float('nan'),
+                'min_minutes': float(self.day_min[lo:hi].min()) if count else float('nan'),
+                'max_minutes': float(self.day_max[lo:hi].max()) if count else float('nan'),
+                # Monday = 0
+                'day_of_week': np.bincount(weekday, weights=self.day_count[lo:hi], minlength=7).astype(np.int64),
+                'hour': self.hour_counts[lo:hi].sum(axis=0),
+                'minutes': self.minute_counts[lo:hi].sum(axis=0),
+                'durations': self.durations.with_counts(self.duration_counts[lo:hi].sum(axis=0)),
+            }
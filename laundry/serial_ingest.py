@@ -0,0 +1,424 @@
+# Sample ingestion from the sketch's serial output.
+# The sketch prints "Sensor value: N" on every loop and "Status changed: ..." when
+# the status flips, at 9600 baud. One asyncio loop per server process watches
+# every port with add_reader on a non-blocking descriptor, parses whatever has
+# arrived in one pass per read, and appends the samples to the Store in batches.
+# A port that goes away (unplugged, board reset) is reopened with backoff.
+#
+#   python -m laundry.serial_ingest read washer=/dev/ttyACM0 --store laundry.db
+#   python -m laundry.serial_ingest replay capture.txt --link /tmp/ttyWASHER --speed 10
+import argparse
+import asyncio
+import logging
+import os
+import pty
+import random
+import re
+import termios
+import threading
+import time
+import tty
+
+import numpy as np
+
+from laundry.ingest import StatusStore, parse_devices
+
+BAUD = 9600
+# Longest stretch of unparsed input kept between reads
+BUFFER_SIZE = 64 * 1024
+# Samples are written to the store once this many are pending or this much time has passed
+FLUSH_SAMPLES = 2000
+FLUSH_SECONDS = 5.0
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+log = logging.getLogger(__name__)
+
+# Readings are 10-bit; a line with more than four digits is noise, skipped like any
+# other unparsed line rather than overflowing the int16 samples
+SAMPLE_LINE = re.compile(rb"^Sensor value: *(\d{1,4})\r?$", re.M)
+STATUS_LINE = re.compile(rb"^Status changed: *(.*?)\r?$", re.M)
+
+_SPEEDS = {9600: termios.B9600, 19200: termios.B19200, 38400: termios.B38400,
+           57600: termios.B57600, 115200: termios.B115200}
+
+
+# Open a serial port (or pty) raw, non-blocking, at `baud`
+def open_port(path, baud=BAUD):
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        tty.setraw(fd)
+        attrs = termios.tcgetattr(fd)
+        attrs[2] |= termios.CLOCAL | termios.CREAD
+        attrs[4] = attrs[5] = _SPEEDS[baud]
+        termios.tcsetattr(fd, termios.TCSANOW, attrs)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+# Incremental parser for one port's byte stream. Bytes are read straight into a
+# fixed buffer; each parse handles every complete line in it with one regex pass
+# per line kind, so there is no per-line Python object beyond the matched digits.
+class LineParser:
+    def __init__(self, size=BUFFER_SIZE):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.fill = 0
+        # Bytes discarded because a line did not fit in the buffer
+        self.dropped = 0
+
+    # Free space to read into
+    def space(self):
+        return self.view[self.fill:]
+
+    def feed(self, data):
+        n = min(len(data), len(self.buffer) - self.fill)
+        self.buffer[self.fill:self.fill + n] = data[:n]
+        self.fill += n
+        self.dropped += len(data) - n
+
+    # Sample values of the complete lines received so far, the number of bytes
+    # they took, and the status changes among them as (samples before it, status)
+    def parse(self):
+        end = self.buffer.rfind(b"\n", 0, self.fill) + 1
+        if end == 0:
+            if self.fill == len(self.buffer):
+                # A line longer than the buffer is noise; start over
+                self.dropped += self.fill
+                self.fill = 0
+            return np.empty(0, dtype=np.int16), 0, []
+        block = self.view[:end]
+        digits = SAMPLE_LINE.findall(block)
+        values = np.array(digits, dtype=np.bytes_).astype(np.int16) if digits else np.empty(0, dtype=np.int16)
+        changes = [(match.start(), match.group(1).decode("utf-8", "replace")) for match in STATUS_LINE.finditer(block)]
+        if changes:
+            # Samples before each change, counted over the lines that parsed as samples
+            starts = np.fromiter((match.start() for match in SAMPLE_LINE.finditer(block)), dtype=np.int64)
+            changes = [(int(np.searchsorted(starts, at)), status) for at, status in changes]
+        # Keep the partial line for the next read
+        rest = self.fill - end
+        self.buffer[:rest] = self.buffer[end:self.fill]
+        self.fill = rest
+        return values, end, changes
+
+
+class PortClosed(Exception):
+    pass
+
+
+# Reads many serial ports concurrently into a sample Store and a StatusStore
+class SerialReader:
+    def __init__(self, ports, sample_store=None, store=None, baud=BAUD,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.devices = dict(ports)
+        self.sample_store = sample_store
+        # Latest status per port, from its "Status changed" lines, and when it last sent anything
+        self.store = store if store is not None else StatusStore()
+        self.baud = baud
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.counters = {name: {"samples": 0, "bytes": 0, "statuses": 0, "reconnects": 0}
+                         for name in self.devices}
+        self._pending = {name: ([], []) for name in self.devices}
+        self._flushed = {name: time.monotonic() for name in self.devices}
+        # Wakeup events of the ports being read, so stop() does not wait for a timeout
+        self._wakers = set()
+        self._loop = None
+        self._thread = None
+        self._stopping = None
+
+    # Stamp a batch of samples. The lines carry no time of their own, so they are
+    # spread evenly over the time it took to send them, ending now.
+    def _receive(self, name, values, nbytes, changes, now, last):
+        counters = self.counters[name]
+        counters["bytes"] += nbytes
+        span = min(now - last, 10 * nbytes / self.baud)
+        times = now - span + span * np.arange(1, len(values) + 1) / max(len(values), 1)
+        if len(values):
+            counters["samples"] += len(values)
+            self._pending[name][0].append(times)
+            self._pending[name][1].append(values)
+        for before, status in changes:
+            counters["statuses"] += 1
+            at = float(times[before - 1]) if before else now - span
+            self.store.update(name, status, at)
+        # The port is alive whether or not the status changed; staleness goes by this
+        self.store.heard(name, now)
+
+    async def _flush(self, name, force=False):
+        times, values = self._pending[name]
+        pending = sum(len(v) for v in values)
+        due = time.monotonic() - self._flushed[name] >= FLUSH_SECONDS
+        if not pending or not (force or due or pending >= FLUSH_SAMPLES):
+            return
+        self._pending[name] = ([], [])
+        self._flushed[name] = time.monotonic()
+        if self.sample_store is not None:
+            # SQLite blocks; keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.sample_store.append_samples, name, np.concatenate(times), np.concatenate(values))
+
+    # Read one open port until it closes. The descriptor is drained on every wakeup.
+    async def _read_open(self, name, fd):
+        loop = asyncio.get_running_loop()
+        parser = LineParser()
+        woken = asyncio.Event()
+        last = time.time()
+
+        def readable():
+            woken.set()
+
+        loop.add_reader(fd, readable)
+        self._wakers.add(woken)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await asyncio.wait_for(woken.wait(), FLUSH_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                woken.clear()
+                while True:
+                    try:
+                        n = os.readv(fd, [parser.space()])
+                    except BlockingIOError:
+                        break
+                    except OSError as exc:
+                        # A pty whose other end went away reports EIO
+                        raise PortClosed(f"{type(exc).__name__}: {exc}") from exc
+                    if n == 0:
+                        raise PortClosed("end of file")
+                    parser.fill += n
+                    now = time.time()
+                    values, nbytes, changes = parser.parse()
+                    if nbytes:
+                        self._receive(name, values, nbytes, changes, now, last)
+                        last = now
+                await self._flush(name)
+        finally:
+            loop.remove_reader(fd)
+            self._wakers.discard(woken)
+            await self._flush(name, force=True)
+
+    async def _read_port(self, name, path):
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                fd = open_port(path, self.baud)
+            # termios.error: the path is not a terminal
+            except (OSError, termios.error) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                if failures:
+                    self.counters[name]["reconnects"] += 1
+                failures = 0
+                try:
+                    await self._read_open(name, fd)
+                    error = None
+                except PortClosed as exc:
+                    error = str(exc)
+                # Whatever one port sends, the others keep being read
+                except Exception as exc:
+                    log.exception("Reading %s failed", name)
+                    error = f"{type(exc).__name__}: {exc}"
+                finally:
+                    os.close(fd)
+            if error is None:
+                break
+            failures += 1
+            self.store.fail(name, error)
+            # Exponential backoff with jitter, capped
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1)) * random.uniform(0.5, 1.0)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        self._stopping = asyncio.Event()
+        await asyncio.gather(*(self._read_port(name, path) for name, path in self.devices.items()))
+
+    # Run the reader on a daemon thread with its own event loop
+    def start(self):
+        if self._thread is not None:
+            return self
+        ready = threading.Event()
+
+        def main():
+            self._loop = asyncio.new_event_loop()
+            task = self._loop.create_task(self.run())
+            self._loop.call_soon(ready.set)
+            self._loop.run_until_complete(task)
+            self._loop.close()
+
+        self._thread = threading.Thread(target=main, name="laundry-serial-reader", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _stop(self):
+        self._stopping.set()
+        for woken in self._wakers:
+            woken.set()
+
+
+# Serial output of the sketch for a washer going through cycles, for replays
+# without a capture: one "Sensor value" line per loop and the status changes
+def synthesize_capture(minutes=30, loop_seconds=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    loops = int(minutes * 60 / loop_seconds)
+    # Switch between stopped and running every few minutes
+    running = np.cumsum(rng.random(loops) < loop_seconds / 180) % 2 == 1
+    values = np.where(running, rng.integers(50, 401, loops), rng.integers(600, 901, loops))
+    lines = ["Access Point Started", "Connect to: http://192.168.4.1"]
+    last = None
+    for value in values.tolist():
+        lines.append(f"Sensor value: {value}")
+        status = "Running 🌀" if value < 500 else "Stopped 🧺"
+        if status != last:
+            last = status
+            lines.append(f"Status changed: {status}")
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+# Stand-in for a board on a serial port: a pseudo-terminal that replays captured
+# output at the pace a real port would deliver it (`speed` times faster).
+# `link` is a symlink kept pointing at the current pty, like /dev/serial/by-id,
+# so the reader can be pointed at it and follow disconnect() and reconnect().
+class PtyReplay:
+    def __init__(self, capture, link=None, baud=BAUD, speed=1.0, loop=True):
+        self.capture = capture
+        self.link = link
+        self.baud = baud
+        self.speed = speed
+        self.loop = loop
+        self.master = None
+        self.path = None
+        self._slave = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _open(self):
+        self.master, slave = pty.openpty()
+        self.path = os.ttyname(slave)
+        # Raw, so nothing is echoed back or held for line editing; our end of the
+        # slave stays open so writes do not fail before the reader opens it
+        tty.setraw(slave)
+        os.set_blocking(self.master, False)
+        self._slave = slave
+        if self.link:
+            tmp = self.link + ".tmp"
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            os.symlink(self.path, tmp)
+            os.replace(tmp, self.link)
+
+    def _close(self):
+        for fd in (self.master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self.master = self._slave = None
+
+    def _write(self):
+        # Chunks of about 20 ms of line time
+        chunk = max(1, int(self.baud / 10 * 0.02 * self.speed))
+        position = 0
+        while not self._stopping.is_set():
+            if position >= len(self.capture):
+                if not self.loop:
+                    break
+                position = 0
+            data = self.capture[position:position + chunk]
+            try:
+                os.write(self.master, data)
+            except (OSError, TypeError):
+                # Nobody reading, or disconnected; wait for the reader, reconnect() or stop()
+                self._stopping.wait(0.05)
+                continue
+            position += len(data)
+            self._stopping.wait(len(data) * 10 / self.baud / self.speed)
+
+    def start(self):
+        self._open()
+        self._thread = threading.Thread(target=self._write, name="laundry-pty-replay", daemon=True)
+        self._thread.start()
+        return self
+
+    # Unplug: the reader's end fails with EIO and its link points nowhere useful
+    def disconnect(self):
+        self._close()
+
+    # Plug back in on a new pty; the link follows it
+    def reconnect(self):
+        self._close()
+        self._open()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close()
+        if self.link and os.path.lexists(self.link):
+            os.unlink(self.link)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read the sketch's serial output into the sample store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    read = commands.add_parser("read", help="read ports until interrupted")
+    read.add_argument("ports", nargs="+", help="name=/dev/ttyACM0")
+    read.add_argument("--store", help="SQLite sample store to append to")
+    read.add_argument("--baud", type=int, default=BAUD, choices=sorted(_SPEEDS))
+    replay = commands.add_parser("replay", help="replay captured serial output on a pseudo-terminal")
+    replay.add_argument("capture", nargs="?", help="captured output (default: a simulated washer)")
+    replay.add_argument("--link", default="/tmp/ttyLAUNDRY", help="symlink to the pty")
+    replay.add_argument("--speed", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        capture = synthesize_capture()
+        if args.capture:
+            with open(args.capture, "rb") as f:
+                capture = f.read()
+        with PtyReplay(capture, link=args.link, speed=args.speed) as replay:
+            print(f"Replaying {len(capture)} bytes on {replay.path} (linked from {args.link}); Ctrl-C to stop")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+        return
+
+    from laundry.store import Store
+
+    store = Store(args.store) if args.store else None
+    reader = SerialReader(parse_devices(",".join(args.ports)), sample_store=store, baud=args.baud).start()
+    try:
+        while True:
+            time.sleep(5)
+            for name, counters in reader.counters.items():
+                seen = reader.store.get(name)
+                print(f"{name}: {counters['samples']} samples, {counters['statuses']} status changes, "
+                      f"{counters['reconnects']} reconnects, status {seen.status if seen else None}"
+                      f"{', error ' + seen.error if seen and seen.error else ''}")
+    except KeyboardInterrupt:
+        reader.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import random
+from datetime import date
+
+import numpy as np
+
+
+# Function to generate mock sensor data for the demo
+def generate_sensor_data(is_running=False):
+    if is_running:
+        # When running: lower values with some fluctuation
+        return random.randint(50, 400)
+    else:
+        # When stopped: higher values with some fluctuation
+        return random.randint(600, 900)
+
+# Day names indexed by NumPy weekday number (Monday = 0)
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+
+
+# Function to generate a fleet's cycle history as columnar NumPy arrays.
+# The same seed, end day and parameters always produce the same arrays, so the
+# result can be cached and compared across runs.
+def generate_cycles(seed=0, days=7, machines=1, cycles_per_day=2.0,
+                    first_hour=7, last_hour=21, min_duration=30, max_duration=90, end=None):
+    rng = np.random.default_rng(seed)
+    end_day = np.datetime64(end or date.today(), 'D')
+    first_day = end_day - (days - 1)
+
+    # Number of cycles for every (machine, day), Poisson around the daily rate
+    counts = rng.poisson(cycles_per_day, size=(machines, days))
+    total = int(counts.sum())
+
+    machine = np.repeat(np.arange(machines, dtype=np.int32), counts.sum(axis=1))
+    day = np.repeat(np.tile(np.arange(days, dtype=np.int64), machines), counts.ravel())
+
+    # Start at a random minute between first_hour:00 and last_hour:59
+    minute = rng.integers(first_hour * 60, (last_hour + 1) * 60, size=total)
+    start = (first_day + day).astype('datetime64[m]') + minute
+    duration = rng.integers(min_duration, max_duration + 1, size=total).astype(np.int16)
+
+    # Order cycles by machine, then by start time
+    order = np.lexsort((start, machine))
+    return {
+        'machine': machine[order],
+        'start': start[order],
+        'duration_minutes': duration[order],
+    }
+
+
+# Cycle table used by the Data Analysis charts, from columnar cycle arrays
+def history_frame(machine, start, duration_minutes):
+    # Only the tables need pandas; the generators are used on pages that do not load it
+    import pandas as pd
+
+    start = np.asarray(start).astype('datetime64[m]')
+
+    # Weekday and hour straight from the integer timestamps (1970-01-01 was a Thursday)
+    day_number = start.astype('datetime64[D]').astype(np.int64)
+    minute_of_day = (start - start.astype('datetime64[D]')).astype(np.int64)
+
+    df = pd.DataFrame({
+        'date': start.astype('datetime64[ns]'),
+        'machine': machine,
+        'status': 'Running',
+        'duration_minutes': duration_minutes,
+        'day_of_week': DAY_NAMES[(day_number + 3) % 7],
+        'hour': minute_of_day // 60,
+    })
+
+    return df
+
+
+# Function to create historical data for charts
+def generate_historical_data(seed=0, days=7, machines=1, **params):
+    cycles = generate_cycles(seed=seed, days=days, machines=machines, **params)
+    return history_frame(cycles['machine'], cycles['start'], cycles['duration_minutes'])
+
+
+# Phases of a simulated wash cycle: name, minutes, drum frequency (Hz), vibration amplitude
+CYCLE_PHASES = [("wash", 20, 0.8, 420), ("rinse", 10, 0.8, 380), ("spin", 8, 12.0, 480)]
+# Sensor level of a machine at rest
+REST_LEVEL = 750
+
+
+# Raw sensor samples of a washer going through cycles, sampled fast enough to show
+# their frequency content: slow drum reversals while washing, a high spin frequency,
+# and a low wobble on top of the spin when the load is unbalanced.
+# Returns times (seconds from the start) and values; a low value means vibration.
+def generate_vibration(seed=0, hours=6.0, rate_hz=50, unbalanced=0.3):
+    rng = np.random.default_rng(seed)
+    t = np.arange(0, hours * 3600, 1 / rate_hz)
+
+    # Idle gaps and cycles one after the other: (start, end, frequency, amplitude, wobble) per phase
+    phases = []
+    now = rng.uniform(5, 30) * 60
+    while now < hours * 3600:
+        wobble = rng.random() < unbalanced
+        for name, minutes, frequency, amplitude in CYCLE_PHASES:
+            length = minutes * 60 * rng.uniform(0.8, 1.2)
+            if name == "spin" and wobble:
+                # An unbalanced load keeps the drum from reaching full speed
+                phases.append((now, now + length, frequency * 0.6, amplitude, 1.0))
+            else:
+                phases.append((now, now + length, frequency * rng.uniform(0.9, 1.1), amplitude, 0.0))
+            now += length
+        now += rng.uniform(20, 120) * 60
+    start, end, frequency, amplitude, wobble = (np.array(column) for column in zip(*phases))
+
+    phase = np.searchsorted(start, t, side="right") - 1
+    active = (phase >= 0) & (t < end[np.maximum(phase, 0)])
+    phase = np.maximum(phase, 0)
+    # The drum spins up over the first minute of each phase
+    ramp = np.clip((t - start[phase]) / 60, 0.2, 1)
+    f = np.where(active, frequency[phase] * ramp, 0.0)
+    cycle = 2 * np.pi * np.cumsum(f) / rate_hz
+    a = np.where(active, amplitude[phase], 0.0)
+    shake = 0.25 * np.sin(cycle) + 0.08 * np.sin(2 * cycle)
+    shake += np.where(active, wobble[phase], 0.0) * 0.2 * np.sin(2 * np.pi * 1.5 * t)
+    values = REST_LEVEL - a * (0.8 - shake) + rng.normal(0, 15, len(t))
+    return t, np.clip(values, 0, 1023).astype(np.int16)
@@ -0,0 +1,53 @@
+# Small-memory summaries of value distributions
+import math
+
+import numpy as np
+
+
+# Quantile sketch over fixed log-spaced buckets (in the style of DDSketch).
+# Any quantile of values in [min_value, max_value] comes back within a relative
+# error of `alpha`. Sketches with the same layout merge by adding their counts.
+class QuantileSketch:
+    def __init__(self, alpha=0.01, min_value=1.0, max_value=1440.0, counts=None):
+        self.alpha = alpha
+        self.min_value = min_value
+        self.max_value = max_value
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        # Bucket 0 holds everything <= min_value, the last bucket everything above max_value
+        self.size = int(math.ceil(math.log(max_value / min_value) / self._log_gamma)) + 2
+        self.counts = np.zeros(self.size, dtype=np.int64) if counts is None else counts
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    # Bucket index of each value
+    def bucket(self, values):
+        values = np.maximum(np.asarray(values, dtype=np.float64), self.min_value)
+        idx = np.ceil(np.log(values / self.min_value) / self._log_gamma)
+        return np.clip(idx, 0, self.size - 1).astype(np.intp)
+
+    # Representative value of each bucket (the one with least relative error)
+    def bucket_value(self, idx):
+        idx = np.asarray(idx)
+        return np.where(idx == 0, self.min_value,
+                        self.min_value * self.gamma ** idx * 2 / (1 + self.gamma))
+
+    def add(self, values):
+        self.counts += np.bincount(self.bucket(values), minlength=self.size)
+
+    def merge(self, other):
+        self.counts += other.counts
+
+    # Same layout, given counts
+    def with_counts(self, counts):
+        return QuantileSketch(self.alpha, self.min_value, self.max_value, counts)
+
+    def quantile(self, q):
+        total = self.count
+        if total == 0:
+            return math.nan
+        cumulative = np.cumsum(self.counts)
+        rank = np.asarray(q, dtype=np.float64) * (total - 1)
+        return self.bucket_value(np.searchsorted(cumulative, rank, side="right"))
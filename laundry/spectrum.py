@@ -0,0 +1,182 @@
+# Short-time spectra of raw vibration samples.
+# Samples are put on a uniform grid and cut into overlapping Hann windows whose
+# FFTs are taken in one batched NumPy call. The spectrogram is built from tiles of
+# TILE_FRAMES windows on a fixed grid, so panning a view reuses the tiles already
+# computed (shared by every session through the dataset cache) and only the
+# windows that come into view are transformed.
+import numpy as np
+
+from laundry.cache import dataset_key, datasets
+
+# Samples per window and between window starts
+WINDOW = 256
+HOP = 128
+# Windows per cached tile
+TILE_FRAMES = 128
+# Frequency bands whose share of the vibration energy is a cycle feature (Hz)
+FEATURE_BANDS = {"drum": (0.0, 2.0), "mid": (2.0, 6.0), "spin": (6.0, None)}
+# Drum reversals stay below this; the spin shows up above it (Hz)
+SPIN_MIN_HZ = 2.0
+# Windows in a row that must be mostly spin before a cycle counts as spinning
+SPIN_HOLD_WINDOWS = 8
+
+
+# Reader over samples held in memory: samples with t0 <= time < t1
+def array_reader(times, values):
+    def read(t0, t1):
+        lo, hi = np.searchsorted(times, [t0, t1], side="left")
+        return times[lo:hi], values[lo:hi]
+    return read
+
+
+# Typical sample rate of a series of timestamps
+def sample_rate(times):
+    if len(times) < 2:
+        return 1.0
+    return 1.0 / float(np.median(np.diff(times[:10000])))
+
+
+# Amplitude spectra of the rows of `values` cut into windows: shape (..., frames, bins).
+# Each window loses its mean first, so the sensor's resting level does not show up at 0 Hz.
+def stft(values, window=WINDOW, hop=HOP):
+    values = np.asarray(values, dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(values, window, axis=-1)[..., ::hop, :]
+    taper = np.hanning(window).astype(np.float32)
+    frames = (frames - frames.mean(axis=-1, keepdims=True)) * taper
+    # Scaled so a sine of amplitude A peaks at A
+    return (np.abs(np.fft.rfft(frames, axis=-1)) * (2 / taper.sum())).astype(np.float32)
+
+
+# Spectrogram of one signal. `read(t0, t1)` returns the samples in a time range
+# (seconds from the start of the signal); `key` names the signal in the cache.
+class Spectrogram:
+    def __init__(self, read, duration, rate_hz, key, window=WINDOW, hop=HOP):
+        self.read = read
+        self.duration = duration
+        self.rate = rate_hz
+        self.key = key
+        self.window = window
+        self.hop = hop
+        self.frequencies = np.fft.rfftfreq(window, 1 / rate_hz)
+        # Seconds between windows, and covered by one tile
+        self.step = hop / rate_hz
+        self.tile_seconds = TILE_FRAMES * self.step
+        # Tiles this object computed, and found already cached
+        self.computed = 0
+        self.reused = 0
+
+    def _tile_key(self, k):
+        return dataset_key("spectrogram_tile", key=self.key, tile=k, rate=self.rate,
+                           window=self.window, hop=self.hop)
+
+    # Tile k's samples on the uniform grid, and which grid points had a sample
+    # close enough (gaps in the recording and times past its end do not)
+    def _grid(self, k):
+        n = (TILE_FRAMES - 1) * self.hop + self.window
+        grid = k * self.tile_seconds + np.arange(n) / self.rate
+        times, values = self.read(grid[0], grid[-1] + 1 / self.rate)
+        if len(times) == 0:
+            return np.zeros(n, dtype=np.float32), np.zeros(n, dtype=bool)
+        # Sample and hold: each grid point takes the latest sample at or before it
+        idx = np.searchsorted(times, grid, side="right") - 1
+        valid = (idx >= 0) & (grid - times[np.maximum(idx, 0)] <= 2 / self.rate)
+        return values[np.maximum(idx, 0)].astype(np.float32), valid
+
+    # Compute the given tiles in one batch and add them to the cache
+    def _compute(self, tiles):
+        grids, valid = zip(*(self._grid(k) for k in tiles))
+        magnitudes = stft(np.stack(grids), self.window, self.hop)
+        # A window with any missing sample has no spectrum
+        missing = np.cumsum(~np.stack(valid), axis=1)
+        missing = np.concatenate((np.zeros((len(tiles), 1), dtype=missing.dtype), missing), axis=1)
+        starts = np.arange(TILE_FRAMES) * self.hop
+        incomplete = missing[:, starts + self.window] - missing[:, starts] > 0
+        magnitudes[incomplete] = np.nan
+        for k, tile in zip(tiles, magnitudes):
+            datasets.put(self._tile_key(k), tile)
+        self.computed += len(tiles)
+        return dict(zip(tiles, magnitudes))
+
+    # Window centre times and amplitude spectra (frames, bins) for windows starting in [t0, t1)
+    def view(self, t0, t1):
+        t0, t1 = max(t0, 0.0), min(t1, self.duration)
+        first = int(np.ceil(t0 / self.step))
+        last = max(int(np.ceil(t1 / self.step)), first)
+        tiles = range(first // TILE_FRAMES, (last - 1) // TILE_FRAMES + 1) if last > first else range(0)
+        found = {k: datasets.get(self._tile_key(k)) for k in tiles}
+        missing = [k for k, tile in found.items() if tile is None]
+        self.reused += len(found) - len(missing)
+        if missing:
+            found.update(self._compute(missing))
+        if not found:
+            return np.empty(0), np.empty((0, len(self.frequencies)), dtype=np.float32)
+        magnitudes = np.concatenate([found[k] for k in tiles])
+        offset = first - tiles[0] * TILE_FRAMES
+        magnitudes = magnitudes[offset:offset + last - first]
+        times = (np.arange(first, last) * self.hop + self.window / 2) / self.rate
+        return times, magnitudes
+
+
+# Spectral features of each cycle (start and end in seconds from the start of the
+# signal), from the average power spectrum of the windows inside it. Returns
+# columnar arrays: dominant and centroid frequency, strongest frequency above
+# SPIN_MIN_HZ (the spin speed), spread around the centroid,
+# flatness (1 for noise, near 0 for a clean tone), RMS amplitude and each
+# FEATURE_BANDS band's share of the energy.
+def cycle_features(spectrogram, starts, ends):
+    starts, ends = np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64)
+    bins = len(spectrogram.frequencies)
+    if len(starts) == 0:
+        power = np.zeros((0, bins))
+    else:
+        times, magnitudes = spectrogram.view(starts.min(), ends.max())
+        power = np.nan_to_num(magnitudes.astype(np.float64) ** 2)
+        # Prefix sums give every cycle's mean spectrum without a loop over cycles
+        valid = np.concatenate(([0], np.cumsum(np.isfinite(magnitudes[:, 0]))))
+        total = np.concatenate((np.zeros((1, bins)), np.cumsum(power, axis=0)))
+        lo, hi = np.searchsorted(times, starts), np.searchsorted(times, ends)
+        power = (total[hi] - total[lo]) / np.maximum(valid[hi] - valid[lo], 1)[:, None]
+
+    # The 0 Hz bin only holds what is left of the resting level
+    f = spectrogram.frequencies[1:]
+    power = power[:, 1:]
+    energy = power.sum(axis=1)
+    norm = np.maximum(energy, 1e-12)
+    centroid = (power * f).sum(axis=1) / norm
+    spin = f >= SPIN_MIN_HZ
+    features = {
+        'dominant_hz': f[power.argmax(axis=1)],
+        'centroid_hz': centroid,
+        'spin_hz': f[spin][power[:, spin].argmax(axis=1)],
+        'spread_hz': np.sqrt((power * (f - centroid[:, None]) ** 2).sum(axis=1) / norm),
+        'flatness': np.exp(np.log(power + 1e-12).mean(axis=1)) / np.maximum(power.mean(axis=1), 1e-12),
+        # Parseval: with the Hann scaling above, a sine's bins sum to 3x its mean square
+        'rms': np.sqrt(energy / 3),
+    }
+    for band, (low, high) in FEATURE_BANDS.items():
+        inside = (f >= low) & (f < (np.inf if high is None else high))
+        features[f'{band}_share'] = power[:, inside].sum(axis=1) / norm
+    return features
+
+
+# Seconds from each cycle's start to the beginning of its spin: the first window
+# that starts SPIN_HOLD_WINDOWS in a row whose energy is mostly above SPIN_MIN_HZ.
+# NaN for cycles whose spin does not show.
+def spin_onsets(spectrogram, starts, ends):
+    starts, ends = np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64)
+    if len(starts) == 0:
+        return np.zeros(0)
+    times, magnitudes = spectrogram.view(starts.min(), ends.max())
+    power = np.nan_to_num(magnitudes[:, 1:].astype(np.float64) ** 2)
+    spin = power[:, spectrogram.frequencies[1:] >= SPIN_MIN_HZ].sum(axis=1) > 0.5 * power.sum(axis=1)
+    # A run of SPIN_HOLD_WINDOWS spin windows starts at each `held` index
+    runs = np.concatenate(([0], np.cumsum(spin)))
+    held = np.zeros(len(times) + 1, dtype=bool)
+    held[:len(times) - SPIN_HOLD_WINDOWS + 1] = (runs[SPIN_HOLD_WINDOWS:] - runs[:-SPIN_HOLD_WINDOWS]) == SPIN_HOLD_WINDOWS
+    # First held index at or after every window, by a running minimum from the end
+    index = np.where(held, np.arange(len(held)), len(held))
+    following = np.minimum.accumulate(index[::-1])[::-1]
+    lo, hi = np.searchsorted(times, starts), np.searchsorted(times, ends)
+    onset = following[lo]
+    found = onset < hi
+    return np.where(found, times[np.minimum(onset, len(times) - 1)] - starts, np.nan)
@@ -0,0 +1,240 @@
+# On-disk store for raw samples and detected cycles, in SQLite with a WAL journal.
+#
+# Both tables are clustered by (device, day), so a query for a time range and a
+# set of devices only touches the matching partitions; cycles also have an
+# index led by day for time ranges over every device. Samples are stored as
+# columnar chunks, one per append and day, compressed with laundry.codec
+# (timestamps kept to the millisecond); chunks written before that hold one raw
+# BLOB of timestamps and one of values and are still read. Cycles are one row each.
+#
+#   python -m laundry.store seed laundry.db --machines 200 --days 365
+import argparse
+import itertools
+import sqlite3
+import threading
+
+import numpy as np
+
+from laundry import codec
+
+SECONDS_PER_DAY = 86400
+# Cycles are partitioned by the day they start; none is assumed to run longer than this
+MAX_CYCLE_DAYS = 1
+# sample_chunks.encoding: float64 times and int16 samples BLOBs, or one codec
+# stream in samples (times left empty)
+RAW_CHUNK = 0
+CODEC_CHUNK = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sample_chunks (
+    device INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    t_min REAL NOT NULL,
+    t_max REAL NOT NULL,
+    count INTEGER NOT NULL,
+    times BLOB NOT NULL,
+    samples BLOB NOT NULL,
+    encoding INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (device, day, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    device INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cycles_partition ON cycles (device, day, start, end);
+CREATE INDEX IF NOT EXISTS cycles_time ON cycles (day, start, end, device);
+"""
+
+
+# Day number (days since 1970-01-01, UTC) of epoch-second timestamps
+def day_of(seconds):
+    return np.floor_divide(np.asarray(seconds, dtype=np.float64), SECONDS_PER_DAY).astype(np.int64)
+
+
+# WHERE clause for a device list and a [t0, t1] range over day partitions
+def _partition_filter(devices, t0, t1, day_slack=0):
+    clauses, params = [], []
+    if devices is not None:
+        devices = list(devices)
+        clauses.append(f"device IN ({','.join('?' * len(devices))})")
+        params.extend(int(d) for d in devices)
+    if t0 is not None:
+        clauses.append("day >= ?")
+        params.append(int(day_of(t0)) - day_slack)
+    if t1 is not None:
+        clauses.append("day <= ?")
+        params.append(int(day_of(t1)))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+# SELECT statement and parameters behind Store.read_cycles
+def cycles_query(devices=None, t0=None, t1=None, after_id=None):
+    where, params = _partition_filter(devices, t0, t1, day_slack=MAX_CYCLE_DAYS)
+    extra = []
+    if t0 is not None:
+        extra.append("end >= ?")
+        params.append(t0)
+    if t1 is not None:
+        extra.append("start <= ?")
+        params.append(t1)
+    if after_id is not None:
+        extra.append("id > ?")
+        params.append(int(after_id))
+    if extra:
+        where += (" AND " if where else " WHERE ") + " AND ".join(extra)
+    return f"SELECT id, device, start, end FROM cycles{where}", params
+
+
+class Store:
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._device_ids = {}
+        with self._connection() as db:
+            db.executescript(SCHEMA)
+            columns = [row[1] for row in db.execute("PRAGMA table_info(sample_chunks)")]
+            if "encoding" not in columns:
+                db.execute("ALTER TABLE sample_chunks ADD COLUMN encoding INTEGER NOT NULL DEFAULT 0")
+
+    # One connection per thread; WAL lets readers run while a writer appends
+    def _connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # Integer id for a device name, registering it on first use
+    def device_id(self, name):
+        if name not in self._device_ids:
+            with self._connection() as db:
+                db.execute("INSERT OR IGNORE INTO devices (name) VALUES (?)", (name,))
+                (self._device_ids[name],) = db.execute(
+                    "SELECT id FROM devices WHERE name = ?", (name,)).fetchone()
+        return self._device_ids[name]
+
+    def devices(self):
+        return dict(self._connection().execute("SELECT id, name FROM devices ORDER BY id"))
+
+    # Append samples for one device; each day touched gets one new chunk
+    def append_samples(self, device, times, values):
+        device = self.device_id(device)
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.int16)
+        if len(times) == 0:
+            return
+        order = np.argsort(times, kind="stable")
+        times, values = times[order], values[order]
+        days = day_of(times)
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        with self._connection() as db:
+            for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(times)]))):
+                day = int(days[lo])
+                (seq,) = db.execute(
+                    "SELECT COALESCE(MAX(seq) + 1, 0) FROM sample_chunks WHERE device = ? AND day = ?",
+                    (device, day)).fetchone()
+                db.execute(
+                    "INSERT INTO sample_chunks (device, day, seq, t_min, t_max, count, times, samples, encoding) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (device, day, seq, float(times[lo]), float(times[hi - 1]), int(hi - lo),
+                     b"", codec.encode(times[lo:hi], values[lo:hi]), CODEC_CHUNK))
+
+    # Samples for one device in [t0, t1], sorted by time
+    def read_samples(self, device, t0=None, t1=None):
+        device = self.device_id(device)
+        where, params = _partition_filter([device], t0, t1)
+        if t0 is not None:
+            where += " AND t_max >= ?"
+            params.append(t0)
+        if t1 is not None:
+            where += " AND t_min <= ?"
+            params.append(t1)
+        rows = self._connection().execute(
+            f"SELECT times, samples, encoding FROM sample_chunks{where} ORDER BY day, seq", params).fetchall()
+        if not rows:
+            return np.empty(0), np.empty(0, dtype=np.int16)
+        # Compressed chunks only decode their blocks that overlap [t0, t1]
+        chunks = [codec.decode(samples, t0, t1) if encoding == CODEC_CHUNK
+                  else (np.frombuffer(times, dtype=np.float64), np.frombuffer(samples, dtype=np.int16))
+                  for times, samples, encoding in rows]
+        times = np.concatenate([t for t, _ in chunks])
+        values = np.concatenate([v for _, v in chunks])
+        # Chunks from separate appends may interleave in time
+        order = np.argsort(times, kind="stable")
+        times, values = times[order], values[order]
+        lo = 0 if t0 is None else np.searchsorted(times, t0, side="left")
+        hi = len(times) if t1 is None else np.searchsorted(times, t1, side="right")
+        return times[lo:hi], values[lo:hi]
+
+    # Append cycles (start and end in epoch seconds) for one device
+    def append_cycles(self, device, start, end):
+        device = self.device_id(device)
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(end, dtype=np.float64)
+        rows = zip([device] * len(start), day_of(start).tolist(), start.tolist(), end.tolist())
+        with self._connection() as db:
+            db.executemany("INSERT INTO cycles (device, day, start, end) VALUES (?, ?, ?, ?)", rows)
+
+    # Cycles overlapping [t0, t1] for the given device ids (all devices if None),
+    # as columnar arrays: id (append order), device, start, end
+    def read_cycles(self, devices=None, t0=None, t1=None, after_id=None):
+        query, params = cycles_query(devices, t0, t1, after_id)
+        rows = self._connection().execute(query, params).fetchall()
+        table = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64,
+                            count=4 * len(rows)).reshape(-1, 4)
+        return {
+            'id': table[:, 0].astype(np.int64),
+            'device': table[:, 1].astype(np.int32),
+            'start': table[:, 2],
+            'end': table[:, 3],
+        }
+
+
+# Fill a store with simulated cycles, for trying the analysis page at fleet scale
+def seed_store(path, machines=200, days=365, seed=0):
+    from laundry.simulation import generate_cycles
+
+    store = Store(path)
+    cycles = generate_cycles(seed=seed, days=days, machines=machines)
+    start = cycles['start'].astype('datetime64[s]').astype(np.int64).astype(np.float64)
+    end = start + cycles['duration_minutes'].astype(np.float64) * 60
+    bounds = np.flatnonzero(np.diff(cycles['machine'])) + 1
+    for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(start)]))):
+        store.append_cycles(f"machine-{cycles['machine'][lo]:03d}", start[lo:hi], end[lo:hi])
+    store.close()
+    return len(start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laundry monitor sample and cycle store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed = commands.add_parser("seed", help="fill a store with simulated cycles")
+    seed.add_argument("path")
+    seed.add_argument("--machines", type=int, default=200)
+    seed.add_argument("--days", type=int, default=365)
+    seed.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        count = seed_store(args.path, args.machines, args.days, args.seed)
+        print(f"Wrote {count} cycles for {args.machines} machines to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Live sensor streams: fixed-size sample history per device and a simulated sensor
+import math
+
+import numpy as np
+
+
+# Fixed-capacity ring buffer of (timestamp, value) samples backed by NumPy arrays.
+# Appending never allocates; once full, the oldest samples are overwritten.
+class RingBuffer:
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = int(capacity)
+        self._times = np.zeros(self.capacity, dtype=np.float64)
+        self._values = np.zeros(self.capacity, dtype=dtype)
+        # Number of samples ever appended; the write position is total % capacity
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, t, value):
+        i = self.total % self.capacity
+        self._times[i] = t
+        self._values[i] = value
+        self.total += 1
+
+    def extend(self, times, values):
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values)
+        n = len(times)
+        if n == 0:
+            return
+        # Only the newest `capacity` samples can survive anyway
+        if n > self.capacity:
+            self.total += n - self.capacity
+            times, values = times[-self.capacity:], values[-self.capacity:]
+            n = self.capacity
+        start = self.total % self.capacity
+        first = min(n, self.capacity - start)
+        self._times[start:start + first] = times[:first]
+        self._values[start:start + first] = values[:first]
+        # Wrap around to the front of the arrays
+        self._times[:n - first] = times[first:]
+        self._values[:n - first] = values[first:]
+        self.total += n
+
+    # Samples oldest to newest, as fresh arrays
+    def arrays(self):
+        return self.since(self.total - len(self))
+
+    # Samples appended after the buffer held `total` samples (clipped to what is retained)
+    def since(self, total):
+        count = min(self.total - max(total, 0), len(self))
+        if count <= 0:
+            return self._times[:0].copy(), self._values[:0].copy()
+        idx = np.arange(self.total - count, self.total) % self.capacity
+        return self._times[idx], self._values[idx]
+
+    # Samples with t0 <= time <= t1, assuming timestamps were appended in order
+    def window(self, t0, t1):
+        times, values = self.arrays()
+        lo = np.searchsorted(times, t0, side="left")
+        hi = np.searchsorted(times, t1, side="right")
+        return times[lo:hi], values[lo:hi]
+
+    def last(self):
+        if self.total == 0:
+            return None
+        i = (self.total - 1) % self.capacity
+        return self._times[i], self._values[i]
+
+
+# Stand-in for a vibration sensor sampled at a fixed rate.
+# Each read returns only the samples that fell due since the previous read.
+class SimulatedSensor:
+    def __init__(self, rate_hz, seed=None):
+        self.rate_hz = rate_hz
+        self._rng = np.random.default_rng(seed)
+        self._next_time = None
+
+    # Timestamp of the newest sample a read at wall time `wall` returns
+    def clock(self, wall):
+        return wall
+
+    def read(self, now, is_running, backfill_seconds=0.0):
+        if self._next_time is None:
+            self._next_time = now - backfill_seconds
+        count = math.floor((now - self._next_time) * self.rate_hz) + 1
+        if count <= 0:
+            return np.empty(0), np.empty(0, dtype=np.int16)
+        times = self._next_time + np.arange(count) / self.rate_hz
+        self._next_time = times[-1] + 1 / self.rate_hz
+        # Same ranges as generate_sensor_data: low while running, high while stopped
+        low, high = (50, 400) if is_running else (600, 900)
+        values = self._rng.integers(low, high + 1, size=count).astype(np.int16)
+        return times, values
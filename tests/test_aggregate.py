@@ -0,0 +1,34 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from laundry.aggregate import bin_counts, nice_bins
+from laundry.pages.data_analysis import epoch_seconds
+from laundry.rollups import CycleRollups
+from laundry.simulation import generate_cycles
+
+
+@pytest.mark.parametrize("lo, hi", [(5, 104), (30, 90), (30, 91), (0, 1), (7, 7), (-3, 12), (1, 1440), (0.3, 0.31)])
+def test_nice_bins_fit_maxbins(lo, hi):
+    edges = nice_bins(lo, hi, maxbins=10)
+    assert 2 <= len(edges) <= 11
+    assert edges[0] <= lo and edges[-1] >= hi
+
+
+# Every bar against a direct count of the durations it covers
+def test_duration_histogram_is_exact():
+    cycles = generate_cycles(seed=0, days=365, machines=200, end=date(2026, 10, 1))
+    durations = cycles['duration_minutes'].astype(np.float64)
+    rollups = CycleRollups()
+    rollups.add(epoch_seconds(cycles['start']), durations)
+    minutes = rollups.window()['minutes']
+    seen = np.flatnonzero(minutes)
+    bins = bin_counts(seen, maxbins=10, weights=minutes[seen])
+
+    assert len(bins) <= 10
+    last = len(bins) - 1
+    for i, (start, end, count) in enumerate(bins[['bin_start', 'bin_end', 'count']].itertuples(index=False)):
+        inside = (durations >= start) & ((durations <= end) if i == last else (durations < end))
+        assert count == inside.sum()
+    assert bins['count'].sum() == len(durations)
@@ -0,0 +1,41 @@
+import os
+import time
+
+from laundry.serial_ingest import LineParser, PtyReplay, SerialReader
+
+CAPTURE = (b"Sensor value: 812\r\nSensor value: 99999\r\nSensor value: 123\r\n"
+           b"Status changed: Running\r\nSensor value: 456\r\n")
+
+
+def test_parser_skips_out_of_range_readings():
+    parser = LineParser()
+    parser.feed(CAPTURE)
+    values, nbytes, changes = parser.parse()
+    assert values.tolist() == [812, 123, 456]
+    assert nbytes == len(CAPTURE)
+    # The status change comes after the two valid samples before it
+    assert changes == [(2, "Running")]
+
+
+# One out-of-range line between valid ones, read through a pseudo-terminal
+def test_reader_keeps_the_port_open_on_out_of_range_readings():
+    lines = [f"Sensor value: {value}" for value in range(100, 200)]
+    lines.insert(50, "Sensor value: 99999")
+    capture = ("\r\n".join(lines) + "\r\n").encode()
+    # Nothing replayed by the pty itself: opening the port discards pending input,
+    # so the capture is written once the reader is waiting on it
+    with PtyReplay(b"", loop=False) as replay:
+        reader = SerialReader({"washer": replay.path}).start()
+        try:
+            deadline = time.monotonic() + 10
+            while not reader._wakers and time.monotonic() < deadline:
+                time.sleep(0.01)
+            os.write(replay.master, capture)
+            while reader.counters["washer"]["samples"] < 100 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            reader.stop()
+    counters = reader.counters["washer"]
+    assert counters["samples"] == 100
+    assert counters["reconnects"] == 0
+    assert reader.store.get("washer").error is None
@@ -0,0 +1,32 @@
+import numpy as np
+
+from laundry.store import SECONDS_PER_DAY, Store, cycles_query
+
+
+def make_store(path):
+    store = Store(path)
+    rng = np.random.default_rng(0)
+    for device in range(20):
+        start = np.sort(rng.uniform(0, 60 * SECONDS_PER_DAY, 500)) + 1.7e9
+        store.append_cycles(f"machine-{device:02d}", start, start + rng.uniform(1800, 5400, len(start)))
+    return store
+
+
+def query_plan(store, devices=None, t0=None, t1=None):
+    query, params = cycles_query(devices, t0, t1)
+    return " / ".join(row[3] for row in store._connection().execute("EXPLAIN QUERY PLAN " + query, params))
+
+
+def test_time_only_query_uses_the_day_index(tmp_path):
+    store = make_store(tmp_path / "store.db")
+    t0, t1 = 1.7e9 + 10 * SECONDS_PER_DAY, 1.7e9 + 12 * SECONDS_PER_DAY
+    plan = query_plan(store, t0=t0, t1=t1)
+    assert "cycles_time (day>? AND day<?)" in plan, plan
+    assert "SCAN" not in plan, plan
+    # Device queries stay on the device partitions
+    assert "cycles_partition" in query_plan(store, devices=[1, 2], t0=t0, t1=t1)
+
+    everything = store.read_cycles()
+    inside = (everything['end'] >= t0) & (everything['start'] <= t1)
+    window = store.read_cycles(t0=t0, t1=t1)
+    assert np.array_equal(np.sort(window['id']), np.sort(everything['id'][inside]))